@@ -105,8 +105,18 @@ const Dashboard = () => {
   const canDeleteWork = user?.is_superuser || localSystemPermissions.work_delete || systemPermissions?.work_delete;
 
   // Handlers
-  const handleWorkClick = work => {
-    setSelectedWork(work);
+  const handleWorkClick = async work => {
+    // Liste kompakt gösterimdir (bağlantı sayısı, kısaltılmış not); form için detay okunur
+    let detail = work;
+    try {
+      const response = await api.get(`/workflows/${work.id}/`);
+      if (response.data.success) {
+        detail = response.data.data;
+      }
+    } catch (error) {
+      console.error('İş detayı alınırken hata:', error);
+    }
+    setSelectedWork(detail);
     setIsNewWork(false);
     toggleModal('workModal', true);
   };
@@ -298,8 +308,8 @@ const WorkRow = ({ work, index, onClick }) => (
     <td>{work.sales_channel_name || '-'}</td>
     <td>
       <span className="link-count">
-        {work.links && work.links.length > 0 ? (
-          <>🔗 {work.links.length}</>
+        {work.links_count > 0 ? (
+          <>🔗 {work.links_count}</>
         ) : '-'}
       </span>
     </td>
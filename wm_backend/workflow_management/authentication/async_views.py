@@ -0,0 +1,11 @@
+# authentication/async_views.py
+from core.async_api import async_api_view, render_response
+from .views import build_user_search_queryset, build_user_search_payload
+
+
+@async_api_view()
+async def search_users(request):
+    """Kullanıcı arama (async)"""
+    users = build_user_search_queryset(request.GET)
+    users = [user async for user in users]
+    return render_response(build_user_search_payload(users))
@@ -1,3 +1,38 @@
-from django.test import TestCase
+# authentication/tests.py
+from core.testing import QueryBudgetTestCase, create_user
 
-# Create your tests here.
+
+class AuthenticationQueryBudgetTest(QueryBudgetTestCase):
+    """authentication endpoint'lerinin sorgu ve yanıt boyutu bütçeleri (bkz. settings.QUERY_BUDGETS)"""
+    
+    USERS = 40
+    # Kullanıcı listesinde kullanıcı başına izin verilen en fazla boyut
+    ROW_KB = 0.5
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(cls.USERS):
+            create_user(f'ekip_{i}', first_name=f'Ekip{i}', last_name='Üyesi', email=f'ekip{i}@example.com')
+    
+    def test_login(self):
+        response = self.request_with_budget('post', '/api/auth/login/', data={
+            'username': 'budget_reader', 'password': self.PASSWORD
+        })
+        self.assertIn('access_token', response.json()['data'])
+    
+    def test_register(self):
+        self.request_with_budget('post', '/api/auth/register/', self.users['superuser'], status_code=201, data={
+            'username': 'yeni_kullanici', 'email': 'yeni@example.com', 'first_name': 'Yeni', 'last_name': 'Kullanıcı',
+            'password': 'Guclu-sifre-123', 're_password': 'Guclu-sifre-123'
+        })
+    
+    def test_user_list_and_detail(self):
+        self.request_with_budget('get', '/api/auth/users/', self.users['superuser'],
+                                 max_response_kb=(self.USERS + len(self.users)) * self.ROW_KB)
+        self.request_with_budget('get', f"/api/auth/users/{self.users['mixed'].id}/", self.users['superuser'])
+        self.assert_budget_for_users('get', '/api/auth/users/', users=['editor', 'no_role'], status_code=403)
+    
+    def test_user_search(self):
+        self.assert_budget_for_users('get', '/api/auth/users/search/?q=ekip')
+        self.assert_budget_for_users('get', '/api/async/auth/users/search/?q=ekip')
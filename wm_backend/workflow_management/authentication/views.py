@@ -17,8 +17,14 @@ from .permissions import IsSuperUser
 @permission_classes([IsAuthenticated])
 def search_users(request):
     """Kullanıcı arama - isim, soyisim veya username ile"""
-    search_term = request.query_params.get('q', '').strip()
-    limit = int(request.query_params.get('limit', 20))
+    users = build_user_search_queryset(request.query_params)
+    return Response(build_user_search_payload(users))
+
+
+def build_user_search_queryset(query_params):
+    """Arama parametrelerinden kullanıcı sorgusunu oluşturur (sync ve async view'lar ortak kullanır)"""
+    search_term = query_params.get('q', '').strip()
+    limit = int(query_params.get('limit', 20))
     
     users_query = User.objects.filter(is_active=True)
     
@@ -29,8 +35,11 @@ def search_users(request):
             Q(username__icontains=search_term)
         )
     
-    users = users_query.order_by('first_name', 'last_name')[:limit]
-    
+    return users_query.order_by('first_name', 'last_name')[:limit]
+
+
+def build_user_search_payload(users):
+    """Kullanıcı arama yanıtı"""
     users_data = [{
         'id': user.id,
         'username': user.username,
@@ -40,10 +49,10 @@ def search_users(request):
         'is_staff': user.is_staff
     } for user in users]
     
-    return Response({
+    return {
         'message': f'{len(users_data)} kullanıcı bulundu',
         'users': users_data
-    })
+    }
 
 
 @api_view(['POST'])
@@ -1,3 +1,94 @@
+# core/admin.py
 from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from .models import Job, RequestProfile
 
-# Register your models here.
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'progress', 'attempts', 'created', 'finished_at']
+    list_filter = ['status', 'name']
+    list_select_related = ['created_by']
+    readonly_fields = [
+        'name', 'params', 'status', 'progress', 'progress_message', 'result', 'error', 'attempts',
+        'max_attempts', 'run_after', 'worker', 'heartbeat_at', 'created_by', 'created', 'started_at', 'finished_at'
+    ]
+    
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ['created', 'method', 'path', 'status_code', 'duration_ms', 'query_count', 'query_time_ms',
+                    'peak_memory_kb', 'user']
+    list_filter = ['method', 'status_code']
+    list_select_related = ['user']
+    search_fields = ['path']
+    # Büyük metin/binary alanlar listede yüklenmez
+    list_display_links = ['created', 'path']
+    fields = ['method', 'path', 'query_string', 'status_code', 'user', 'created', 'duration_ms', 'query_count',
+              'query_time_ms', 'peak_memory_kb', 'get_download_link', 'get_slowest_queries', 'get_queries',
+              'get_stats_text']
+    readonly_fields = fields
+    
+    # Detayda en yavaş kaç sorgu ayrıca gösterilir
+    SLOWEST_QUERY_COUNT = 10
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('changelist'):
+            queryset = queryset.defer('queries', 'stats_text', 'stats_data')
+        return queryset
+    
+    def get_urls(self):
+        return [
+            path('<int:pk>/download/', self.admin_site.admin_view(self.download_view), name='core_requestprofile_download'),
+            *super().get_urls(),
+        ]
+    
+    def download_view(self, request, pk):
+        """Ham cProfile çıktısı (snakeviz / pstats ile açılabilir)"""
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(bytes(profile.stats_data or b''), content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="request_{profile.pk}.prof"'
+        return response
+    
+    def _render_queries(self, queries):
+        return format_html(
+            '<table><thead><tr><th>ms</th><th>Kaynak</th><th>SQL</th></tr></thead><tbody>{}</tbody></table>',
+            format_html_join('', '<tr><td>{}</td><td>{}</td><td><code>{}</code></td></tr>', (
+                (query['time_ms'], query.get('origin') or '-', query['sql'])
+                for query in queries
+            ))
+        )
+    
+    @admin.display(description='Ham Profil')
+    def get_download_link(self, obj):
+        if not obj.stats_data:
+            return '-'
+        return format_html('<a href="{}">request_{}.prof</a>', reverse('admin:core_requestprofile_download', args=[obj.pk]), obj.pk)
+    
+    @admin.display(description='En Yavaş Sorgular')
+    def get_slowest_queries(self, obj):
+        slowest = sorted(obj.queries, key=lambda query: query['time_ms'], reverse=True)[:self.SLOWEST_QUERY_COUNT]
+        return self._render_queries(slowest)
+    
+    @admin.display(description='Sorgular (çalışma sırasıyla)')
+    def get_queries(self, obj):
+        return self._render_queries(obj.queries)
+    
+    @admin.display(description='Profil (cProfile)')
+    def get_stats_text(self, obj):
+        return format_html('<pre style="white-space: pre; overflow-x: auto;">{}</pre>', obj.stats_text)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,104 @@
+# core/admin_utils.py
+"""
+Büyük tablolar için admin yardımcıları
+- EstimatedCountPaginator: sayfalama için tam COUNT(*) yerine sınırlı sayım / tablo istatistiği
+- AutocompleteFilter: tüm kayıtları listelemeyen, arama ile seçilen ilişki filtresi
+"""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, QuerySet
+from django.utils.functional import cached_property
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Tablonun tahmini satır sayısı: PostgreSQL/MySQL istatistiklerinden,
+    yoksa (SQLite ya da analiz edilmemiş tablo) artan id'nin en büyük değerinden
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    
+    query = None
+    if connection.vendor == 'postgresql':
+        query = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    elif connection.vendor == 'mysql':
+        query = 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s'
+    
+    if query:
+        with connection.cursor() as cursor:
+            cursor.execute(query, [table])
+            row = cursor.fetchone()
+        if row and row[0] and row[0] > 0:
+            return int(row[0])
+    
+    return model._base_manager.using(using).aggregate(max_pk=Max('pk'))['max_pk'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Sayım EXACT_COUNT_LIMIT'e kadar kesin, üstünde tahminidir
+    Filtresiz listede tablo istatistiği, filtreli listede sınır değeri kullanılır
+    (ModelAdmin.show_full_result_count = False ile birlikte kullanılmalı)
+    """
+    EXACT_COUNT_LIMIT = 10000
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        
+        # SELECT COUNT(*) FROM (SELECT ... LIMIT n): en fazla n satır taranır
+        bounded = queryset.order_by()[:self.EXACT_COUNT_LIMIT + 1].count()
+        if bounded <= self.EXACT_COUNT_LIMIT:
+            return bounded
+        
+        if not queryset.query.where:
+            return max(bounded, estimated_row_count(queryset.model, queryset.db))
+        return bounded
+
+
+class AutocompleteFilter(admin.SimpleListFilter):
+    """
+    İlişki alanı için arama kutulu liste filtresi
+    İlişkili modelin admin'inde search_fields tanımlı olmalı; ModelAdmin.media'ya
+    autocomplete_media() eklenmeli
+    """
+    template = 'admin/core/autocomplete_filter.html'
+    field_name = None
+    
+    def __init__(self, request, params, model, model_admin):
+        self.parameter_name = f'{self.field_name}__id__exact'
+        super().__init__(request, params, model, model_admin)
+        
+        field = model._meta.get_field(self.field_name)
+        widget = AutocompleteSelect(field, model_admin.admin_site, attrs={'data-filter-parameter': self.parameter_name})
+        form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=widget,
+            required=False
+        )
+        # Sadece seçili değer render edilir, seçenekler arama ile yüklenir
+        self.rendered_widget = form_field.widget.render(
+            name=self.parameter_name,
+            value=self.value(),
+            attrs={'id': f'id_filter_{self.parameter_name}'}
+        )
+    
+    def has_output(self):
+        return True
+    
+    def lookups(self, request, model_admin):
+        return ()
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+    
+    @staticmethod
+    def autocomplete_media(model, field_name, admin_site):
+        return AutocompleteSelect(model._meta.get_field(field_name), admin_site).media
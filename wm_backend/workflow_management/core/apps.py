@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+    
+    def ready(self):
+        # Uygulamaların jobs.py modüllerindeki @register_job tanımlarını yükle
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('jobs')
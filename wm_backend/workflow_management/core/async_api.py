@@ -0,0 +1,61 @@
+# core/async_api.py
+"""
+DRF view'ları senkron çalıştığı için okuma ağırlıklı endpoint'lerin async karşılıklarında
+kullanılan yardımcılar. Yanıtlar CustomJSONRenderer ile aynı formatta üretilir.
+"""
+from functools import wraps
+from types import SimpleNamespace
+
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+
+from .exceptions import custom_exception_handler
+from .jwt_auth import CustomJWTAuthentication
+from .renderers import CustomJSONRenderer
+
+
+def render_response(data, status_code=status.HTTP_200_OK, headers=None):
+    """Veriyi standart API formatında JSON yanıtına dönüştürür"""
+    renderer = CustomJSONRenderer()
+    content = renderer.render(data, renderer_context={'response': SimpleNamespace(status_code=status_code)})
+    response = HttpResponse(content, content_type=renderer.media_type, status=status_code)
+    for key, value in (headers or {}).items():
+        response[key] = value
+    return response
+
+
+def _exception_response(exc):
+    """APIException'ı DRF'nin exception handler'ı ile aynı yapıda yanıta çevirir"""
+    response = custom_exception_handler(exc, {})
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers['WWW-Authenticate'] = CustomJWTAuthentication().authenticate_header(None)
+    return render_response(response.data, response.status_code, headers)
+
+
+def async_api_view(admin_only=False, methods=('GET',)):
+    """
+    Async view dekoratörü: JWT doğrulama, yetki kontrolü ve hata yanıtları
+    View'a doğrulanmış kullanıcı request.user olarak verilir
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return _exception_response(exceptions.MethodNotAllowed(request.method))
+            
+            try:
+                auth_result = await CustomJWTAuthentication().aauthenticate(request)
+                if auth_result is None:
+                    raise exceptions.NotAuthenticated()
+                
+                request.user, request.auth = auth_result
+                if admin_only and not request.user.is_staff:
+                    raise exceptions.PermissionDenied()
+                
+                return await view_func(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return _exception_response(exc)
+        
+        return wrapper
+    return decorator
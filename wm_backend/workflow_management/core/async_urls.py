@@ -0,0 +1,18 @@
+# core/async_urls.py
+"""Okuma ağırlıklı endpoint'lerin async karşılıkları (ASGI sunucusu ile çalıştırılmalı)"""
+from django.urls import path
+from authentication import async_views as auth_views
+from permissions import async_views as permission_views
+from workflows import async_views as workflow_views
+
+urlpatterns = [
+    path('workflows/', workflow_views.workflow_list, name='async-workflow-list'),
+    path('workflows/<int:pk>/', workflow_views.workflow_detail, name='async-workflow-detail'),
+    path('movements/', workflow_views.movement_list, name='async-movement-list'),
+    path('categories/', workflow_views.category_list, name='async-category-list'),
+    path('work-types/', workflow_views.work_type_list, name='async-work-type-list'),
+    path('sales-channels/', workflow_views.sales_channel_list, name='async-sales-channel-list'),
+    path('permissions/my-work-permissions/', permission_views.get_my_work_permissions, name='async-my-work-permissions'),
+    path('permissions/my-system-permissions/', permission_views.get_my_system_permissions, name='async-my-system-permissions'),
+    path('auth/users/search/', auth_views.search_users, name='async-search-users'),
+]
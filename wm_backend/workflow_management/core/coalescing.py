@@ -0,0 +1,133 @@
+# core/coalescing.py
+"""
+Single-flight istek birleştirme
+Aynı anahtarla eşzamanlı gelen çağrılardan sadece ilki (lider) hesaplamayı yapar,
+diğerleri onun sonucunu bekleyip paylaşır. Birleştirme process içidir; her worker kendi
+uçuşlarını ve metriklerini tutar.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+
+class _Call:
+    """Devam eden tek bir hesaplama"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.duration = 0.0
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Anahtar başına tek hesaplama; do(key, fn) sonucu (değer, paylaşıldı_mı) döndürür
+    Lider hata alırsa bekleyenler aynı hatayı alır. Bekleme süresi aşılırsa çağıran kendisi hesaplar.
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.requests = 0
+        self.executions = 0
+        self.shared = 0
+        self.timeouts = 0
+        self.max_waiters = 0
+        self.saved_seconds = 0.0
+    
+    def do(self, key, fn, timeout=None):
+        if timeout is None:
+            timeout = getattr(settings, 'COALESCING_WAIT_TIMEOUT', 30)
+        
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+        
+        if not leader:
+            if call.done.wait(timeout):
+                with self._lock:
+                    self.shared += 1
+                    # Bekleyen istek liderin yaptığı hesaplamayı tekrar yapmadı
+                    self.saved_seconds += call.duration
+                if call.error is not None:
+                    raise call.error
+                return call.result, True
+            
+            # Lider takıldı; bu istek beklemeyi bırakıp kendisi hesaplar
+            with self._lock:
+                self.timeouts += 1
+                self.executions += 1
+            return fn(), False
+        
+        started = time.perf_counter()
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.duration = time.perf_counter() - started
+            with self._lock:
+                self.executions += 1
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    def metrics(self):
+        """
+        requests: birleştiriciye gelen çağrılar (cache'li endpoint'lerde sadece cache MISS'ler)
+        coalescing_ratio: sonucu başka bir çağrıdan paylaşan çağrıların oranı
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'executions': self.executions,
+                'shared': self.shared,
+                'coalescing_ratio': self.shared / self.requests if self.requests else 0.0,
+                'in_flight': len(self._calls),
+                'max_waiters': self.max_waiters,
+                'wait_timeouts': self.timeouts,
+                'saved_seconds': round(self.saved_seconds, 3),
+            }
+    
+    def reset(self):
+        with self._lock:
+            self.requests = self.executions = self.shared = self.timeouts = self.max_waiters = 0
+            self.saved_seconds = 0.0
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def get_flight(name):
+    """Endpoint adına göre paylaşılan SingleFlight örneği"""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+
+def coalescing_metrics():
+    """Tüm endpoint'lerin birleştirme metrikleri"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.metrics() for group in sorted(groups, key=lambda group: group.name)}
+
+
+def reset_coalescing_metrics():
+    with _groups_lock:
+        groups = list(_groups.values())
+    for group in groups:
+        group.reset()
@@ -0,0 +1,105 @@
+# core/db_router.py
+"""
+Primary / replica veritabanı yönlendirmesi
+- Yazmalar her zaman primary'ye ('default') gider
+- Okumalar sadece ReadReplicaMiddleware'in işaretlediği güvenli (GET/HEAD/OPTIONS) isteklerde replikaya gider;
+  management komutları, arka plan işleri ve transaction içindeki okumalar primary'de kalır
+- Yazma yapan istemci READ_YOUR_WRITES_WINDOW saniye boyunca primary'ye sabitlenir (read-your-writes)
+"""
+import contextvars
+import hashlib
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+PRIMARY = 'default'
+PIN_KEY_PREFIX = 'db:primary_pin'
+
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+@contextmanager
+def use_read_alias(alias):
+    """Blok içindeki okumaları verilen veritabanına yönlendirir"""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def use_primary():
+    """Blok içindeki okumalar primary'den yapılır (replika gecikmesi kabul edilemeyen yerler için)"""
+    return use_read_alias(PRIMARY)
+
+
+def current_read_alias():
+    """Şu anki okumaların gideceği veritabanı"""
+    alias = _read_alias.get()
+    if not alias or connections[PRIMARY].in_atomic_block:
+        return PRIMARY
+    return alias
+
+
+def reads_from_replica():
+    return current_read_alias() != PRIMARY
+
+
+def _pin_key(request):
+    """İstemciyi kimlik bilgisinden (JWT header ya da session) tanır; anonim istekler sabitlenmez"""
+    credential = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return f"{PIN_KEY_PREFIX}:{hashlib.sha1(credential.encode()).hexdigest()}"
+
+
+def pin_to_primary(request):
+    key = _pin_key(request)
+    if key:
+        cache.set(key, True, settings.READ_YOUR_WRITES_WINDOW)
+
+
+def is_pinned_to_primary(request):
+    key = _pin_key(request)
+    return bool(key and cache.get(key))
+
+
+async def apin_to_primary(request):
+    """pin_to_primary'nin async karşılığı"""
+    key = _pin_key(request)
+    if key:
+        await cache.aset(key, True, settings.READ_YOUR_WRITES_WINDOW)
+
+
+async def ais_pinned_to_primary(request):
+    """is_pinned_to_primary'nin async karşılığı"""
+    key = _pin_key(request)
+    return bool(key and await cache.aget(key))
+
+
+class PrimaryReplicaRouter:
+    """DATABASE_ROUTERS'a eklenir; replika tanımlı değilse her şey primary'de kalır"""
+    
+    def db_for_read(self, model, **hints):
+        return current_read_alias()
+    
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replikalar şemayı primary'den replikasyon ile alır
+        if db in replica_aliases():
+            return False
+        return None
@@ -36,4 +36,11 @@ class CustomAPIException(APIException):
     def __init__(self, detail=None, code=None, status_code=None):
         if status_code:
             self.status_code = status_code
-        super().__init__(detail, code)
\ No newline at end of file
+        super().__init__(detail, code)
+
+
+class PreconditionFailed(CustomAPIException):
+    """Kayıt, istemcinin bildiği versiyondan sonra değişmiş"""
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'Kayıt siz düzenlerken başka bir kullanıcı tarafından güncellendi. Lütfen güncel veriyi kontrol edin.'
+    default_code = 'precondition_failed'
@@ -0,0 +1,15 @@
+# core/job_process.py
+"""
+run_jobs --mode process giriş noktaları
+spawn ile başlayan process bu modülü Django hazırlanmadan import eder; model importları fonksiyon içindedir
+"""
+import django
+
+
+def setup():
+    django.setup()
+
+
+def run(job_id):
+    from .jobs import execute_job_by_id
+    return execute_job_by_id(job_id)
@@ -0,0 +1,239 @@
+# core/jobs.py
+"""
+Veritabanı tabanlı arka plan işleri
+- Uygulamalar kendi jobs.py modüllerinde @register_job ile handler tanımlar (CoreConfig.ready ile yüklenir)
+- enqueue() kuyruğa kayıt ekler, run_jobs komutu bu kayıtları thread/process havuzunda çalıştırır
+- İş alma koşullu UPDATE ile yapılır (status='pending' ise), aynı işi iki worker alamaz
+Handler imzası: handler(context, **params) -> JSON'a çevrilebilir sonuç
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class JobHandler:
+    """Kayıtlı iş tipi"""
+    
+    def __init__(self, name, func, max_attempts, retry_delay):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+
+def register_job(name, max_attempts=3, retry_delay=None):
+    """İş tipi kaydeden dekoratör; retry_delay verilmezse JOB_RETRY_DELAY kullanılır"""
+    def decorator(func):
+        _registry[name] = JobHandler(name, func, max_attempts, retry_delay)
+        return func
+    return decorator
+
+
+def get_job_handler(name):
+    return _registry.get(name)
+
+
+def registered_jobs():
+    return sorted(_registry)
+
+
+class UnknownJobError(ValueError):
+    pass
+
+
+def enqueue(name, params=None, user=None, run_after=None, max_attempts=None):
+    """İşi kuyruğa ekler. Transaction içinde çağrılırsa iş commit ile birlikte görünür olur."""
+    handler = get_job_handler(name)
+    if handler is None:
+        raise UnknownJobError(f"Bilinmeyen iş tipi: {name}")
+    
+    return Job.objects.create(
+        name=name,
+        params=params or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts or handler.max_attempts
+    )
+
+
+class JobContext:
+    """Handler'a verilen çalışma bağlamı: parametreler ve ilerleme bildirimi"""
+    
+    # İlerleme yazımları en fazla bu aralıkla veritabanına yansır
+    PROGRESS_INTERVAL = 1.0
+    
+    def __init__(self, job):
+        self.job = job
+        self._last_write = 0.0
+    
+    @property
+    def params(self):
+        return self.job.params
+    
+    def progress(self, done, total=None, message=''):
+        """
+        İlerleme bildirir: progress(40) yüzde, progress(400, 1000) oran olarak yorumlanır
+        Aynı zamanda worker'ın hayatta olduğunu gösteren heartbeat'i günceller
+        """
+        percent = int(done * 100 / total) if total else int(done)
+        percent = max(0, min(99, percent))
+        
+        now = time.monotonic()
+        if now - self._last_write < self.PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+        
+        Job.objects.filter(pk=self.job.pk).update(
+            progress=percent,
+            progress_message=str(message)[:255],
+            heartbeat_at=timezone.now()
+        )
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def claim_next_job(worker_name=None, candidates=10):
+    """Çalışma zamanı gelmiş ilk bekleyen işi alır ve running yapar; yoksa None"""
+    now = timezone.now()
+    job_ids = list(
+        Job.objects.filter(status='pending', run_after__lte=now)
+        .order_by('run_after', 'id')
+        .values_list('id', flat=True)[:candidates]
+    )
+    
+    for job_id in job_ids:
+        # Başka bir worker önce aldıysa 0 satır güncellenir, sıradakine geçilir
+        claimed = Job.objects.filter(id=job_id, status='pending').update(
+            status='running',
+            worker=worker_name or worker_id(),
+            attempts=F('attempts') + 1,
+            started_at=now,
+            heartbeat_at=now,
+            finished_at=None
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def _retry_delay(handler, attempts):
+    base = handler.retry_delay if handler and handler.retry_delay is not None else settings.JOB_RETRY_DELAY
+    return timedelta(seconds=base * 2 ** max(attempts - 1, 0))
+
+
+def execute_job(job):
+    """
+    Alınmış (running) işi çalıştırır
+    Hata durumunda deneme hakkı varsa üstel bekleme ile tekrar kuyruğa alınır, yoksa failed olur
+    """
+    handler = get_job_handler(job.name)
+    if handler is None:
+        Job.objects.filter(pk=job.pk).update(
+            status='failed',
+            error=f"Bilinmeyen iş tipi: {job.name}",
+            finished_at=timezone.now()
+        )
+        return 'failed'
+    
+    try:
+        result = handler.func(JobContext(job), **job.params)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Arka plan işi başarısız: %s #%s (deneme %s)", job.name, job.pk, job.attempts)
+        
+        if job.attempts < job.max_attempts:
+            Job.objects.filter(pk=job.pk, status='running').update(
+                status='pending',
+                error=error,
+                run_after=timezone.now() + _retry_delay(handler, job.attempts)
+            )
+            return 'retry'
+        
+        Job.objects.filter(pk=job.pk, status='running').update(
+            status='failed',
+            error=error,
+            finished_at=timezone.now()
+        )
+        return 'failed'
+    
+    Job.objects.filter(pk=job.pk, status='running').update(
+        status='succeeded',
+        progress=100,
+        result=result,
+        finished_at=timezone.now()
+    )
+    return 'succeeded'
+
+
+def execute_job_by_id(job_id):
+    """Havuzdaki thread/process için giriş noktası; bağlantılar iş sonunda kapatılır"""
+    close_old_connections()
+    try:
+        job = Job.objects.filter(pk=job_id, status='running').first()
+        return execute_job(job) if job else 'skipped'
+    finally:
+        connection.close()
+
+
+def release_job(job_id, error):
+    """
+    Worker (thread/process) handler dışında çöktüğünde işi bırakır:
+    deneme hakkı varsa tekrar kuyruğa alınır, yoksa failed olur
+    """
+    job = Job.objects.filter(pk=job_id, status='running').first()
+    if job is None:
+        return
+    
+    if job.attempts < job.max_attempts:
+        Job.objects.filter(pk=job_id, status='running').update(
+            status='pending',
+            error=error,
+            run_after=timezone.now() + _retry_delay(get_job_handler(job.name), job.attempts)
+        )
+    else:
+        Job.objects.filter(pk=job_id, status='running').update(
+            status='failed',
+            error=error,
+            finished_at=timezone.now()
+        )
+
+
+def heartbeat(job_ids):
+    """Worker'ın çalıştırdığı işlerin hayatta olduğunu bildirir (ilerleme bildirmeyen uzun işler için)"""
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status='running').update(heartbeat_at=timezone.now())
+
+
+def requeue_stale_jobs(stale_after=None):
+    """
+    Heartbeat'i stale_after saniyeden eski running işler (worker öldü) tekrar kuyruğa alınır,
+    deneme hakkı bitmişse failed olur. Etkilenen iş sayısını döndürür.
+    """
+    stale_after = stale_after if stale_after is not None else settings.JOB_STALE_AFTER
+    threshold = timezone.now() - timedelta(seconds=stale_after)
+    stale = Job.objects.filter(status='running', heartbeat_at__lt=threshold)
+    
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed',
+        error='Worker yanıt vermedi (heartbeat zaman aşımı)',
+        finished_at=timezone.now()
+    )
+    requeued = stale.update(status='pending', run_after=timezone.now())
+    return failed + requeued
@@ -1,5 +1,6 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework import exceptions
 
 
@@ -18,18 +19,57 @@ class CustomJWTAuthentication(JWTAuthentication):
         try:
             return super().authenticate(request)
         except InvalidToken as e:
-            messages = e.detail.get('messages', [])
-            
-            if messages:
-                first_message = str(messages[0]).lower()
-                
-                for key, (message, code) in self.ERROR_MESSAGES.items():
-                    if key in first_message:
-                        raise exceptions.AuthenticationFailed(detail=message, code=code)
-            
-            message, code = self.ERROR_MESSAGES['default']
+            self._raise_invalid_token(e)
+        except TokenError:
+            message, code = self.ERROR_MESSAGES['format']
             raise exceptions.AuthenticationFailed(detail=message, code=code)
-            
+    
+    async def aauthenticate(self, request):
+        """Async view'lar için: token doğrulaması bellekte, kullanıcı sorgusu async ORM ile"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        
+        try:
+            validated_token = self.get_validated_token(raw_token)
+            return await self.aget_user(validated_token), validated_token
+        except InvalidToken as e:
+            self._raise_invalid_token(e)
         except TokenError:
             message, code = self.ERROR_MESSAGES['format']
-            raise exceptions.AuthenticationFailed(detail=message, code=code)
\ No newline at end of file
+            raise exceptions.AuthenticationFailed(detail=message, code=code)
+    
+    async def aget_user(self, validated_token):
+        """get_user'ın async ORM kullanan karşılığı"""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token kullanıcı bilgisi içermiyor')
+        
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(detail='Kullanıcı bulunamadı.', code='user_not_found')
+        
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise exceptions.AuthenticationFailed(detail='Bu hesap aktif değil.', code='user_inactive')
+        
+        return user
+    
+    def _raise_invalid_token(self, e):
+        """InvalidToken hatasını Türkçe mesajlı AuthenticationFailed'a çevirir"""
+        messages = e.detail.get('messages', []) if isinstance(e.detail, dict) else []
+        
+        if messages:
+            first_message = str(messages[0]).lower()
+            
+            for key, (message, code) in self.ERROR_MESSAGES.items():
+                if key in first_message:
+                    raise exceptions.AuthenticationFailed(detail=message, code=code)
+        
+        message, code = self.ERROR_MESSAGES['default']
+        raise exceptions.AuthenticationFailed(detail=message, code=code)
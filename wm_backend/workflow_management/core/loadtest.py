@@ -0,0 +1,187 @@
+# core/loadtest.py
+"""
+Yerel sunucuya karşı yük testi yardımcıları (sadece standart kütüphane)
+Her sanal istemci ayrı bir thread'de çalışır ve dashboard gibi belirli aralıklarla istek atar.
+"""
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+
+def percentile(values, pct):
+    """Sıralı olmayan listeden yüzdelik değer (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def http_request(base_url, method, path, token=None, body=None, timeout=30, headers=None):
+    """Tek HTTP isteği atar, (status, süre, yanıt gövdesi) döndürür. Bağlantı hatasında status 0'dır."""
+    request_headers = {'Content-Type': 'application/json', **(headers or {})}
+    if token:
+        request_headers['Authorization'] = f'Bearer {token}'
+    
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(base_url.rstrip('/') + path, data=data, method=method, headers=request_headers)
+    
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            content = response.read()
+            return response.status, time.perf_counter() - started, content
+    except urllib.error.HTTPError as e:
+        return e.code, time.perf_counter() - started, e.read()
+    except (urllib.error.URLError, OSError):
+        return 0, time.perf_counter() - started, b''
+
+
+class LoadStats:
+    """Thread-safe istek istatistikleri"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.status_counts = Counter()
+        self.labels = Counter()
+        self.label_status_counts = Counter()
+    
+    def record(self, latency, status_code, label=None):
+        with self._lock:
+            self.latencies.append(latency)
+            self.status_counts[status_code] += 1
+            if label:
+                self.labels[label] += 1
+                self.label_status_counts[(label, status_code)] += 1
+    
+    @property
+    def total(self):
+        return sum(self.status_counts.values())
+    
+    @property
+    def errors(self):
+        return sum(count for code, count in self.status_counts.items() if code == 0 or code >= 500)
+    
+    @property
+    def conflicts(self):
+        """Eşzamanlı düzenleme çakışmaları (412 Precondition Failed / 409 Conflict)"""
+        return self.status_counts[412] + self.status_counts[409]
+    
+    def summary(self, duration):
+        total = self.total
+        return {
+            'requests': total,
+            'throughput': total / duration if duration else 0.0,
+            'p50_ms': percentile(self.latencies, 50) * 1000,
+            'p99_ms': percentile(self.latencies, 99) * 1000,
+            'error_rate': self.errors / total if total else 0.0,
+            'conflict_rate': self.conflicts / total if total else 0.0,
+            'status_counts': dict(self.status_counts),
+        }
+
+
+def _run_periodic(clients, interval, deadline, task):
+    """Her istemci için ayrı thread'de task(client_index) fonksiyonunu interval saniyede bir çağırır"""
+    def loop(index):
+        # İstemciler aynı anda başlamasın diye ilk istek interval içinde rastgele bir anda atılır
+        next_tick = time.monotonic() + random.uniform(0, interval)
+        while True:
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+            if time.monotonic() >= deadline:
+                return
+            task(index)
+            next_tick += interval
+    
+    threads = [threading.Thread(target=loop, args=(index,), daemon=True) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def run_pollers(base_url, paths, tokens, pollers, duration, interval, timeout=30):
+    """pollers adet istemci duration saniye boyunca her interval saniyede paths listesini sırayla ister"""
+    stats = LoadStats()
+    
+    def poll(index):
+        for path in paths:
+            status_code, latency, _ = http_request(base_url, 'GET', path, tokens[index % len(tokens)], timeout=timeout)
+            stats.record(latency, status_code, path)
+    
+    threads = _run_periodic(pollers, interval, time.monotonic() + duration, poll)
+    for thread in threads:
+        thread.join(timeout=duration + timeout + interval)
+    
+    return stats
+
+
+def run_mixed(base_url, read_paths, reader_tokens, readers, editor_tokens, editors, work_ids,
+              duration, read_interval, write_interval, timeout=30, link_ratio=0.3):
+    """
+    Okuyucular (dashboard poll) ve düzenleyiciler aynı anda çalışır
+    Düzenleyici her turda rastgele bir işi okur (ETag), sonra If-Match ile PATCH atar
+    ya da link_ratio olasılıkla add_link çağırır. (okuma istatistiği, yazma istatistiği) döndürür
+    """
+    read_stats, write_stats = LoadStats(), LoadStats()
+    deadline = time.monotonic() + duration
+    
+    def poll(index):
+        for path in read_paths:
+            status_code, latency, _ = http_request(
+                base_url, 'GET', path, reader_tokens[index % len(reader_tokens)], timeout=timeout
+            )
+            read_stats.record(latency, status_code, path)
+    
+    def edit(index):
+        token = editor_tokens[index % len(editor_tokens)]
+        work_id = random.choice(work_ids)
+        
+        status_code, latency, body = http_request(
+            base_url, 'GET', f'/api/workflows/{work_id}/?fields=name,note', token, timeout=timeout
+        )
+        write_stats.record(latency, status_code, 'detail')
+        if status_code != 200:
+            return
+        version = (json.loads(body).get('data') or {}).get('version')
+        
+        if random.random() < link_ratio:
+            status_code, latency, _ = http_request(
+                base_url, 'POST', f'/api/workflows/{work_id}/add_link/', token, timeout=timeout,
+                body={'url': f'https://loadtest.example.com/{work_id}/{random.randrange(10 ** 9)}', 'title': 'Yük testi'}
+            )
+            write_stats.record(latency, status_code, 'add_link')
+        else:
+            # Okuma ile yazma arasında başka bir düzenleyici araya girerse 412 döner
+            status_code, latency, _ = http_request(
+                base_url, 'PATCH', f'/api/workflows/{work_id}/', token, timeout=timeout,
+                body={'note': f'Yük testi notu {random.randrange(10 ** 6)}'},
+                headers={'If-Match': f'"{version}"'} if version else None
+            )
+            write_stats.record(latency, status_code, 'patch')
+    
+    threads = _run_periodic(readers, read_interval, deadline, poll)
+    if editors and work_ids:
+        threads += _run_periodic(editors, write_interval, deadline, edit)
+    for thread in threads:
+        thread.join(timeout=duration + timeout + max(read_interval, write_interval))
+    
+    return read_stats, write_stats
+
+
+def is_served(summary, pollers, paths_count, duration, interval, max_error_rate=0.01):
+    """
+    Sunucu bu seviyeyi karşılayabiliyor mu?
+    Hata oranı düşük, p99 gecikmesi poll aralığından kısa ve beklenen isteklerin %95'i tamamlanmış olmalı
+    """
+    expected = pollers * paths_count * (duration / interval)
+    return (
+        summary['error_rate'] <= max_error_rate
+        and summary['p99_ms'] < interval * 1000
+        and summary['requests'] >= expected * 0.95
+    )
@@ -0,0 +1,157 @@
+# core/management/commands/loadtest.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from core.loadtest import run_mixed, is_served
+from permissions.models import Role, UserRole
+from permissions.utils import batch_permission_refresh
+from workflows.benchmarks import seed_works
+from workflows.models import Work
+
+
+class Command(BaseCommand):
+    help = (
+        "Dashboard'ları poll eden okuyucular ve aynı anda iş düzenleyen kullanıcılarla yerel sunucuya yük testi.\n"
+        "Okuyucu sayısı seviye seviye artırılır, sunucunun karşılayamadığı ilk seviye doyum noktasıdır.\n"
+        "Örnek:\n"
+        "  python manage.py loadtest --seed 2000 --url http://127.0.0.1:8000 "
+        "--levels 10,25,50,100 --writers 5 --roles 'Koordinatör:4,Tasarımcı:1'"
+    )
+    
+    READ_PATHS = ['/api/workflows/', '/api/movements/']
+    USERNAME_PREFIX = 'loadtest'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--url', required=True, help='Sunucu adresi (ör. http://127.0.0.1:8000)')
+        parser.add_argument('--levels', default='10,25,50,100,200',
+                            help='Denenecek eşzamanlı okuyucu (dashboard) sayıları (virgülle ayrılmış)')
+        parser.add_argument('--writers', type=int, default=5, help='Eşzamanlı düzenleyici sayısı')
+        parser.add_argument('--roles', default='',
+                            help="Okuyucuların rol dağılımı, ör. 'Koordinatör:4,Tasarımcı:1' "
+                                 "(boşsa tüm roller eşit; rol yoksa superuser)")
+        parser.add_argument('--editor-role', help='Düzenleyicilerin rolü (varsayılan: superuser)')
+        parser.add_argument('--read-interval', type=float, default=10.0, help='Dashboard poll aralığı (saniye)')
+        parser.add_argument('--write-interval', type=float, default=5.0, help='Düzenleyici başına işlem aralığı (saniye)')
+        parser.add_argument('--duration', type=float, default=30.0, help='Her seviyenin süresi (saniye)')
+        parser.add_argument('--timeout', type=float, default=30.0, help='İstek zaman aşımı (saniye)')
+        parser.add_argument('--hot-works', type=int, default=20,
+                            help='Düzenleyicilerin üzerinde çalıştığı iş sayısı (az olursa çakışma artar)')
+        parser.add_argument('--link-ratio', type=float, default=0.3, help='Düzenleme işlemlerinde add_link oranı')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Testten önce veritabanına eklenecek örnek iş sayısı (kalıcıdır)')
+    
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options['levels'].split(',') if level.strip()]
+        if not levels:
+            raise CommandError('--levels en az bir seviye içermeli')
+        
+        if options['seed']:
+            seed_works(options['seed'])
+            self.stdout.write(f"{options['seed']} örnek iş eklendi.")
+        
+        work_ids = list(Work.objects.order_by('-updated').values_list('id', flat=True)[:options['hot_works']])
+        if options['writers'] and not work_ids:
+            raise CommandError('Düzenlenecek iş yok (--seed ile örnek veri ekleyin)')
+        
+        reader_tokens = self._reader_tokens(options['roles'], max(levels))
+        editor_tokens = self._tokens_for_role(options['editor_role'], 'editor', max(options['writers'], 1))
+        
+        self.stdout.write(
+            f"{'okuyucu':>8} {'yazıcı':>7} {'okuma rps':>10} {'okuma p50':>10} {'okuma p99':>10} "
+            f"{'yazma rps':>10} {'yazma p99':>10} {'hata %':>7} {'çakışma %':>10}  karşılandı"
+        )
+        
+        duration = options['duration']
+        max_served = 0
+        saturation = None
+        
+        for readers in levels:
+            read_stats, write_stats = run_mixed(
+                options['url'], self.READ_PATHS, reader_tokens, readers,
+                editor_tokens, options['writers'], work_ids,
+                duration, options['read_interval'], options['write_interval'],
+                options['timeout'], options['link_ratio']
+            )
+            reads, writes = read_stats.summary(duration), write_stats.summary(duration)
+            
+            served = (
+                is_served(reads, readers, len(self.READ_PATHS), duration, options['read_interval'])
+                and writes['error_rate'] <= 0.01
+            )
+            error_rate = (read_stats.errors + write_stats.errors) / max(read_stats.total + write_stats.total, 1)
+            
+            # Çakışma oranı sadece PATCH istekleri üzerinden
+            patches = write_stats.labels['patch']
+            conflict_rate = write_stats.conflicts / patches if patches else 0.0
+            
+            self.stdout.write(
+                f"{readers:>8} {options['writers']:>7} {reads['throughput']:>10.1f} {reads['p50_ms']:>10.1f} "
+                f"{reads['p99_ms']:>10.1f} {writes['throughput']:>10.1f} {writes['p99_ms']:>10.1f} "
+                f"{error_rate * 100:>7.2f} {conflict_rate * 100:>10.2f}  {'evet' if served else 'hayır'}"
+            )
+            
+            if not served:
+                saturation = readers
+                break
+            max_served = readers
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['writers']} düzenleyici ile en fazla {max_served} dashboard karşılandı"
+            + (f', doyum noktası: {saturation} dashboard' if saturation else ' (doyuma ulaşılmadı)')
+        ))
+    
+    def _parse_role_mix(self, value):
+        """'Rol A:3,Rol B:1' -> [(Role, ağırlık)]"""
+        if not value:
+            return [(role, 1) for role in Role.objects.all()]
+        
+        mix = []
+        for item in value.split(','):
+            name, _, weight = item.rpartition(':')
+            if not name:
+                name, weight = weight, '1'
+            role = Role.objects.filter(name=name.strip()).first()
+            if not role:
+                raise CommandError(f"'{name.strip()}' rolü bulunamadı")
+            try:
+                mix.append((role, int(weight)))
+            except ValueError:
+                raise CommandError(f"'{item}' için ağırlık sayı olmalı")
+        return mix
+    
+    def _reader_tokens(self, roles, count):
+        """Rol dağılımına göre okuyucu kullanıcıları ve token'ları"""
+        mix = [(role, weight) for role, weight in self._parse_role_mix(roles) if weight > 0]
+        if not mix:
+            return self._tokens_for_role(None, 'reader', count)
+        
+        total_weight = sum(weight for _, weight in mix)
+        tokens = []
+        for role, weight in mix:
+            tokens.extend(self._tokens_for_role(role.name, 'reader', max(1, round(count * weight / total_weight))))
+        return tokens
+    
+    def _tokens_for_role(self, role_name, kind, count):
+        """Rol için yük testi kullanıcılarını oluşturur (varsa kullanır); rol yoksa superuser"""
+        role = None
+        if role_name:
+            role = Role.objects.filter(name=role_name).first()
+            if not role:
+                raise CommandError(f"'{role_name}' rolü bulunamadı")
+        
+        prefix = f"{self.USERNAME_PREFIX}_{kind}_{role.id if role else 'admin'}_"
+        users = []
+        with batch_permission_refresh():
+            for index in range(count):
+                user, created = User.objects.get_or_create(
+                    username=f'{prefix}{index}',
+                    defaults={'first_name': 'Yük', 'last_name': f'Testi {index}', 'is_superuser': role is None}
+                )
+                if created:
+                    user.set_unusable_password()
+                    user.save(update_fields=['password'])
+                if role:
+                    UserRole.objects.get_or_create(user=user, role=role)
+                users.append(user)
+        
+        return [str(AccessToken.for_user(user)) for user in users]
@@ -0,0 +1,76 @@
+# core/management/commands/poll_benchmark.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from core.loadtest import run_pollers, is_served
+
+
+class Command(BaseCommand):
+    help = (
+        "Tek worker process'in kaç eşzamanlı dashboard'a (poller) hizmet verebildiğini "
+        "sync ve async endpoint'ler için ölçer.\n"
+        "Örnek:\n"
+        "  gunicorn workflow_management.wsgi -w 1 --threads 8 -b :8000\n"
+        "  uvicorn workflow_management.asgi:application --workers 1 --port 8001\n"
+        "  python manage.py poll_benchmark --sync-url http://127.0.0.1:8000 "
+        "--async-url http://127.0.0.1:8001 --levels 10,50,100,200"
+    )
+    
+    SYNC_PATHS = ['/api/workflows/', '/api/movements/']
+    ASYNC_PATHS = ['/api/async/workflows/', '/api/async/movements/']
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--sync-url', help='WSGI sunucusunun adresi (sync endpoint\'ler)')
+        parser.add_argument('--async-url', help='ASGI sunucusunun adresi (async endpoint\'ler)')
+        parser.add_argument('--levels', default='10,25,50,100,200',
+                            help='Denenecek eşzamanlı poller sayıları (virgülle ayrılmış)')
+        parser.add_argument('--interval', type=float, default=10.0, help='Poll aralığı (saniye)')
+        parser.add_argument('--duration', type=float, default=30.0, help='Her seviyenin süresi (saniye)')
+        parser.add_argument('--timeout', type=float, default=30.0, help='İstek zaman aşımı (saniye)')
+        parser.add_argument('--username', help='Token üretilecek kullanıcı (varsayılan: ilk superuser)')
+        parser.add_argument('--token', help='Hazır access token (verilirse kullanıcı sorgulanmaz)')
+    
+    def handle(self, *args, **options):
+        targets = []
+        if options['sync_url']:
+            targets.append(('sync', options['sync_url'], self.SYNC_PATHS))
+        if options['async_url']:
+            targets.append(('async', options['async_url'], self.ASYNC_PATHS))
+        if not targets:
+            raise CommandError('--sync-url ve/veya --async-url verilmeli')
+        
+        token = options['token'] or self._make_token(options['username'])
+        levels = [int(level) for level in options['levels'].split(',') if level.strip()]
+        interval, duration = options['interval'], options['duration']
+        
+        self.stdout.write(f"{'mod':<6} {'poller':>7} {'hedef rps':>10} {'rps':>8} {'p50 ms':>9} {'p99 ms':>9} {'hata %':>7}  karşılandı")
+        
+        max_served = {}
+        for mode, base_url, paths in targets:
+            max_served[mode] = 0
+            for pollers in levels:
+                stats = run_pollers(base_url, paths, [token], pollers, duration, interval, options['timeout'])
+                summary = stats.summary(duration)
+                served = is_served(summary, pollers, len(paths), duration, interval)
+                if served:
+                    max_served[mode] = pollers
+                
+                self.stdout.write(
+                    f"{mode:<6} {pollers:>7} {pollers * len(paths) / interval:>10.1f} "
+                    f"{summary['throughput']:>8.1f} {summary['p50_ms']:>9.1f} {summary['p99_ms']:>9.1f} "
+                    f"{summary['error_rate'] * 100:>7.2f}  {'evet' if served else 'hayır'}"
+                )
+                if not served:
+                    break
+        
+        for mode, pollers in max_served.items():
+            self.stdout.write(self.style.SUCCESS(f'{mode}: tek worker ile en fazla {pollers} poller karşılandı'))
+    
+    def _make_token(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+        else:
+            user = User.objects.filter(is_superuser=True, is_active=True).first()
+        if not user:
+            raise CommandError('Token üretilecek kullanıcı bulunamadı (--username veya --token verin)')
+        return str(AccessToken.for_user(user))
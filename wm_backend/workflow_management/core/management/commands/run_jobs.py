@@ -0,0 +1,106 @@
+# core/management/commands/run_jobs.py
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core import job_process
+from core.jobs import (
+    claim_next_job, execute_job_by_id, heartbeat, registered_jobs, release_job, requeue_stale_jobs, worker_id
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Kuyruktaki arka plan işlerini (core.Job) thread veya process havuzunda çalıştırır.\n"
+        "Örnek: python manage.py run_jobs --workers 4 --mode process"
+    )
+    
+    # Heartbeat ve takılmış iş kontrolü aralığı (saniye)
+    MAINTENANCE_INTERVAL = 15
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.JOB_WORKERS, help='Eşzamanlı iş sayısı')
+        parser.add_argument('--mode', choices=['thread', 'process'], default='thread',
+                            help='thread: I/O ağırlıklı işler, process: CPU ağırlıklı işler')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Kuyruk boşken bekleme süresi (saniye)')
+        parser.add_argument('--once', action='store_true', help='Çalışma zamanı gelmiş işler bitince çık')
+        parser.add_argument('--max-jobs', type=int, help='Bu kadar iş aldıktan sonra çık')
+    
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        if options['mode'] == 'process':
+            # fork edilen process veritabanı bağlantısını paylaşmasın diye spawn kullanılır
+            executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('spawn'), initializer=job_process.setup
+            )
+            run_job = job_process.run
+        else:
+            executor = ThreadPoolExecutor(workers, thread_name_prefix='job')
+            run_job = execute_job_by_id
+        
+        name = worker_id()
+        self.stdout.write(f"Worker {name}: {workers} {options['mode']}, iş tipleri: {', '.join(registered_jobs())}")
+        
+        running = {}
+        claimed = 0
+        results = {}
+        stopping = False
+        next_maintenance = 0.0
+        
+        try:
+            while True:
+                for future in [future for future in running if future.done()]:
+                    job_id = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = 'error'
+                        release_job(job_id, f'Worker hatası: {e!r}')
+                        self.stderr.write(f"İş #{job_id} worker hatası: {e}")
+                    results[outcome] = results.get(outcome, 0) + 1
+                    self.stdout.write(f"İş #{job_id}: {outcome}")
+                
+                if time.monotonic() >= next_maintenance:
+                    heartbeat(list(running.values()))
+                    requeued = requeue_stale_jobs()
+                    if requeued:
+                        self.stdout.write(self.style.WARNING(f"{requeued} takılmış iş tekrar kuyruğa alındı"))
+                    next_maintenance = time.monotonic() + self.MAINTENANCE_INTERVAL
+                
+                idle = True
+                while not stopping and len(running) < workers:
+                    if options['max_jobs'] is not None and claimed >= options['max_jobs']:
+                        stopping = True
+                        break
+                    job = claim_next_job(name)
+                    if job is None:
+                        break
+                    idle = False
+                    claimed += 1
+                    self.stdout.write(f"İş #{job.pk} başladı: {job.name} (deneme {job.attempts}/{job.max_attempts})")
+                    try:
+                        running[executor.submit(run_job, job.pk)] = job.pk
+                    except BrokenProcessPool as e:
+                        release_job(job.pk, f'Worker hatası: {e!r}')
+                        raise CommandError(f'Process havuzu kullanılamıyor: {e}')
+                
+                if options['once'] and idle and len(running) < workers:
+                    stopping = True
+                if stopping and not running:
+                    break
+                
+                if running:
+                    wait(list(running), timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Durduruluyor, çalışan işlerin bitmesi bekleniyor...')
+            wait(list(running))
+        finally:
+            executor.shutdown(wait=True)
+        
+        summary = ', '.join(f'{outcome}: {count}' for outcome, count in sorted(results.items())) or 'iş yok'
+        self.stdout.write(self.style.SUCCESS(f"{claimed} iş alındı ({summary})"))
@@ -0,0 +1,39 @@
+# core/management/commands/sync_sqlite_replicas.py
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from core.db_router import PRIMARY, replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "Yerel geliştirme için SQLite primary veritabanını replika dosyalarına kopyalar (replikasyon simülasyonu).\n"
+        "Örnek: WM_DB_REPLICAS=replica.sqlite3 python manage.py sync_sqlite_replicas"
+    )
+    
+    def handle(self, *args, **options):
+        replicas = replica_aliases()
+        if not replicas:
+            raise CommandError('DATABASE_REPLICAS boş (WM_DB_REPLICAS ortam değişkeni ile tanımlanır)')
+        
+        primary = settings.DATABASES[PRIMARY]
+        if primary['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('Bu komut sadece SQLite primary ile kullanılabilir')
+        
+        for alias in replicas:
+            replica = settings.DATABASES[alias]
+            if replica['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError(f'{alias} SQLite değil')
+            
+            # Açık bağlantı eski dosyayı görmeye devam etmesin
+            connections[alias].close()
+            source = sqlite3.connect(str(primary['NAME']))
+            target = sqlite3.connect(str(replica['NAME']))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(self.style.SUCCESS(f"{alias} ({replica['NAME']}) güncellendi"))
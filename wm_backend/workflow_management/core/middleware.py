@@ -0,0 +1,266 @@
+# core/middleware.py
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import exceptions
+from .db_router import (
+    PRIMARY, ais_pinned_to_primary, apin_to_primary, is_pinned_to_primary, pin_to_primary, replica_aliases,
+    use_read_alias
+)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+budget_logger = logging.getLogger('core.query_budget')
+
+
+class ReadReplicaMiddleware:
+    """
+    Güvenli isteklerin okumalarını rastgele seçilen bir replikaya yönlendirir (istek boyunca aynı replika)
+    Yazma istekleri ve yakın zamanda yazma yapmış istemcilerin istekleri primary'den okur
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def _finish(self, response, alias):
+        if settings.DEBUG:
+            response['X-Read-Database'] = alias
+        return response
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        
+        replicas = replica_aliases()
+        if not replicas:
+            return self.get_response(request)
+        
+        is_write = request.method not in SAFE_METHODS
+        if is_write or is_pinned_to_primary(request):
+            alias = PRIMARY
+        else:
+            alias = random.choice(replicas)
+        
+        with use_read_alias(alias):
+            response = self.get_response(request)
+        
+        # Başarılı yazmadan sonra istemci replika gecikmesi süresince primary'den okur
+        if is_write and response.status_code < 400:
+            pin_to_primary(request)
+        return self._finish(response, alias)
+    
+    async def __acall__(self, request):
+        replicas = replica_aliases()
+        if not replicas:
+            return await self.get_response(request)
+        
+        is_write = request.method not in SAFE_METHODS
+        if is_write or await ais_pinned_to_primary(request):
+            alias = PRIMARY
+        else:
+            alias = random.choice(replicas)
+        
+        with use_read_alias(alias):
+            response = await self.get_response(request)
+        
+        if is_write and response.status_code < 400:
+            await apin_to_primary(request)
+        return self._finish(response, alias)
+
+
+class RequestProfilingMiddleware:
+    """
+    X-Profile: 1 header'ı ya da ?_profile=1 parametresi olan superuser isteklerini profiller
+    Sonuç RequestProfile olarak saklanır, yanıtta X-Profile-Id ve admin adresi (X-Profile-Url) döner.
+    Profil istenmeyen isteklerde sadece header/query string kontrolü yapılır.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def _is_requested(self, request):
+        if not settings.PROFILING_ENABLED:
+            return False
+        if request.META.get('HTTP_X_PROFILE'):
+            return True
+        return f'{settings.PROFILE_QUERY_PARAM}=' in request.META.get('QUERY_STRING', '')
+    
+    def _get_superuser(self, request):
+        """Admin oturumu ya da JWT ile gelen superuser; diğer durumlarda None"""
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            from .jwt_auth import CustomJWTAuthentication
+            try:
+                auth_result = CustomJWTAuthentication().authenticate(request)
+            except exceptions.AuthenticationFailed:
+                return None
+            user = auth_result[0] if auth_result else None
+        return user if user is not None and user.is_superuser else None
+    
+    async def _aget_superuser(self, request):
+        """_get_superuser'ın async karşılığı (kullanıcı sorguları async ORM ile)"""
+        user = await request.auser() if hasattr(request, 'auser') else None
+        if user is None or not user.is_authenticated:
+            from .jwt_auth import CustomJWTAuthentication
+            try:
+                auth_result = await CustomJWTAuthentication().aauthenticate(request)
+            except exceptions.AuthenticationFailed:
+                return None
+            user = auth_result[0] if auth_result else None
+        return user if user is not None and user.is_superuser else None
+    
+    def _profile_fields(self, request, response, user, profiler):
+        result = profiler.result()
+        return {
+            'method': request.method,
+            'path': request.path[:500],
+            'query_string': request.META.get('QUERY_STRING', ''),
+            'status_code': response.status_code,
+            'user': user,
+            'duration_ms': result['duration_ms'],
+            'query_count': result['query_count'],
+            'query_time_ms': result['query_time_ms'],
+            'peak_memory_kb': result['peak_memory_kb'],
+            'queries': result['queries'],
+            'stats_text': result['stats_text'],
+            'stats_data': result['stats_data'],
+        }
+    
+    def _finish(self, response, profile):
+        response['X-Profile-Id'] = str(profile.pk)
+        response['X-Profile-Url'] = reverse('admin:core_requestprofile_change', args=[profile.pk])
+        return response
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        
+        if not self._is_requested(request):
+            return self.get_response(request)
+        
+        user = self._get_superuser(request)
+        if user is None:
+            return self.get_response(request)
+        
+        from .models import RequestProfile
+        from .profiling import RequestProfiler
+        
+        # Cache'li endpoint'ler profil isteğinde cache'i atlar (bkz. workflows.cache.cached_response)
+        request.profiling = True
+        with RequestProfiler() as profiler:
+            response = self.get_response(request)
+            # Lazy render edilen yanıtların (TemplateResponse) render süresi de profile girsin
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response.render()
+        
+        profile = RequestProfile.objects.create(**self._profile_fields(request, response, user, profiler))
+        return self._finish(response, profile)
+    
+    async def __acall__(self, request):
+        if not self._is_requested(request):
+            return await self.get_response(request)
+        
+        user = await self._aget_superuser(request)
+        if user is None:
+            return await self.get_response(request)
+        
+        from .models import RequestProfile
+        from .profiling import RequestProfiler
+        
+        request.profiling = True
+        # Sorgu kaydedicileri thread'e ait bağlantılara takılır; async ORM sorguları isteğin
+        # thread_sensitive executor thread'inde çalıştığı için profiler da orada açılıp kapatılır
+        profiler = RequestProfiler()
+        await sync_to_async(profiler.__enter__)()
+        try:
+            response = await self.get_response(request)
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                await sync_to_async(response.render)()
+        finally:
+            await sync_to_async(profiler.__exit__)(None, None, None)
+        
+        profile = await RequestProfile.objects.acreate(**self._profile_fields(request, response, user, profiler))
+        return self._finish(response, profile)
+
+
+class QueryBudgetMiddleware:
+    """
+    Geliştirme ortamında her isteğin sorgu sayısını ve yanıt boyutunu settings.QUERY_BUDGETS
+    içindeki bütçesiyle karşılaştırır, aşımda sık tekrarlanan sorgu satırlarıyla birlikte uyarı loglar.
+    DEBUG açıkken yanıta X-Query-Count (ve bütçe tanımlıysa X-Query-Budget) header'ı eklenir.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        
+        if not settings.QUERY_BUDGET_WARNINGS:
+            return self.get_response(request)
+        
+        from .query_budget import QueryCounter
+        
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+        return self._check_budget(request, response, counter)
+    
+    async def __acall__(self, request):
+        if not settings.QUERY_BUDGET_WARNINGS:
+            return await self.get_response(request)
+        
+        from .query_budget import QueryCounter
+        
+        # Sayaç, async ORM sorgularının çalıştığı thread_sensitive executor thread'inin bağlantılarına takılır
+        counter = QueryCounter()
+        await sync_to_async(counter.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(counter.__exit__)(None, None, None)
+        return self._check_budget(request, response, counter)
+    
+    def _check_budget(self, request, response, counter):
+        from .query_budget import budget_violations, get_query_budget
+        
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.view_name if match else None
+        budget = get_query_budget(url_name, request.method)
+        
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(counter.count)
+            if budget:
+                response['X-Query-Budget'] = str(budget['queries'])
+        
+        if budget:
+            response_size = None if response.streaming else len(response.content)
+            violations = budget_violations(budget, counter.count, response_size)
+            if violations:
+                hints = ', '.join(f'{origin} ({count}x)' for origin, count in counter.repeated_origins()[:3])
+                budget_logger.warning(
+                    "Bütçe aşıldı: %s %s [%s] %s%s", request.method, request.path, url_name,
+                    '; '.join(violations), f' — tekrarlanan sorgular: {hints}' if hints else ''
+                )
+        return response
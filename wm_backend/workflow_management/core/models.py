@@ -1,3 +1,94 @@
+# core/models.py
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Job(models.Model):
+    """
+    Arka plan iş kuyruğu (broker gerektirmez)
+    Kayıtlar run_jobs komutu ile çalışan worker tarafından sırayla alınır
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Bekliyor'),
+        ('running', 'Çalışıyor'),
+        ('succeeded', 'Tamamlandı'),
+        ('failed', 'Başarısız'),
+        ('cancelled', 'İptal Edildi'),
+    ]
+    
+    name = models.CharField(max_length=100, verbose_name='İş Tipi')
+    params = models.JSONField(default=dict, blank=True, verbose_name='Parametreler')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='Durum')
+    
+    # İlerleme 0-100 arası, mesaj worker tarafından güncellenir
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name='İlerleme (%)')
+    progress_message = models.CharField(max_length=255, blank=True, default='', verbose_name='İlerleme Mesajı')
+    result = models.JSONField(blank=True, null=True, verbose_name='Sonuç')
+    error = models.TextField(blank=True, default='', verbose_name='Son Hata')
+    
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Deneme Sayısı')
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name='En Fazla Deneme')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='En Erken Çalışma Zamanı')
+    
+    worker = models.CharField(max_length=100, blank=True, default='', verbose_name='Worker')
+    heartbeat_at = models.DateTimeField(blank=True, null=True, verbose_name='Son Sinyal')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Oluşturan'
+    )
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name='Başlangıç')
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name='Bitiş')
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+    
+    class Meta:
+        verbose_name = 'Arka Plan İşi'
+        verbose_name_plural = 'Arka Plan İşleri'
+        ordering = ['-created']
+        indexes = [
+            # Worker sıradaki işi (status, run_after) üzerinden seçer
+            models.Index(fields=['status', 'run_after'], name='job_queue_idx'),
+        ]
+
+
+class RequestProfile(models.Model):
+    """Superuser'ın istediği tek bir isteğin profil sonucu (bkz. RequestProfilingMiddleware)"""
+    
+    method = models.CharField(max_length=10, verbose_name='Metot')
+    path = models.CharField(max_length=500, verbose_name='Adres')
+    query_string = models.TextField(blank=True, default='', verbose_name='Sorgu Parametreleri')
+    status_code = models.PositiveSmallIntegerField(verbose_name='Durum Kodu')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Kullanıcı'
+    )
+    
+    duration_ms = models.FloatField(verbose_name='Süre (ms)')
+    query_count = models.PositiveIntegerField(verbose_name='Sorgu Sayısı')
+    query_time_ms = models.FloatField(verbose_name='Sorgu Süresi (ms)')
+    peak_memory_kb = models.FloatField(blank=True, null=True, verbose_name='Tepe Bellek (KB)')
+    
+    queries = models.JSONField(default=list, blank=True, verbose_name='Sorgular')
+    stats_text = models.TextField(blank=True, default='', verbose_name='Profil (cProfile)')
+    stats_data = models.BinaryField(blank=True, null=True, verbose_name='Ham Profil (.prof)')
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Tarih')
+    
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+    
+    class Meta:
+        verbose_name = 'İstek Profili'
+        verbose_name_plural = 'İstek Profilleri'
+        ordering = ['-created']
@@ -0,0 +1,130 @@
+# core/profiling.py
+"""
+Tek bir isteğin profili: cProfile çağrı ağacı, tüm SQL sorguları (süre ve çağrıldığı yer),
+tracemalloc tepe bellek kullanımı. RequestProfilingMiddleware tarafından sadece superuser
+istediğinde çalıştırılır; sonuçlar RequestProfile tablosunda saklanır.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+import traceback
+import tracemalloc
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+# tracemalloc process genelidir; aynı anda sadece bir istek bellek ölçümü yapar
+_tracemalloc_lock = threading.Lock()
+
+_PROJECT_DIR = str(Path(settings.BASE_DIR).resolve())
+_SKIPPED_FILES = (__file__, 'site-packages', 'middleware.py')
+
+
+def query_origin():
+    """Sorguyu tetikleyen en yakın proje kodu satırı (framework çerçeveleri atlanır)"""
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if frame.filename.startswith(_PROJECT_DIR) and not any(part in frame.filename for part in _SKIPPED_FILES):
+            return f"{Path(frame.filename).relative_to(_PROJECT_DIR)}:{frame.lineno} in {frame.name}"
+    return None
+
+
+class QueryRecorder:
+    """connection.execute_wrapper ile her sorgunun SQL'ini, süresini ve kaynağını kaydeder"""
+    
+    def __init__(self, alias, limit):
+        self.alias = alias
+        self.limit = limit
+        self.queries = []
+        self.count = 0
+        self.total_time = 0.0
+    
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.total_time += duration
+            if len(self.queries) < self.limit:
+                self.queries.append({
+                    'database': self.alias,
+                    'sql': sql if params is None or many else self._interpolate(sql, params),
+                    'time_ms': round(duration * 1000, 3),
+                    'origin': query_origin(),
+                })
+    
+    def _interpolate(self, sql, params):
+        try:
+            return sql % tuple(repr(param) for param in params)
+        except (TypeError, ValueError):
+            return f"{sql} -- params: {params!r}"
+
+
+class RequestProfiler:
+    """with RequestProfiler() as profiler: ... bloğunu profiller; sonuç profiler.result()"""
+    
+    def __init__(self, query_limit=None, stats_limit=None):
+        self.query_limit = query_limit or settings.PROFILE_MAX_QUERIES
+        self.stats_limit = stats_limit or settings.PROFILE_STATS_LIMIT
+        self.profiler = cProfile.Profile()
+        self.recorders = [QueryRecorder(connection.alias, self.query_limit) for connection in connections.all()]
+        self._stack = ExitStack()
+        self._traces_memory = False
+        self.duration = 0.0
+        self.peak_memory = None
+    
+    def __enter__(self):
+        for connection, recorder in zip(connections.all(), self.recorders):
+            self._stack.enter_context(connection.execute_wrapper(recorder))
+        
+        if not tracemalloc.is_tracing() and _tracemalloc_lock.acquire(blocking=False):
+            self._traces_memory = True
+            tracemalloc.start()
+        
+        self._started = time.perf_counter()
+        self.profiler.enable()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self._started
+        
+        if self._traces_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _tracemalloc_lock.release()
+        
+        self._stack.close()
+        return False
+    
+    def stats_text(self, sort='cumulative'):
+        """En pahalı fonksiyonlar ve her birinin çağırdıkları (çağrı ağacı)"""
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.strip_dirs().sort_stats(sort)
+        stats.print_stats(self.stats_limit)
+        stats.print_callees(self.stats_limit)
+        return stream.getvalue()
+    
+    def stats_data(self):
+        """pstats/snakeviz ile açılabilen ham .prof içeriği"""
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+    
+    def result(self):
+        queries = [query for recorder in self.recorders for query in recorder.queries]
+        return {
+            'duration_ms': round(self.duration * 1000, 3),
+            'query_count': sum(recorder.count for recorder in self.recorders),
+            'query_time_ms': round(sum(recorder.total_time for recorder in self.recorders) * 1000, 3),
+            'peak_memory_kb': round(self.peak_memory / 1024, 1) if self.peak_memory is not None else None,
+            'queries': queries,
+            'stats_text': self.stats_text(),
+            'stats_data': self.stats_data(),
+        }
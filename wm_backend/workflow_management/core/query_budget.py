@@ -0,0 +1,65 @@
+# core/query_budget.py
+"""
+Endpoint başına sorgu ve yanıt boyutu bütçeleri
+Bütçeler settings.QUERY_BUDGETS içinde URL adına göre tanımlanır; hem testler (core.testing)
+hem de geliştirme ortamındaki QueryBudgetMiddleware aynı tanımları kullanır.
+"""
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from .profiling import QueryRecorder
+
+
+def get_query_budget(url_name, method='GET'):
+    """
+    URL adının bütçesi: {'queries': int, 'response_kb': int (opsiyonel)}; tanımsızsa None
+    'POST work-list' gibi metoda özel tanım varsa o, yoksa URL adının genel tanımı kullanılır
+    """
+    if not url_name:
+        return None
+    budgets = settings.QUERY_BUDGETS
+    return budgets.get(f'{method} {url_name}') or budgets.get(url_name)
+
+
+def budget_violations(budget, query_count, response_size):
+    """Bütçe aşımlarının açıklamaları (aşım yoksa boş liste)"""
+    violations = []
+    if query_count > budget['queries']:
+        violations.append(f"{query_count} sorgu (bütçe {budget['queries']})")
+    
+    response_kb = budget.get('response_kb')
+    if response_kb is not None and response_size is not None and response_size > response_kb * 1024:
+        violations.append(f"{response_size / 1024:.1f} KB yanıt (bütçe {response_kb} KB)")
+    return violations
+
+
+class QueryCounter:
+    """with QueryCounter() as counter: ... bloğunda tüm veritabanlarına giden sorguları sayar"""
+    
+    def __init__(self, sample_limit=200):
+        self.recorders = [QueryRecorder(connection.alias, sample_limit) for connection in connections.all()]
+        self._stack = ExitStack()
+    
+    def __enter__(self):
+        for connection, recorder in zip(connections.all(), self.recorders):
+            self._stack.enter_context(connection.execute_wrapper(recorder))
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self._stack.close()
+        return False
+    
+    @property
+    def count(self):
+        return sum(recorder.count for recorder in self.recorders)
+    
+    @property
+    def queries(self):
+        return [query for recorder in self.recorders for query in recorder.queries]
+    
+    def repeated_origins(self, minimum=3):
+        """Aynı kod satırından tekrar tekrar çalışan sorgular (N+1 adayları), en sık olan önce"""
+        origins = Counter(query['origin'] for query in self.queries if query['origin'])
+        return [(origin, count) for origin, count in origins.most_common() if count >= minimum]
@@ -15,6 +15,7 @@ class CustomJSONRenderer(JSONRenderer):
         403: "Bu işlem için yetkiniz bulunmuyor",
         404: "Aradığınız kayıt bulunamadı",
         405: "Bu istek yöntemi desteklenmiyor",
+        412: "Kayıt başka bir kullanıcı tarafından güncellendi",
         500: "Beklenmeyen bir hata oluştu. Lütfen daha sonra tekrar deneyin"
     }
     
@@ -24,6 +25,7 @@ class CustomJSONRenderer(JSONRenderer):
         403: 'PERMISSION_DENIED',
         404: 'NOT_FOUND',
         405: 'METHOD_NOT_ALLOWED',
+        412: 'PRECONDITION_FAILED',
         500: 'INTERNAL_SERVER_ERROR'
     }
     
@@ -56,6 +58,9 @@ class CustomJSONRenderer(JSONRenderer):
     def _get_data(self, data, success):
         """Başarılı durumlarda veriyi döndür"""
         if not success:
+            # Çakışma durumunda kaydın güncel hali data alanında döner
+            if isinstance(data, dict) and 'current' in data:
+                return data['current']
             return None
             
         if isinstance(data, dict):
@@ -78,7 +83,9 @@ class CustomJSONRenderer(JSONRenderer):
             non_field_errors = []
             
             for key, value in data.items():
-                if key in ['detail', 'message']:
+                if key == 'current':
+                    continue
+                elif key in ['detail', 'message']:
                     non_field_errors.append(str(value))
                 elif key == 'non_field_errors':
                     non_field_errors.extend([str(v) for v in value])
@@ -92,4 +99,70 @@ class CustomJSONRenderer(JSONRenderer):
             if non_field_errors:
                 errors['non_field_errors'] = non_field_errors
         
-        return errors
\ No newline at end of file
+        return errors
+
+class ColumnarJSONRenderer(CustomJSONRenderer):
+    """
+    Liste yanıtlarını kolon bazlı döndürür (?format=columnar ya da Accept ile seçilir)
+    Her kolon tek bir dizi olarak, ilişkili kayıtların isimleri ise bir kez sözlük tablosunda gönderilir.
+    Liste olmayan yanıtlar standart formatta kalır.
+    """
+    media_type = 'application/vnd.workflow.columnar+json'
+    format = 'columnar'
+    
+    # İlişki kolonu: satırdaki detay ve isim alanları
+    DICTIONARY_COLUMNS = {
+        'category': ('category_detail', 'category_name'),
+        'type': ('type_detail', 'type_name'),
+        'sales_channel': ('sales_channel_detail', 'sales_channel_name'),
+        'designer': ('designer_detail', 'designer_name'),
+        'printing_controller': ('printing_controller_detail', 'printing_controller_name'),
+    }
+    STATUS_COLUMNS = ['status_text', 'status_color']
+    
+    def _get_data(self, data, success):
+        data = super()._get_data(data, success)
+        if success and isinstance(data, list) and all(isinstance(row, dict) for row in data):
+            return self.to_columnar(data)
+        return data
+    
+    def to_columnar(self, rows):
+        dictionaries = {column: {} for column in self.DICTIONARY_COLUMNS}
+        dictionaries['status'] = {}
+        
+        # Kolon sırası ilk görüldüğü sıradır; yetki filtresi satırlarda aynı kolonları bırakır
+        all_keys = list(dict.fromkeys(key for row in rows for key in row))
+        
+        # Sözlüğe taşınan alanlar, sadece anahtar kolonu (id / status_code) da varsa çıkarılır
+        skipped = set()
+        if 'status_code' in all_keys:
+            skipped.update(self.STATUS_COLUMNS)
+        for column, (detail_field, name_field) in self.DICTIONARY_COLUMNS.items():
+            if column in all_keys:
+                skipped.update([detail_field, name_field])
+        column_names = [key for key in all_keys if key not in skipped]
+        
+        columns = {name: [] for name in column_names}
+        for row in rows:
+            for name in column_names:
+                columns[name].append(row.get(name))
+            
+            for column, (detail_field, name_field) in self.DICTIONARY_COLUMNS.items():
+                value = row.get(column)
+                if value is not None and value not in dictionaries[column]:
+                    dictionaries[column][value] = {
+                        'name': row.get(name_field),
+                        **({'detail': row[detail_field]} if row.get(detail_field) else {})
+                    }
+            
+            status_code = row.get('status_code')
+            if status_code is not None and status_code not in dictionaries['status']:
+                dictionaries['status'][status_code] = {
+                    key.replace('status_', ''): row.get(key) for key in self.STATUS_COLUMNS if key in row
+                }
+        
+        return {
+            'row_count': len(rows),
+            'columns': columns,
+            'dictionaries': {name: values for name, values in dictionaries.items() if values}
+        }
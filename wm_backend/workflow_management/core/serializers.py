@@ -0,0 +1,22 @@
+# core/serializers.py
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    created_by_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'name', 'params', 'status', 'status_display', 'progress', 'progress_message',
+            'result', 'error', 'attempts', 'max_attempts', 'run_after', 'worker',
+            'heartbeat_at', 'created_by', 'created_by_name', 'created', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+    
+    def get_created_by_name(self, obj):
+        if obj.created_by_id is None:
+            return None
+        return obj.created_by.get_full_name() or obj.created_by.username
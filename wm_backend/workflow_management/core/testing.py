@@ -0,0 +1,118 @@
+# core/testing.py
+"""
+Sorgu bütçesi testleri için ortak yardımcılar
+Her endpoint, farklı rol karışımlarına sahip kullanıcılarla çağrılır; sorgu sayısı
+settings.QUERY_BUDGETS'taki bütçeyle, yanıt boyutu testte verilen sınırla karşılaştırılır.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import resolve
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from permissions.models import Role, UserRole, ColumnPermission, SystemPermission
+from permissions.utils import refresh_effective_permissions
+from .query_budget import QueryCounter, get_query_budget
+
+
+def create_role(name, columns=None, system=None, default='read'):
+    """
+    Rol oluşturur; columns {kolon: 'none'|'read'|'write'} varsayılan yetkiyi ezer,
+    system {'work_create': True, ...} sistem izinlerini verir
+    """
+    role = Role.objects.create(name=name)
+    permissions = {column: default for column, _ in ColumnPermission.COLUMN_CHOICES}
+    permissions.update(columns or {})
+    for permission in set(permissions.values()):
+        ColumnPermission.objects.filter(
+            role=role, column_name__in=[column for column, value in permissions.items() if value == permission]
+        ).update(permission=permission)
+    for permission_type, granted in (system or {}).items():
+        SystemPermission.objects.create(role=role, permission_type=permission_type, granted=granted)
+    return role
+
+
+def create_user(username, roles=(), password=None, **extra):
+    """
+    Kullanıcı oluşturup rolleri atar (etkin yetki tablosu sinyallerle güncellenir)
+    Şifre hash'lemesi yavaş olduğu için şifre sadece giriş yapacak kullanıcılara verilir
+    """
+    user = User.objects.create_user(username, password=password, **extra)
+    for role in roles:
+        UserRole.objects.create(user=user, role=role)
+    return user
+
+
+class QueryBudgetTestCase(APITestCase):
+    """
+    Rol karışımları: superuser, tam yazma yetkili editör, kısıtlı okuyucu,
+    birleşen iki rollü kullanıcı ve rolsüz kullanıcı. Alt sınıflar veriyi setUpTestData'da üretir.
+    """
+    
+    PASSWORD = 'test-pass-123'
+    
+    @classmethod
+    def setUpTestData(cls):
+        editor_role = create_role('Bütçe Editör', default='write', system={'work_create': True, 'work_delete': True})
+        reader_role = create_role('Bütçe Okuyucu', columns={'price': 'none', 'note': 'none', 'designer': 'none'})
+        printing_role = create_role('Bütçe Baskı', columns={'printing_confirm': 'write', 'printing_location': 'write'},
+                                    default='none')
+        
+        cls.users = {
+            'superuser': create_user('budget_admin', is_superuser=True, is_staff=True),
+            'editor': create_user('budget_editor', roles=[editor_role]),
+            'reader': create_user('budget_reader', roles=[reader_role], password=cls.PASSWORD),
+            'mixed': create_user('budget_mixed', roles=[reader_role, printing_role]),
+            'no_role': create_user('budget_no_role'),
+        }
+        # Rolsüz kullanıcının etkin yetki kaydı ilk istekte oluşur; bütçeler kalıcı durumu ölçer
+        refresh_effective_permissions(user_ids=[user.id for user in cls.users.values()])
+    
+    def setUp(self):
+        # Cache'lenmiş yanıt/yetki ile sorgu sayısı düşük görünmesin; bütçe soğuk yol için tanımlıdır
+        cache.clear()
+    
+    def client_for(self, user):
+        # Gerçek JWT doğrulaması da bütçeye dahil olsun diye force_authenticate kullanılmaz
+        client = APIClient()
+        if user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client
+    
+    def request_with_budget(self, method, url, user=None, data=None, status_code=200, max_response_kb=None,
+                            url_name=None):
+        """
+        İsteği atar, settings.QUERY_BUDGETS bütçesini (ve verildiyse yanıt boyutu sınırını) doğrular
+        Yanıtı döndürür
+        """
+        url_name = url_name or resolve(url.split('?')[0]).view_name
+        budget = get_query_budget(url_name, method.upper())
+        self.assertIsNotNone(budget, f"{method.upper()} {url_name} için settings.QUERY_BUDGETS içinde bütçe tanımlı değil")
+        
+        client = self.client_for(user)
+        with QueryCounter() as counter:
+            response = getattr(client, method.lower())(url, data=data, format='json' if data is not None else None)
+        
+        self.assertEqual(response.status_code, status_code, response.content[:500])
+        
+        queries = '\n'.join(f"  {query['origin']}: {query['sql'][:200]}" for query in counter.queries)
+        self.assertLessEqual(
+            counter.count, budget['queries'],
+            f"{method} {url} ({user}) {counter.count} sorgu çalıştırdı, bütçe {budget['queries']}:\n{queries}"
+        )
+        
+        size_limits = [limit for limit in [budget.get('response_kb'), max_response_kb] if limit is not None]
+        if size_limits and not response.streaming:
+            self.assertLessEqual(
+                len(response.content), min(size_limits) * 1024,
+                f"{method} {url} ({user}) yanıtı {len(response.content) / 1024:.1f} KB, sınır {min(size_limits)} KB"
+            )
+        return response
+    
+    def assert_budget_for_users(self, method, url, users=None, **kwargs):
+        """Aynı isteği her rol karışımı için bütçeyle doğrular, {rol: yanıt} döndürür"""
+        responses = {}
+        for name in users or self.users:
+            with self.subTest(user=name):
+                cache.clear()
+                responses[name] = self.request_with_budget(method, url, self.users[name], **kwargs)
+        return responses
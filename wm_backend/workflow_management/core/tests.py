@@ -1,3 +1,511 @@
-from django.test import TestCase
+# core/tests.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from datetime import timedelta
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from core.testing import QueryBudgetTestCase
+from permissions.models import UserRole
+from workflows.benchmarks import seed_works
+from workflows.models import Work
+from .coalescing import SingleFlight, coalescing_metrics, get_flight
+from .admin_utils import EstimatedCountPaginator, estimated_row_count
+from .db_router import PRIMARY
+from . import jobs
+from .jobs import claim_next_job, enqueue, execute_job, release_job, requeue_stale_jobs
+from .loadtest import LoadStats, is_served, percentile, run_mixed
+from .middleware import ReadReplicaMiddleware
+from .management.commands.loadtest import Command as LoadTestCommand
+from .models import Job, RequestProfile
+
+
+class CoreQueryBudgetTest(QueryBudgetTestCase):
+    """core endpoint'lerinin sorgu ve yanıt boyutu bütçeleri (bkz. settings.QUERY_BUDGETS)"""
+    
+    JOBS = 25
+    # İş listesinde iş başına izin verilen en fazla boyut
+    ROW_KB = 1
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        admin = cls.users['superuser']
+        cls.jobs = [enqueue('workflows.export_works', params={'fields': ['name']}, user=admin) for _ in range(cls.JOBS)]
+    
+    def test_jobs(self):
+        admin = self.users['superuser']
+        self.request_with_budget('get', '/api/core/jobs/', admin, max_response_kb=self.JOBS * self.ROW_KB)
+        self.request_with_budget('get', f'/api/core/jobs/{self.jobs[0].id}/', admin)
+        self.request_with_budget('get', '/api/core/jobs/types/', admin)
+        self.request_with_budget('post', '/api/core/jobs/', admin, status_code=202, data={
+            'name': 'workflows.export_works', 'params': {}
+        })
+        self.assert_budget_for_users('get', '/api/core/jobs/', users=['editor', 'no_role'], status_code=403)
+    
+    def test_job_cancel_and_retry(self):
+        admin = self.users['superuser']
+        self.request_with_budget('post', f'/api/core/jobs/{self.jobs[0].id}/cancel/', admin)
+        self.request_with_budget('post', f'/api/core/jobs/{self.jobs[0].id}/retry/', admin)
+        self.assertEqual(Job.objects.get(id=self.jobs[0].id).status, 'pending')
+    
+    def test_coalescing_metrics(self):
+        self.request_with_budget('get', '/api/core/metrics/coalescing/', self.users['superuser'])
+
+
+@override_settings(QUERY_BUDGET_WARNINGS=True, QUERY_BUDGETS={'work-list': {'queries': 1}, 'category-list': {'queries': 50}})
+class QueryBudgetMiddlewareTest(QueryBudgetTestCase):
+    """Bütçeyi aşan istekler loglanır, aşmayanlar loglanmaz"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        seed_works(5)
+    
+    def test_over_budget_is_logged(self):
+        with self.assertLogs('core.query_budget', level='WARNING') as logs:
+            self.client_for(self.users['reader']).get('/api/workflows/')
+        self.assertIn('[work-list]', logs.output[0])
+        self.assertIn('(bütçe 1)', logs.output[0])
+    
+    def test_within_budget_is_silent(self):
+        with self.assertNoLogs('core.query_budget', level='WARNING'):
+            self.client_for(self.users['reader']).get('/api/categories/')
+    
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        response = self.client_for(self.users['reader']).get('/api/categories/')
+        self.assertEqual(response['X-Query-Budget'], '50')
+        self.assertGreater(int(response['X-Query-Count']), 0)
+    
+    @override_settings(DEBUG=True)
+    async def test_async_request_is_counted(self):
+        response = await self.async_client.get('/api/async/categories/', headers={
+            'Authorization': f"Bearer {AccessToken.for_user(self.users['reader'])}"
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+
+
+class AsgiMiddlewareTest(SimpleTestCase):
+    """ASGI altında middleware zinciri sync_to_async ile sarılmadan async çalışır"""
+    
+    @override_settings(DEBUG=True)
+    def test_no_middleware_is_adapted(self):
+        # BaseHandler.adapt_method_mode, sarılan her handler için DEBUG'da django.request'e log yazar
+        with self.assertNoLogs('django.request', level='DEBUG'):
+            ASGIHandler()
+
+
+@override_settings(DEBUG=True, DATABASE_REPLICAS=['replica1'], READ_YOUR_WRITES_WINDOW=5)
+class ReadReplicaMiddlewareTest(SimpleTestCase):
+    """Güvenli okumalar replikaya gider, başarılı yazma istemciyi primary'ye sabitler (sync ve async)"""
+    
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+    
+    def request(self, method, token='client-a'):
+        return getattr(self.factory, method)('/api/workflows/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def test_write_pins_next_read_to_primary(self):
+        middleware = ReadReplicaMiddleware(lambda request: HttpResponse())
+        self.assertEqual(middleware(self.request('get'))['X-Read-Database'], 'replica1')
+        self.assertEqual(middleware(self.request('post'))['X-Read-Database'], PRIMARY)
+        self.assertEqual(middleware(self.request('get'))['X-Read-Database'], PRIMARY)
+        # Diğer istemciler replikadan okumaya devam eder
+        self.assertEqual(middleware(self.request('get', 'client-b'))['X-Read-Database'], 'replica1')
+    
+    def test_failed_write_does_not_pin(self):
+        middleware = ReadReplicaMiddleware(lambda request: HttpResponse(status=400))
+        middleware(self.request('patch'))
+        self.assertEqual(middleware(self.request('get'))['X-Read-Database'], 'replica1')
+    
+    async def test_async_write_pins_next_read_to_primary(self):
+        async def get_response(request):
+            return HttpResponse()
+        
+        middleware = ReadReplicaMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual((await middleware(self.request('get')))['X-Read-Database'], 'replica1')
+        self.assertEqual((await middleware(self.request('put')))['X-Read-Database'], PRIMARY)
+        self.assertEqual((await middleware(self.request('get')))['X-Read-Database'], PRIMARY)
+
+
+class RequestProfilingMiddlewareTest(QueryBudgetTestCase):
+    """Superuser'ın profil istediği (sync ve async) istekler RequestProfile olarak saklanır"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        seed_works(3)
+    
+    def test_superuser_request_is_profiled(self):
+        response = self.client_for(self.users['superuser']).get('/api/workflows/?_profile=1')
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.path, '/api/workflows/')
+        self.assertEqual(profile.status_code, 200)
+        self.assertGreater(profile.query_count, 0)
+        self.assertEqual(response['X-Cache'], 'BYPASS')
+    
+    def test_other_users_are_not_profiled(self):
+        response = self.client_for(self.users['editor']).get('/api/workflows/', HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+    
+    async def test_async_request_is_profiled(self):
+        response = await self.async_client.get('/api/async/workflows/', headers={
+            'Authorization': f"Bearer {AccessToken.for_user(self.users['superuser'])}", 'X-Profile': '1'
+        })
+        self.assertEqual(response.status_code, 200)
+        profile = await RequestProfile.objects.aget(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.path, '/api/async/workflows/')
+        self.assertGreater(profile.query_count, 0)
+
+
+class AsyncApiTest(QueryBudgetTestCase):
+    """Async endpoint'ler sync karşılıklarıyla aynı veriyi ve hata yanıtlarını döndürür"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work_ids = seed_works(5, seed=3)
+    
+    def get_pair(self, user, path):
+        client = self.client_for(self.users[user])
+        cache.clear()
+        return client.get(f'/api/{path}'), client.get(f'/api/async/{path}')
+    
+    def test_same_data_as_sync_endpoints(self):
+        paths = [
+            'workflows/', 'workflows/?view=full', f'workflows/{self.work_ids[0]}/', 'categories/', 'work-types/',
+            'sales-channels/', 'permissions/my-work-permissions/', 'permissions/my-system-permissions/'
+        ]
+        for user in ['superuser', 'reader', 'mixed']:
+            for path in paths:
+                with self.subTest(user=user, path=path):
+                    sync_response, async_response = self.get_pair(user, path)
+                    self.assertEqual(async_response.status_code, 200)
+                    self.assertEqual(async_response.json()['data'], sync_response.json()['data'])
+    
+    def test_detail_etag_and_missing_work(self):
+        sync_response, async_response = self.get_pair('reader', f'workflows/{self.work_ids[0]}/')
+        self.assertEqual(async_response['ETag'], sync_response['ETag'])
+        _, async_response = self.get_pair('reader', 'workflows/0/')
+        self.assertEqual(async_response.status_code, 404)
+    
+    def test_error_responses(self):
+        self.assertEqual(self.client_for(None).get('/api/async/workflows/').status_code, 401)
+        self.assertEqual(self.client_for(self.users['editor']).get('/api/async/movements/').status_code, 403)
+        self.assertEqual(self.client_for(self.users['editor']).post('/api/async/categories/').status_code, 405)
+    
+    async def test_served_natively_under_asgi(self):
+        response = await self.async_client.get('/api/async/workflows/', headers={
+            'Authorization': f"Bearer {AccessToken.for_user(self.users['reader'])}"
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), len(self.work_ids))
+
+
+class LoadTestHelpersTest(SimpleTestCase):
+    """Yük testi istatistikleri ve karışık okuyucu/düzenleyici çalıştırıcısı (sahte HTTP sunucusuna karşı)"""
+    
+    def test_percentile_and_summary(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        values = list(range(100, 0, -1))
+        self.assertEqual((percentile(values, 50), percentile(values, 99), percentile(values, 100)), (50, 99, 100))
+        
+        stats = LoadStats()
+        for status_code in [200] * 6 + [412, 409, 500, 0]:
+            stats.record(0.1, status_code, 'patch')
+        summary = stats.summary(duration=5)
+        self.assertEqual(summary['requests'], 10)
+        self.assertEqual(summary['throughput'], 2.0)
+        self.assertEqual((summary['error_rate'], summary['conflict_rate']), (0.2, 0.2))
+        self.assertEqual(stats.label_status_counts[('patch', 412)], 1)
+    
+    def test_is_served(self):
+        summary = {'requests': 100, 'error_rate': 0.0, 'p99_ms': 500}
+        self.assertTrue(is_served(summary, pollers=10, paths_count=1, duration=10, interval=1))
+        self.assertFalse(is_served({**summary, 'p99_ms': 1000}, 10, 1, 10, 1))
+        self.assertFalse(is_served({**summary, 'error_rate': 0.05}, 10, 1, 10, 1))
+        self.assertFalse(is_served({**summary, 'requests': 90}, 10, 1, 10, 1))
+    
+    def test_run_mixed_against_stub_server(self):
+        received = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def respond(self, status_code, data=None):
+                body = json.dumps({'data': data}).encode()
+                self.send_response(status_code)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                received.append(('GET', self.path, self.headers.get('Authorization')))
+                self.respond(200, {'version': 3})
+            
+            def do_PATCH(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                received.append(('PATCH', self.path, self.headers.get('If-Match')))
+                # Her PATCH eşzamanlı düzenleme çakışması sayılır
+                self.respond(412)
+            
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                received.append(('POST', self.path, None))
+                self.respond(201)
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        
+        read_stats, write_stats = run_mixed(
+            f'http://127.0.0.1:{server.server_port}', ['/api/workflows/'], ['okuyucu'], 2, ['yazar'], 1, [7],
+            duration=0.5, read_interval=0.1, write_interval=0.1, timeout=5, link_ratio=0
+        )
+        
+        self.assertGreater(read_stats.total, 0)
+        self.assertEqual(read_stats.errors, 0)
+        self.assertIn(('GET', '/api/workflows/', 'Bearer okuyucu'), received)
+        # Düzenleyici önce işi okur, sonra okuduğu sürümle If-Match gönderir
+        self.assertGreater(write_stats.labels['patch'], 0)
+        self.assertEqual(write_stats.conflicts, write_stats.labels['patch'])
+        self.assertEqual({item for item in received if item[0] == 'PATCH'}, {('PATCH', '/api/workflows/7/', '"3"')})
+
+
+class LoadTestCommandTest(QueryBudgetTestCase):
+    """loadtest komutunun rol dağılımı ve yük testi kullanıcıları"""
+    
+    def test_reader_tokens_follow_role_mix(self):
+        command = LoadTestCommand()
+        tokens = command._reader_tokens('Bütçe Okuyucu:3,Bütçe Baskı:1', 8)
+        self.assertEqual(len(tokens), 8)
+        role_counts = {
+            name: UserRole.objects.filter(role__name=name, user__username__startswith='loadtest_reader_').count()
+            for name in ['Bütçe Okuyucu', 'Bütçe Baskı']
+        }
+        self.assertEqual(role_counts, {'Bütçe Okuyucu': 6, 'Bütçe Baskı': 2})
+        
+        # Kullanıcılar tekrar çalıştırmada yeniden kullanılır
+        command._reader_tokens('Bütçe Okuyucu:3,Bütçe Baskı:1', 8)
+        self.assertEqual(User.objects.filter(username__startswith='loadtest_reader_').count(), 8)
+        
+        with self.assertRaises(CommandError):
+            command._reader_tokens('Olmayan Rol:1', 2)
+
+
+class EstimatedCountPaginatorTest(QueryBudgetTestCase):
+    """Sayım sınıra kadar kesin; üstünde filtresiz listede tablo tahmini, filtreli listede sınır değeri"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        works = Work.objects.bulk_create([Work(name=f'Sayfa {index}') for index in range(12)])
+        # Silinen satırlar yüzünden en büyük id gerçek sayıdan büyüktür (SQLite'ta tahmin budur)
+        Work.objects.filter(id__in=[work.id for work in works[:2]]).delete()
+    
+    def count(self, queryset):
+        return EstimatedCountPaginator(queryset, 5).count
+    
+    def test_exact_below_limit(self):
+        self.assertEqual(self.count(Work.objects.all()), 10)
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 5):
+            self.assertEqual(self.count(Work.objects.filter(name__in=['Sayfa 3', 'Sayfa 4'])), 2)
+    
+    def test_estimated_above_limit(self):
+        with mock.patch.object(EstimatedCountPaginator, 'EXACT_COUNT_LIMIT', 5):
+            self.assertEqual(self.count(Work.objects.all()), estimated_row_count(Work))
+            self.assertEqual(estimated_row_count(Work), Work.objects.order_by('-id').values_list('id', flat=True)[0])
+            self.assertEqual(self.count(Work.objects.filter(name__startswith='Sayfa')), 6)
+    
+    def test_lists_are_counted_normally(self):
+        self.assertEqual(EstimatedCountPaginator(list(range(7)), 5).count, 7)
+
+
+class SingleFlightTest(SimpleTestCase):
+    """Aynı anahtarla eşzamanlı çağrılarda tek hesaplama yapılır, sonuç ve hata bekleyenlerle paylaşılır"""
+    
+    FOLLOWERS = 4
+    
+    def run_concurrently(self, flight, fn, timeout=5, release_when='max_waiters'):
+        """
+        Lider fn içinde bekletilirken takipçiler aynı anahtarla katılır; (sonuçlar, hatalar) döndürür
+        Lider, release_when metriği takipçi sayısına ulaşınca bırakılır
+        """
+        results, errors = [], []
+        
+        def call():
+            try:
+                results.append(flight.do('liste', fn, timeout=timeout))
+            except Exception as e:
+                errors.append(e)
+        
+        leader = threading.Thread(target=call)
+        leader.start()
+        self.assertTrue(self.started.wait(5))
+        followers = [threading.Thread(target=call) for _ in range(self.FOLLOWERS)]
+        for thread in followers:
+            thread.start()
+        while flight.metrics()[release_when] < self.FOLLOWERS:
+            threading.Event().wait(0.01)
+        self.release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+        return results, errors
+    
+    def setUp(self):
+        self.started, self.release = threading.Event(), threading.Event()
+        self.executions = 0
+    
+    def compute(self):
+        self.executions += 1
+        self.started.set()
+        self.release.wait(5)
+        return {'satır': 1}
+    
+    def test_followers_share_leader_result(self):
+        flight = SingleFlight('test')
+        results, errors = self.run_concurrently(flight, self.compute)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.executions, 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * self.FOLLOWERS)
+        self.assertTrue(all(result is results[0][0] for result, _ in results))
+        
+        metrics = flight.metrics()
+        self.assertEqual((metrics['requests'], metrics['executions'], metrics['shared']), (5, 1, 4))
+        self.assertEqual(metrics['coalescing_ratio'], 0.8)
+        self.assertEqual(metrics['in_flight'], 0)
+        
+        # Uçuş bittikten sonraki çağrı yeniden hesaplar
+        self.release.set()
+        self.assertEqual(flight.do('liste', self.compute), ({'satır': 1}, False))
+        self.assertEqual(self.executions, 2)
+    
+    def test_leader_error_is_shared(self):
+        def fail():
+            self.compute()
+            raise ValueError('hesaplama hatası')
+        
+        results, errors = self.run_concurrently(SingleFlight('test'), fail)
+        self.assertEqual(results, [])
+        self.assertEqual([str(error) for error in errors], ['hesaplama hatası'] * (self.FOLLOWERS + 1))
+        self.assertEqual(self.executions, 1)
+    
+    def test_follower_computes_after_timeout(self):
+        def compute():
+            # Takipçiler beklemeyi bırakıp kendileri hesaplar; lider ancak onlar bitince bırakılır
+            if self.started.is_set():
+                self.executions += 1
+                return {'satır': 2}
+            return self.compute()
+        
+        flight = SingleFlight('test')
+        results, _ = self.run_concurrently(flight, compute, timeout=0.05, release_when='wait_timeouts')
+        self.assertEqual(self.executions, self.FOLLOWERS + 1)
+        self.assertEqual(flight.metrics()['wait_timeouts'], self.FOLLOWERS)
+        self.assertFalse(any(shared for _, shared in results))
+    
+    def test_named_groups_are_shared(self):
+        self.assertIs(get_flight('test-grup'), get_flight('test-grup'))
+        self.assertIn('test-grup', coalescing_metrics())
+
+
+@override_settings(JOB_RETRY_DELAY=60)
+class JobQueueTest(QueryBudgetTestCase):
+    """İş kuyruğu: alma, çalıştırma, üstel bekleme ile tekrar deneme, takılan işler, iptal ve yeniden kuyruğa alma"""
+    
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+        registry = mock.patch.dict(jobs._registry)
+        registry.start()
+        self.addCleanup(registry.stop)
+        
+        @jobs.register_job('test.topla', max_attempts=2)
+        def add(context, a, b, fail=False):
+            self.calls.append(context.job.attempts)
+            if fail:
+                raise RuntimeError('başarısız deneme')
+            return {'sum': a + b}
+    
+    def test_claim_and_run(self):
+        later = enqueue('test.topla', {'a': 1, 'b': 2}, run_after=timezone.now() + timedelta(hours=1))
+        job = enqueue('test.topla', {'a': 2, 'b': 3}, user=self.users['superuser'])
+        
+        claimed = claim_next_job('worker-1')
+        self.assertEqual((claimed.id, claimed.status, claimed.attempts, claimed.worker), (job.id, 'running', 1, 'worker-1'))
+        # Çalışan ve zamanı gelmemiş işler tekrar alınmaz
+        self.assertIsNone(claim_next_job('worker-2'))
+        
+        self.assertEqual(execute_job(claimed), 'succeeded')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.result), ('succeeded', 100, {'sum': 5}))
+        later.refresh_from_db()
+        self.assertEqual(later.status, 'pending')
+    
+    def test_retry_with_backoff_then_fail(self):
+        job = enqueue('test.topla', {'a': 1, 'b': 1, 'fail': True})
+        with self.assertLogs('core.jobs', 'ERROR'):
+            self.assertEqual(execute_job(claim_next_job()), 'retry')
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertIn('başarısız deneme', job.error)
+        self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), 60, delta=5)
+        self.assertIsNone(claim_next_job())
+        
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('core.jobs', 'ERROR'):
+            self.assertEqual(execute_job(claim_next_job()), 'failed')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, self.calls), ('failed', 2, [1, 2]))
+        self.assertIsNotNone(job.finished_at)
+    
+    def test_stale_and_released_jobs(self):
+        job = enqueue('test.topla', {'a': 1, 'b': 1})
+        claim_next_job()
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(stale_after=60), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        
+        # Deneme hakkı biten iş bırakıldığında başarısız olur
+        claim_next_job()
+        release_job(job.id, 'worker çöktü')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', 'worker çöktü'))
+        self.assertEqual(self.calls, [])
+    
+    def test_api_cancel_and_retry(self):
+        client = self.client_for(self.users['superuser'])
+        response = client.post('/api/core/jobs/', {'name': 'test.topla', 'params': {'a': 1, 'b': 2}}, format='json')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['data']['job']['id']
+        
+        self.assertEqual(client.post(f'/api/core/jobs/{job_id}/retry/').status_code, 400)
+        self.assertEqual(client.post(f'/api/core/jobs/{job_id}/cancel/').json()['data']['job']['status'], 'cancelled')
+        self.assertIsNone(claim_next_job())
+        self.assertEqual(client.post(f'/api/core/jobs/{job_id}/cancel/').status_code, 400)
+        
+        job = client.post(f'/api/core/jobs/{job_id}/retry/').json()['data']['job']
+        self.assertEqual((job['status'], job['attempts']), ('pending', 0))
+        self.assertEqual(execute_job(claim_next_job()), 'succeeded')
+        
+        response = client.post('/api/core/jobs/', {'name': 'olmayan.is'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('test.topla', response.json()['errors']['field_errors']['job_types'])
@@ -0,0 +1,12 @@
+# core/urls.py
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register('jobs', views.JobViewSet)
+
+urlpatterns = [
+    path('metrics/coalescing/', views.coalescing_metrics_view, name='coalescing-metrics'),
+    path('', include(router.urls)),
+]
@@ -1,3 +1,132 @@
-from django.shortcuts import render
+# core/views.py
+from pathlib import Path
 
-# Create your views here.
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .coalescing import coalescing_metrics, reset_coalescing_metrics
+from .jobs import UnknownJobError, enqueue, registered_jobs
+from .models import Job
+from .serializers import JobSerializer
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def coalescing_metrics_view(request):
+    """
+    Endpoint bazında istek birleştirme metrikleri (bu process için)
+    coalescing_ratio: başka bir isteğin sonucunu paylaşan isteklerin oranı
+    DELETE sayaçları sıfırlar
+    """
+    if request.method == 'DELETE':
+        reset_coalescing_metrics()
+        return Response({'message': 'Birleştirme metrikleri sıfırlandı'}, status=status.HTTP_200_OK)
+    
+    return Response({
+        'message': 'İstek birleştirme metrikleri',
+        'endpoints': coalescing_metrics()
+    })
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Arka plan işleri - sadece admin kullanıcılar
+    POST ile kuyruğa iş eklenir, durum/ilerleme GET ile poll edilir
+    """
+    queryset = Job.objects.select_related('created_by')
+    serializer_class = JobSerializer
+    permission_classes = [IsAdminUser]
+    
+    # Liste en fazla bu kadar kayıt döndürür (?limit=)
+    MAX_LIST_SIZE = 500
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        
+        for param in ['status', 'name']:
+            value = self.request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{param: value})
+        
+        try:
+            limit = int(self.request.query_params.get('limit', 100))
+        except ValueError:
+            limit = 100
+        return queryset[:max(1, min(limit, self.MAX_LIST_SIZE))]
+    
+    def create(self, request, *args, **kwargs):
+        """Kuyruğa iş ekler: {"name": "...", "params": {...}}"""
+        params = request.data.get('params') or {}
+        if not isinstance(params, dict):
+            return Response({'message': 'params bir nesne olmalı'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            job = enqueue(request.data.get('name'), params=params, user=request.user)
+        except UnknownJobError as e:
+            return Response({'message': str(e), 'job_types': registered_jobs()}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'İş kuyruğa alındı',
+            'job': self.get_serializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'])
+    def types(self, request):
+        """Kayıtlı iş tipleri"""
+        return Response({'message': 'İş tipleri', 'job_types': registered_jobs()})
+    
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Henüz başlamamış işi iptal eder"""
+        job = self.get_object()
+        cancelled = Job.objects.filter(pk=job.pk, status='pending').update(
+            status='cancelled',
+            finished_at=timezone.now()
+        )
+        if not cancelled:
+            return Response({'message': 'Sadece bekleyen işler iptal edilebilir'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        job.refresh_from_db()
+        return Response({'message': 'İş iptal edildi', 'job': self.get_serializer(job).data})
+    
+    @action(detail=True, methods=['post'])
+    def retry(self, request, pk=None):
+        """Başarısız veya iptal edilmiş işi deneme sayacını sıfırlayarak tekrar kuyruğa alır"""
+        job = self.get_object()
+        requeued = Job.objects.filter(pk=job.pk, status__in=['failed', 'cancelled']).update(
+            status='pending',
+            attempts=0,
+            progress=0,
+            progress_message='',
+            run_after=timezone.now(),
+            finished_at=None
+        )
+        if not requeued:
+            return Response({'message': 'Sadece başarısız veya iptal edilmiş işler tekrar çalıştırılabilir'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        job.refresh_from_db()
+        return Response({'message': 'İş tekrar kuyruğa alındı', 'job': self.get_serializer(job).data})
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """İşin ürettiği dosyayı (result.file) indirir"""
+        job = self.get_object()
+        file_name = (job.result or {}).get('file') if isinstance(job.result, dict) else None
+        if job.status != 'succeeded' or not file_name:
+            raise Http404('İşin indirilebilir çıktısı yok')
+        
+        # Sadece çıktı klasöründeki dosyalar verilir
+        output_dir = Path(settings.JOB_OUTPUT_DIR).resolve()
+        path = (output_dir / file_name).resolve()
+        if path.parent != output_dir or not path.is_file():
+            raise Http404('Dosya bulunamadı')
+        
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
@@ -0,0 +1,24 @@
+# permissions/async_views.py
+from core.async_api import async_api_view, render_response
+from .utils import PermissionChecker
+from .views import build_system_permissions_payload, build_work_permissions_payload
+
+
+@async_api_view()
+async def get_my_system_permissions(request):
+    """Kullanıcının sistem izinleri (async)"""
+    if not request.user.is_superuser:
+        await PermissionChecker.aget_effective_permissions(request.user)
+    
+    permissions = PermissionChecker.get_user_system_permissions(request.user)
+    return render_response(build_system_permissions_payload(request.user, permissions))
+
+
+@async_api_view()
+async def get_my_work_permissions(request):
+    """Kullanıcının Work kolon yetkileri (async)"""
+    if not request.user.is_superuser:
+        await PermissionChecker.aget_effective_permissions(request.user)
+    
+    permissions = PermissionChecker.get_user_column_permissions(request.user)
+    return render_response(build_work_permissions_payload(request.user, permissions))
@@ -0,0 +1,26 @@
+# permissions/jobs.py
+from django.contrib.auth.models import User
+from core.jobs import register_job
+from .models import UserRole
+from .utils import refresh_effective_permissions
+
+
+@register_job('permissions.refresh_effective_permissions')
+def refresh_effective_permissions_job(context, user_ids=None, role_ids=None, batch_size=500):
+    """
+    Etkin yetki tablosunu batch'ler halinde yeniden hesaplar
+    user_ids ve role_ids boşsa tüm kullanıcılar için
+    """
+    user_ids = set(user_ids or [])
+    if role_ids:
+        user_ids.update(UserRole.objects.filter(role_id__in=role_ids).values_list('user_id', flat=True))
+    if not user_ids and not role_ids:
+        user_ids = set(User.objects.values_list('id', flat=True))
+    
+    user_ids = sorted(user_ids)
+    refreshed = 0
+    for start in range(0, len(user_ids), batch_size):
+        refreshed += len(refresh_effective_permissions(user_ids=user_ids[start:start + batch_size]))
+        context.progress(start + batch_size, len(user_ids), f'{refreshed} kullanıcı güncellendi')
+    
+    return {'refreshed': refreshed}
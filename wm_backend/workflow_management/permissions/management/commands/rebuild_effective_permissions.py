@@ -0,0 +1,28 @@
+# permissions/management/commands/rebuild_effective_permissions.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from permissions.utils import refresh_effective_permissions
+
+
+class Command(BaseCommand):
+    help = 'Kullanıcıların etkin yetki tablosunu rollerden yeniden oluşturur'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help='Sadece belirtilen kullanıcı(lar) için yeniden oluştur')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Tek seferde işlenecek kullanıcı sayısı')
+    
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        batch_size = options['batch_size']
+        
+        if user_ids is None:
+            user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+        
+        total = 0
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start:start + batch_size]
+            total += len(refresh_effective_permissions(user_ids=batch))
+        
+        self.stdout.write(self.style.SUCCESS(f'{total} kullanıcının etkin yetkileri yeniden oluşturuldu.'))
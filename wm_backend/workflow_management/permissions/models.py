@@ -106,4 +106,63 @@ class UserRole(models.Model):
         verbose_name = 'Kullanıcı Rolü'
         verbose_name_plural = 'Kullanıcı Rolleri'
         unique_together = ['user', 'role']
-        ordering = ['user__username', 'role__name']
\ No newline at end of file
+        ordering = ['user__username', 'role__name']
+
+class EffectivePermission(models.Model):
+    """
+    Kullanıcının rollerinden hesaplanmış etkin yetkileri
+    Rol, kolon ve sistem izni değişikliklerinde güncellenir; yetki kontrolü tek sorgu ile yapılır
+    """
+    
+    # Her kolon için 2 bit: 0 = none, 1 = read, 2 = write
+    # Bit sırası ColumnPermission.COLUMN_CHOICES sırasıdır, yeni kolonlar sona eklenmeli
+    BITS_PER_COLUMN = 2
+    PERMISSION_BITS = {'none': 0, 'read': 1, 'write': 2}
+    
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='effective_permission',
+        verbose_name='Kullanıcı'
+    )
+    column_mask = models.BigIntegerField(default=0, verbose_name='Kolon Yetki Maskesi')
+    work_create = models.BooleanField(default=False, verbose_name='İş Oluşturma')
+    work_delete = models.BooleanField(default=False, verbose_name='İş Silme')
+    updated = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')
+    
+    def __str__(self):
+        return f"{self.user} - etkin yetkiler"
+    
+    @classmethod
+    def pack_columns(cls, columns):
+        """{kolon: yetki} sözlüğünü bit maskesine dönüştürür"""
+        mask = 0
+        for index, (column_name, _) in enumerate(ColumnPermission.COLUMN_CHOICES):
+            bits = cls.PERMISSION_BITS.get(columns.get(column_name, 'none'), 0)
+            mask |= bits << (index * cls.BITS_PER_COLUMN)
+        return mask
+    
+    @classmethod
+    def unpack_columns(cls, mask):
+        """Bit maskesini {kolon: yetki} sözlüğüne dönüştürür"""
+        permissions_by_bits = {bits: permission for permission, bits in cls.PERMISSION_BITS.items()}
+        column_mask = (1 << cls.BITS_PER_COLUMN) - 1
+        
+        columns = {}
+        for index, (column_name, _) in enumerate(ColumnPermission.COLUMN_CHOICES):
+            bits = (mask >> (index * cls.BITS_PER_COLUMN)) & column_mask
+            columns[column_name] = permissions_by_bits.get(bits, 'none')
+        return columns
+    
+    @property
+    def columns(self):
+        return self.unpack_columns(self.column_mask)
+    
+    @property
+    def system(self):
+        return {'work_create': self.work_create, 'work_delete': self.work_delete}
+    
+    class Meta:
+        verbose_name = 'Etkin Yetki'
+        verbose_name_plural = 'Etkin Yetkiler'
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import Role, ColumnPermission, UserRole, SystemPermission
+from .utils import batch_permission_refresh
 from django.contrib.auth.models import User
+from django.db import transaction
 
 
 class ColumnPermissionSerializer(serializers.ModelSerializer):
@@ -75,15 +77,16 @@ class RoleCreateUpdateSerializer(serializers.ModelSerializer):
         permissions_data = validated_data.pop('permissions', {})
         system_permissions_data = validated_data.pop('system_permissions', {})
         
-        role = Role.objects.create(**validated_data)
-        
-        # Column permissions
-        if permissions_data:
-            role.column_permissions.all().delete()
-            self._handle_permissions(role, permissions_data, ColumnPermission, 'COLUMN_CHOICES')
-        
-        # System permissions
-        self._handle_permissions(role, system_permissions_data, SystemPermission, 'PERMISSION_CHOICES')
+        with transaction.atomic(), batch_permission_refresh():
+            role = Role.objects.create(**validated_data)
+            
+            # Column permissions
+            if permissions_data:
+                role.column_permissions.all().delete()
+                self._handle_permissions(role, permissions_data, ColumnPermission, 'COLUMN_CHOICES')
+            
+            # System permissions
+            self._handle_permissions(role, system_permissions_data, SystemPermission, 'PERMISSION_CHOICES')
         
         return role
     
@@ -91,14 +94,15 @@ class RoleCreateUpdateSerializer(serializers.ModelSerializer):
         permissions_data = validated_data.pop('permissions', None)
         system_permissions_data = validated_data.pop('system_permissions', None)
         
-        # Rol bilgilerini güncelle
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Permissions güncelle
-        self._handle_permissions(instance, permissions_data, ColumnPermission, 'COLUMN_CHOICES')
-        self._handle_permissions(instance, system_permissions_data, SystemPermission, 'PERMISSION_CHOICES')
+        with transaction.atomic(), batch_permission_refresh():
+            # Rol bilgilerini güncelle
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            
+            # Permissions güncelle
+            self._handle_permissions(instance, permissions_data, ColumnPermission, 'COLUMN_CHOICES')
+            self._handle_permissions(instance, system_permissions_data, SystemPermission, 'PERMISSION_CHOICES')
         
         return instance
 
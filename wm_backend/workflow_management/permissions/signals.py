@@ -1,7 +1,17 @@
 # permissions/signals.py
-from django.db.models.signals import post_save
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Role, ColumnPermission
+from .models import Role, ColumnPermission, SystemPermission, UserRole
+from .utils import batch_permission_refresh, schedule_permission_refresh
+
+
+def _is_deletion_of(origin, model):
+    """Silme işleminin verilen modelden (nesne veya queryset) başlayıp başlamadığını kontrol eder"""
+    if origin is None:
+        return False
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
 
 @receiver(post_save, sender=Role)
 def create_default_permissions(sender, instance, created, **kwargs):
@@ -10,11 +20,35 @@ def create_default_permissions(sender, instance, created, **kwargs):
     """
     if created:
         # Tüm kolonlar için okuma yetkisi oluştur
-        for column_value, column_display in ColumnPermission.COLUMN_CHOICES:
-            ColumnPermission.objects.create(
-                role=instance,
-                column_name=column_value,
-                permission='read'  # Varsayılan olarak okuma yetkisi
-            )
+        with batch_permission_refresh():
+            for column_value, column_display in ColumnPermission.COLUMN_CHOICES:
+                ColumnPermission.objects.create(
+                    role=instance,
+                    column_name=column_value,
+                    permission='read'  # Varsayılan olarak okuma yetkisi
+                )
         
-        print(f"'{instance.name}' rolü için varsayılan okuma yetkileri oluşturuldu.")
\ No newline at end of file
+        print(f"'{instance.name}' rolü için varsayılan okuma yetkileri oluşturuldu.")
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def refresh_user_permissions(sender, instance, origin=None, **kwargs):
+    """
+    Rol ataması değiştiğinde kullanıcının etkin yetkilerini güncelle
+    """
+    # Kullanıcı siliniyorsa etkin yetki kaydı da silinecek
+    if _is_deletion_of(origin, User):
+        return
+    schedule_permission_refresh(user_ids=[instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=ColumnPermission)
+@receiver([post_save, post_delete], sender=SystemPermission)
+def refresh_role_permissions(sender, instance, origin=None, **kwargs):
+    """
+    Rol yetkileri değiştiğinde role atanmış kullanıcıların etkin yetkilerini güncelle
+    """
+    # Rol siliniyorsa UserRole silme sinyalleri kullanıcıları güncelleyecek
+    if _is_deletion_of(origin, Role):
+        return
+    schedule_permission_refresh(role_ids=[instance.role_id])
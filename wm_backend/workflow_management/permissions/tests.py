@@ -1,3 +1,201 @@
-from django.test import TestCase
+# permissions/tests.py
+from django.test import TestCase, override_settings
+from core.jobs import claim_next_job, execute_job
+from django.contrib.auth.models import User
+from core.testing import QueryBudgetTestCase, create_role, create_user
+from .models import Role, UserRole, ColumnPermission, SystemPermission, EffectivePermission
+from .utils import PermissionChecker
 
-# Create your tests here.
+
+class PermissionsQueryBudgetTest(QueryBudgetTestCase):
+    """permissions endpoint'lerinin sorgu ve yanıt boyutu bütçeleri (bkz. settings.QUERY_BUDGETS)"""
+    
+    ROLES = 8
+    USERS = 30
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        roles = [create_role(f'Ek Rol {i}', columns={'price': 'write' if i % 2 else 'none'}) for i in range(cls.ROLES)]
+        # Her kullanıcıya iki rol: rol atamaları listesi satır sayısından bağımsız sorgu sayısıyla dönmeli
+        for i in range(cls.USERS):
+            create_user(f'rol_kullanici_{i}', roles=[roles[i % cls.ROLES], roles[(i + 1) % cls.ROLES]])
+        cls.role = roles[0]
+    
+    def role_list_limit(self):
+        return Role.objects.count() * 4
+    
+    def test_roles(self):
+        admin = self.users['superuser']
+        self.request_with_budget('get', '/api/permissions/roles/', admin, max_response_kb=self.role_list_limit())
+        self.request_with_budget('get', f'/api/permissions/roles/{self.role.id}/', admin)
+        self.request_with_budget('get', '/api/permissions/roles/available_columns/', admin)
+        self.assert_budget_for_users('get', '/api/permissions/roles/', users=['reader', 'no_role'], status_code=403)
+    
+    def test_role_changes(self):
+        admin = self.users['superuser']
+        self.request_with_budget('post', '/api/permissions/roles/', admin, status_code=201, data={
+            'name': 'Yeni Rol', 'permissions': {'price': 'write'}, 'system_permissions': {'work_create': True}
+        })
+        self.request_with_budget('post', f'/api/permissions/roles/{self.role.id}/update_permissions/', admin, data={
+            'permissions': {'price': 'read', 'note': 'none'}
+        })
+        self.request_with_budget('post', '/api/permissions/user-roles/', admin, status_code=201, data={
+            'user': self.users['no_role'].id, 'role': self.role.id
+        })
+    
+    def test_user_roles(self):
+        admin = self.users['superuser']
+        self.request_with_budget('get', '/api/permissions/user-roles/', admin, max_response_kb=(self.USERS * 2 + 4) * 6)
+        self.request_with_budget('get', '/api/permissions/user-roles/my_permissions/', admin)
+        self.request_with_budget('get', f"/api/permissions/user-roles/user_permissions/?user_id={self.users['mixed'].id}",
+                                 admin)
+        self.request_with_budget('get', '/api/permissions/user-roles/bulk_permissions/', admin,
+                                 max_response_kb=(self.USERS + len(self.users)) * 1.5)
+        self.request_with_budget(
+            'get', f"/api/permissions/user-roles/diff_permissions/?left=user:{self.users['mixed'].id}&right=role:{self.role.id}",
+            admin
+        )
+    
+    def test_my_permissions(self):
+        for path in ['my-work-permissions', 'my-system-permissions']:
+            self.assert_budget_for_users('get', f'/api/permissions/{path}/')
+            self.assert_budget_for_users('get', f'/api/async/permissions/{path}/')
+
+
+class BatchPermissionsTest(QueryBudgetTestCase):
+    """Toplu etkin yetkiler ve iki kullanıcı/rol arasındaki yetki farkı"""
+    
+    def get_data(self, url, status_code=200):
+        response = self.client_for(self.users['superuser']).get(url)
+        self.assertEqual(response.status_code, status_code, response.content[:500])
+        return response.json()['data']
+    
+    def test_bulk_permissions_merge_roles(self):
+        mixed, admin = self.users['mixed'], self.users['superuser']
+        data = self.get_data(f'/api/permissions/user-roles/bulk_permissions/?user_ids={mixed.id},{admin.id}')
+        users = {row['user']['id']: row for row in data['users']}
+        self.assertEqual(set(users), {mixed.id, admin.id})
+        
+        # Okuyucu rolü fiyatı gizler, baskı rolü baskı onayına yazma verir; roller en geniş yetkiyle birleşir
+        mixed_permissions = users[mixed.id]['permissions']
+        self.assertEqual(mixed_permissions['price'], 'none')
+        self.assertEqual(mixed_permissions['name'], 'read')
+        self.assertEqual(mixed_permissions['printing_confirm'], 'write')
+        self.assertEqual(len(users[mixed.id]['roles']), 2)
+        self.assertEqual(set(users[admin.id]['permissions'].values()), {'write'})
+        self.assertTrue(all(users[admin.id]['system_permissions'].values()))
+    
+    def test_bulk_permissions_rejects_invalid_ids(self):
+        self.get_data('/api/permissions/user-roles/bulk_permissions/?user_ids=1,x', status_code=400)
+    
+    def test_diff_permissions(self):
+        reader, editor = self.users['reader'], self.users['editor']
+        data = self.get_data(f'/api/permissions/user-roles/diff_permissions/?left=user:{reader.id}&right=user:{editor.id}')
+        columns = {row['column_name']: (row['left'], row['right']) for row in data['differences']['columns']}
+        self.assertEqual(columns['price'], ('none', 'write'))
+        self.assertEqual(columns['name'], ('read', 'write'))
+        system = {row['permission_type']: (row['left'], row['right']) for row in data['differences']['system']}
+        self.assertEqual(system['work_create'], (False, True))
+        
+        # Aynı yetki setleri arasında fark yoktur
+        role = Role.objects.get(name='Bütçe Okuyucu')
+        data = self.get_data(f'/api/permissions/user-roles/diff_permissions/?left=user:{reader.id}&right=role:{role.id}')
+        self.assertEqual(data['differences'], {'columns': [], 'system': []})
+    
+    def test_diff_permissions_rejects_unknown_subject(self):
+        self.get_data('/api/permissions/user-roles/diff_permissions/?left=user:0&right=team:1', status_code=400)
+
+
+class EffectivePermissionRefreshTest(TestCase):
+    """Etkin yetki kaydı rol ataması, kolon ve sistem izni değişikliklerinde güncellenir"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = create_role('Etkin Okuyucu', columns={'price': 'none'})
+        cls.user = create_user('etkin_kullanici', roles=[cls.role])
+    
+    def effective(self):
+        return EffectivePermission.objects.get(user=self.user)
+    
+    def test_user_role_changes(self):
+        self.assertEqual(self.effective().columns['name'], 'read')
+        
+        editor = create_role('Etkin Editör', columns={'price': 'write'}, system={'work_create': True})
+        user_role = UserRole.objects.create(user=self.user, role=editor)
+        effective = self.effective()
+        self.assertEqual(effective.columns['price'], 'write')
+        self.assertTrue(effective.work_create)
+        
+        user_role.delete()
+        effective = self.effective()
+        self.assertEqual(effective.columns['price'], 'none')
+        self.assertFalse(effective.work_create)
+        
+        UserRole.objects.filter(user=self.user).delete()
+        self.assertEqual(set(self.effective().columns.values()), {'none'})
+    
+    def test_column_permission_changes(self):
+        permission = ColumnPermission.objects.get(role=self.role, column_name='price')
+        permission.permission = 'write'
+        permission.save()
+        self.assertEqual(self.effective().columns['price'], 'write')
+        
+        ColumnPermission.objects.filter(role=self.role, column_name__in=['price', 'note']).delete()
+        columns = self.effective().columns
+        self.assertEqual(columns['price'], 'none')
+        self.assertEqual(columns['note'], 'none')
+        self.assertEqual(columns['name'], 'read')
+    
+    def test_system_permission_changes(self):
+        permission = SystemPermission.objects.create(role=self.role, permission_type='work_delete', granted=True)
+        self.assertTrue(self.effective().work_delete)
+        
+        permission.granted = False
+        permission.save()
+        self.assertFalse(self.effective().work_delete)
+    
+    def test_role_deletion(self):
+        self.role.delete()
+        self.assertEqual(set(self.effective().columns.values()), {'none'})
+
+
+@override_settings(PERMISSION_REFRESH_INLINE_LIMIT=1)
+class DeferredPermissionUpdateTest(QueryBudgetTestCase):
+    """Çok kullanıcılı rolde yetki vermek arka plan işini bekler, yetki almak hemen geçerli olur"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.role = create_role('Kalabalık Rol', columns={'price': 'none', 'note': 'write'})
+        cls.members = [create_user(f'kalabalik_{i}', roles=[cls.role]) for i in range(2)]
+    
+    def update(self, **changes):
+        permissions = dict(self.role.column_permissions.values_list('column_name', 'permission'))
+        response = self.client_for(self.users['superuser']).post(
+            f'/api/permissions/roles/{self.role.id}/update_permissions/',
+            {'permissions': {**permissions, **changes}}, format='json'
+        )
+        self.assertEqual(response.status_code, 202)
+        return response.json()['data']['job_id']
+    
+    def columns(self, user):
+        return PermissionChecker.get_user_column_permissions(User.objects.get(pk=user.pk))
+    
+    def test_revocation_applies_immediately(self):
+        self.update(note='read', name='none')
+        for user in self.members:
+            columns = self.columns(user)
+            self.assertEqual((columns['note'], columns['name']), ('read', 'none'))
+        
+        # Rolü olmayan kullanıcıların kayıtlarına dokunulmaz
+        self.assertTrue(EffectivePermission.objects.filter(user=self.users['reader']).exists())
+    
+    def test_grant_waits_for_job(self):
+        job_id = self.update(price='read')
+        self.assertEqual(self.columns(self.members[0])['price'], 'none')
+        
+        job = claim_next_job()
+        self.assertEqual(job.id, job_id)
+        self.assertEqual(execute_job(job), 'succeeded')
+        self.assertEqual(self.columns(self.members[0])['price'], 'read')
@@ -1,5 +1,9 @@
+import threading
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from .models import UserRole, ColumnPermission, SystemPermission
+from .models import UserRole, ColumnPermission, SystemPermission, EffectivePermission
 
 
 class PermissionChecker:
@@ -10,29 +14,211 @@ class PermissionChecker:
         'id', 'created', 'updated', 
         'status_code', 'status_text', 'status_color',
         'category_detail', 'type_detail', 'sales_channel_detail',
-        'category_name', 'type_name', 'sales_channel_name'
+        'category_name', 'type_name', 'sales_channel_name',
+        'version', 'is_archived', 'archived_at'
     ]
     
+    # Başka bir kolondan türetilen çıktı alanları, o kolonun yetkisiyle okunur
+    DERIVED_FIELDS = {
+        'links_count': 'links',
+        'first_link': 'links',
+        'note_truncated': 'note',
+    }
+    
+    # Yetki seviyeleri (none < read < write)
+    PERMISSION_LEVELS = {'none': 0, 'read': 1, 'write': 2}
+    
+    @staticmethod
+    def _merge_permission(current, new):
+        """İki kolon yetkisinden daha yüksek olanı döndürür"""
+        levels = PermissionChecker.PERMISSION_LEVELS
+        if levels.get(new, 0) > levels.get(current, 0):
+            return new
+        return current
+    
+    @staticmethod
+    def get_role_permissions(role_ids):
+        """
+        Rollerin kolon ve sistem izinlerini iki sorgu ile yükler
+        {role_id: {'columns': {...}, 'system': {...}}}
+        """
+        role_ids = set(role_ids)
+        result = {
+            role_id: {
+                'columns': {},
+                'system': {choice[0]: False for choice in SystemPermission.PERMISSION_CHOICES}
+            }
+            for role_id in role_ids
+        }
+        if not role_ids:
+            return result
+        
+        column_rows = ColumnPermission.objects.filter(role_id__in=role_ids).values_list(
+            'role_id', 'column_name', 'permission'
+        )
+        for role_id, column_name, permission in column_rows:
+            result[role_id]['columns'][column_name] = permission
+        
+        system_rows = SystemPermission.objects.filter(role_id__in=role_ids, granted=True).values_list(
+            'role_id', 'permission_type'
+        )
+        for role_id, permission_type in system_rows:
+            result[role_id]['system'][permission_type] = True
+        
+        return result
+    
+    @staticmethod
+    def merge_role_permissions(role_permissions):
+        """Birden fazla rolün yetkilerini bellekte birleştirir"""
+        columns = {}
+        system = {choice[0]: False for choice in SystemPermission.PERMISSION_CHOICES}
+        
+        for permissions in role_permissions:
+            for column_name, permission in permissions['columns'].items():
+                columns[column_name] = PermissionChecker._merge_permission(
+                    columns.get(column_name, 'none'), permission
+                )
+            for permission_type, granted in permissions['system'].items():
+                system[permission_type] = system.get(permission_type, False) or granted
+        
+        return {'columns': columns, 'system': system}
+    
+    @staticmethod
+    def get_superuser_permissions():
+        """Superuser için tam yetki seti"""
+        return {
+            'columns': {choice[0]: 'write' for choice in ColumnPermission.COLUMN_CHOICES},
+            'system': {choice[0]: True for choice in SystemPermission.PERMISSION_CHOICES}
+        }
+    
+    @staticmethod
+    def resolve_role_permissions_for_users(user_ids):
+        """
+        Kullanıcıların rollerinden gelen yetkileri sabit sayıda sorgu ile hesaplar
+        Superuser durumu dikkate alınmaz
+        {user_id: {'roles': [...], 'columns': {...}, 'system': {...}}}
+        """
+        user_ids = list(user_ids)
+        
+        roles_by_user = {user_id: [] for user_id in user_ids}
+        user_role_rows = UserRole.objects.filter(user_id__in=user_ids).values_list(
+            'user_id', 'role_id', 'role__name'
+        )
+        for user_id, role_id, role_name in user_role_rows:
+            roles_by_user[user_id].append({'id': role_id, 'name': role_name})
+        
+        role_ids = {role['id'] for roles in roles_by_user.values() for role in roles}
+        role_permissions = PermissionChecker.get_role_permissions(role_ids)
+        
+        result = {}
+        for user_id, roles in roles_by_user.items():
+            merged = PermissionChecker.merge_role_permissions(
+                role_permissions[role['id']] for role in roles
+            )
+            result[user_id] = {'roles': roles, **merged}
+        
+        return result
+    
+    @staticmethod
+    def get_bulk_user_permissions(users):
+        """
+        Birden fazla kullanıcının etkin yetkilerini sabit sayıda sorgu ile döndürür
+        {user_id: {'roles': [...], 'columns': {...}, 'system': {...}}}
+        """
+        users = list(users)
+        result = PermissionChecker.resolve_role_permissions_for_users(user.id for user in users)
+        
+        for user in users:
+            if user.is_superuser:
+                result[user.id].update(PermissionChecker.get_superuser_permissions())
+        
+        return result
+    
+    @staticmethod
+    def diff_permissions(left, right):
+        """İki yetki seti arasındaki farkları döndürür"""
+        column_display = dict(ColumnPermission.COLUMN_CHOICES)
+        system_display = dict(SystemPermission.PERMISSION_CHOICES)
+        
+        column_diff = []
+        for column_name, display_name in column_display.items():
+            left_perm = left['columns'].get(column_name, 'none')
+            right_perm = right['columns'].get(column_name, 'none')
+            if left_perm != right_perm:
+                column_diff.append({
+                    'column_name': column_name,
+                    'display_name': display_name,
+                    'left': left_perm,
+                    'right': right_perm
+                })
+        
+        system_diff = []
+        for permission_type, display_name in system_display.items():
+            left_granted = left['system'].get(permission_type, False)
+            right_granted = right['system'].get(permission_type, False)
+            if left_granted != right_granted:
+                system_diff.append({
+                    'permission_type': permission_type,
+                    'display_name': display_name,
+                    'left': left_granted,
+                    'right': right_granted
+                })
+        
+        return {'columns': column_diff, 'system': system_diff}
+    
+    @staticmethod
+    def revokes_permissions(old_columns, new_columns):
+        """Yeni kolon yetkilerinden herhangi biri eskisinden düşük mü? (yetki alma / okumaya indirme)"""
+        levels = PermissionChecker.PERMISSION_LEVELS
+        return any(
+            levels.get(new_columns.get(column_name, 'none'), 0) < levels.get(permission, 0)
+            for column_name, permission in old_columns.items()
+        )
+    
+    @staticmethod
+    def get_effective_permissions(user):
+        """
+        Kullanıcının etkin yetki kaydını tek sorgu ile okur
+        Kayıt yoksa rollerden hesaplanıp oluşturulur. Sonuç istek süresince user nesnesinde tutulur.
+        """
+        cached = getattr(user, '_effective_permissions', None)
+        if cached is not None:
+            return cached
+        
+        effective = EffectivePermission.objects.filter(user_id=user.id).first()
+        if effective is None:
+            effective = refresh_effective_permissions(user_ids=[user.id]).get(user.id) or EffectivePermission()
+        
+        permissions = {'columns': effective.columns, 'system': effective.system}
+        user._effective_permissions = permissions
+        return permissions
+    
+    @staticmethod
+    async def aget_effective_permissions(user):
+        """
+        get_effective_permissions'ın async ORM kullanan karşılığı
+        Çağrıldıktan sonra senkron yetki metodları aynı istekte veritabanına gitmez
+        """
+        cached = getattr(user, '_effective_permissions', None)
+        if cached is not None:
+            return cached
+        
+        effective = await EffectivePermission.objects.filter(user_id=user.id).afirst()
+        if effective is None:
+            refreshed = await sync_to_async(refresh_effective_permissions)(user_ids=[user.id])
+            effective = refreshed.get(user.id) or EffectivePermission()
+        
+        permissions = {'columns': effective.columns, 'system': effective.system}
+        user._effective_permissions = permissions
+        return permissions
+    
     @staticmethod
     def get_user_column_permissions(user):
         """Kullanıcının tüm kolon yetkilerini döndürür"""
         if user.is_superuser:
             return {choice[0]: 'write' for choice in ColumnPermission.COLUMN_CHOICES}
         
-        permissions = {}
-        user_roles = UserRole.objects.filter(user=user).select_related('role')
-        
-        for user_role in user_roles:
-            role_permissions = ColumnPermission.objects.filter(role=user_role.role)
-            
-            for perm in role_permissions:
-                current_perm = permissions.get(perm.column_name, 'none')
-                
-                # Daha yüksek yetkiyi al (none < read < write)
-                if perm.permission == 'write' or (perm.permission == 'read' and current_perm != 'write'):
-                    permissions[perm.column_name] = perm.permission
-        
-        return permissions
+        return PermissionChecker.get_effective_permissions(user)['columns']
     
     @staticmethod
     def get_user_system_permissions(user):
@@ -40,16 +226,7 @@ class PermissionChecker:
         if user.is_superuser:
             return {'work_create': True, 'work_delete': True}
         
-        permissions = {'work_create': False, 'work_delete': False}
-        
-        user_roles = UserRole.objects.filter(user=user).select_related('role')
-        
-        for user_role in user_roles:
-            system_perms = SystemPermission.objects.filter(role=user_role.role, granted=True)
-            for perm in system_perms:
-                permissions[perm.permission_type] = True
-        
-        return permissions
+        return PermissionChecker.get_effective_permissions(user)['system']
     
     @staticmethod
     def can_read_column(user, column_name):
@@ -98,7 +275,8 @@ class PermissionChecker:
         
         # Yetki olan alanları ekle
         for field, value in data.items():
-            if field in permissions and permissions[field] in ['read', 'write']:
+            column = PermissionChecker.DERIVED_FIELDS.get(field, field)
+            if column in permissions and permissions[column] in ['read', 'write']:
                 filtered_data[field] = value
         
         # Sistem alanlarını her zaman ekle
@@ -130,4 +308,94 @@ class PermissionChecker:
             field_names = [dict(ColumnPermission.COLUMN_CHOICES).get(f, f) for f in unauthorized_fields]
             return False, f"Bu alanlara yazma yetkiniz yok: {', '.join(field_names)}"
         
-        return True, None
\ No newline at end of file
+        return True, None
+
+
+_refresh_state = threading.local()
+
+
+def refresh_effective_permissions(user_ids=None, role_ids=None):
+    """
+    Verilen kullanıcıların ve rollere atanmış kullanıcıların etkin yetki kayıtlarını yeniden hesaplar
+    Oluşturulan/güncellenen kayıtları {user_id: EffectivePermission} olarak döndürür
+    """
+    user_ids = set(user_ids or [])
+    if role_ids:
+        user_ids.update(UserRole.objects.filter(role_id__in=role_ids).values_list('user_id', flat=True))
+    
+    # Silinmiş kullanıcılar için kayıt oluşturma
+    user_ids = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+    if not user_ids:
+        return {}
+    
+    resolved = PermissionChecker.resolve_role_permissions_for_users(user_ids)
+    records = [
+        EffectivePermission(
+            user_id=user_id,
+            column_mask=EffectivePermission.pack_columns(permissions['columns']),
+            work_create=permissions['system'].get('work_create', False),
+            work_delete=permissions['system'].get('work_delete', False)
+        )
+        for user_id, permissions in resolved.items()
+    ]
+    EffectivePermission.objects.bulk_create(
+        records,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['column_mask', 'work_create', 'work_delete', 'updated']
+    )
+    return {record.user_id: record for record in records}
+
+
+def invalidate_effective_permissions(role_ids):
+    """
+    Rollere atanmış kullanıcıların etkin yetki kayıtlarını siler, silinen kayıt sayısını döndürür
+    Kaydı olmayan kullanıcının yetkisi ilk kontrolde rollerinden hesaplanır (bkz. get_effective_permissions)
+    """
+    user_ids = UserRole.objects.filter(role_id__in=role_ids).values('user_id')
+    return EffectivePermission.objects.filter(user_id__in=user_ids).delete()[0]
+
+
+def schedule_permission_refresh(user_ids=None, role_ids=None):
+    """
+    Etkin yetki güncellemesini planlar
+    batch_permission_refresh bloğu içindeyse biriktirir, değilse hemen uygular
+    """
+    pending = getattr(_refresh_state, 'pending', None)
+    if pending is None:
+        refresh_effective_permissions(user_ids=user_ids, role_ids=role_ids)
+        return
+    
+    pending['users'].update(user_ids or [])
+    pending['roles'].update(role_ids or [])
+
+
+@contextmanager
+def batch_permission_refresh(defer=False, user=None):
+    """
+    Blok içindeki yetki değişikliklerini biriktirip blok sonunda tek seferde uygular
+    defer=True ise hesaplama arka plan işine bırakılır; oluşan iş yield edilen sözlükte 'job' anahtarındadır
+    """
+    state = {}
+    if getattr(_refresh_state, 'pending', None) is not None:
+        yield state
+        return
+    
+    _refresh_state.pending = {'users': set(), 'roles': set()}
+    try:
+        yield state
+    finally:
+        pending = _refresh_state.pending
+        _refresh_state.pending = None
+    
+    if defer:
+        if not pending['users'] and not pending['roles']:
+            return
+        from core.jobs import enqueue
+        state['job'] = enqueue('permissions.refresh_effective_permissions', params={
+            'user_ids': sorted(pending['users']),
+            'role_ids': sorted(pending['roles'])
+        }, user=user)
+        return
+    
+    refresh_effective_permissions(user_ids=pending['users'], role_ids=pending['roles'])
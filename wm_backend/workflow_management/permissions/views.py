@@ -8,8 +8,12 @@ from .serializers import (
     RoleSerializer, RoleCreateUpdateSerializer, 
     UserRoleSerializer, ColumnPermissionSerializer
 )
-from .utils import PermissionChecker
+from .utils import (
+    PermissionChecker, batch_permission_refresh, invalidate_effective_permissions, schedule_permission_refresh
+)
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -25,18 +29,24 @@ def get_my_system_permissions(request):
     permissions = PermissionChecker.get_user_system_permissions(request.user)
     
     # CustomJSONRenderer zaten sarmalıyor, direkt veriyi dönelim
-    return Response({
+    return Response(build_system_permissions_payload(request.user, permissions))
+
+
+def build_system_permissions_payload(user, permissions):
+    """my-system-permissions yanıtı (sync ve async view'lar ortak kullanır)"""
+    return {
         'work_create': permissions.get('work_create', False),
         'work_delete': permissions.get('work_delete', False),
-        'is_superuser': request.user.is_superuser
-    })
+        'is_superuser': user.is_superuser
+    }
 
 class RoleViewSet(viewsets.ModelViewSet):
     """
     Rol yönetimi için ViewSet
     Sadece admin kullanıcılar erişebilir
     """
-    queryset = Role.objects.all()
+    # Rol listesi her rolün kolon ve sistem yetkilerini içerir (N+1 olmasın)
+    queryset = Role.objects.prefetch_related('column_permissions', 'system_permissions')
     permission_classes = [IsAdminUser]
     
     def get_serializer_class(self):
@@ -74,21 +84,39 @@ class RoleViewSet(viewsets.ModelViewSet):
         role = self.get_object()
         permissions_data = request.data.get('permissions', {})
         
-        # Mevcut yetkileri sil
-        role.column_permissions.all().delete()
+        # Çok kullanıcılı rollerde etkin yetki tablosu arka planda yeniden hesaplanır;
+        # iş tamamlanana kadar kullanıcılar yeni verilen yetkileri göremez
+        defer = UserRole.objects.filter(role=role).count() > settings.PERMISSION_REFRESH_INLINE_LIMIT
         
-        # Yeni yetkileri oluştur
-        created_permissions = []
-        for column_name, permission in permissions_data.items():
-            if column_name in [choice[0] for choice in ColumnPermission.COLUMN_CHOICES]:
-                perm = ColumnPermission.objects.create(
-                    role=role,
-                    column_name=column_name,
-                    permission=permission
-                )
-                created_permissions.append(perm)
+        with transaction.atomic(), batch_permission_refresh(defer=defer, user=request.user) as refresh:
+            old_permissions = dict(role.column_permissions.values_list('column_name', 'permission'))
+            
+            # Mevcut yetkileri sil
+            role.column_permissions.all().delete()
+            
+            # Yeni yetkileri tek sorguda oluştur (bulk_create sinyal göndermediği için yenileme burada planlanır)
+            column_names = [choice[0] for choice in ColumnPermission.COLUMN_CHOICES]
+            created_permissions = ColumnPermission.objects.bulk_create([
+                ColumnPermission(role=role, column_name=column_name, permission=permission)
+                for column_name, permission in permissions_data.items()
+                if column_name in column_names
+            ])
+            schedule_permission_refresh(role_ids=[role.id])
+            
+            # Yetki kısıtlamaları işi beklemez: kayıtlar silinir, kullanıcıların yetkisi ilk istekte yeniden hesaplanır
+            if defer and PermissionChecker.revokes_permissions(
+                old_permissions, {perm.column_name: perm.permission for perm in created_permissions}
+            ):
+                invalidate_effective_permissions([role.id])
         
         serializer = ColumnPermissionSerializer(created_permissions, many=True)
+        if refresh.get('job'):
+            return Response({
+                'message': 'Rol yetkileri kaydedildi, kullanıcı yetkileri arka planda güncelleniyor',
+                'permissions': serializer.data,
+                'job_id': refresh['job'].id
+            }, status=status.HTTP_202_ACCEPTED)
+        
         return Response({
             'message': 'Rol yetkileri güncellendi',
             'permissions': serializer.data
@@ -100,7 +128,9 @@ class UserRoleViewSet(viewsets.ModelViewSet):
     Kullanıcı-Rol atamaları için ViewSet
     Sadece admin kullanıcılar erişebilir
     """
-    queryset = UserRole.objects.all()
+    queryset = UserRole.objects.select_related('user', 'role', 'assigned_by').prefetch_related(
+        'role__column_permissions', 'role__system_permissions'
+    )
     serializer_class = UserRoleSerializer
     permission_classes = [IsAdminUser]
     
@@ -187,6 +217,96 @@ class UserRoleViewSet(viewsets.ModelViewSet):
             'permissions': detailed_permissions
         })
     
+    @action(detail=False, methods=['get'])
+    def bulk_permissions(self, request):
+        """
+        Birden fazla kullanıcının etkin yetkilerini tek yanıtta döndürür
+        Query param: user_ids (virgülle ayrılmış, boş ise tüm kullanıcılar)
+        """
+        users = User.objects.only('id', 'username', 'first_name', 'last_name', 'is_superuser').order_by('username')
+        
+        user_ids = request.query_params.get('user_ids')
+        if user_ids:
+            try:
+                user_ids = [int(user_id) for user_id in user_ids.split(',') if user_id.strip()]
+            except ValueError:
+                return Response({
+                    'message': 'user_ids virgülle ayrılmış sayılardan oluşmalı'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            users = users.filter(id__in=user_ids)
+        
+        users = list(users)
+        bulk_permissions = PermissionChecker.get_bulk_user_permissions(users)
+        
+        users_data = []
+        for user in users:
+            permissions = bulk_permissions[user.id]
+            users_data.append({
+                'user': {
+                    'id': user.id,
+                    'username': user.username,
+                    'full_name': user.get_full_name() or user.username,
+                    'is_superuser': user.is_superuser
+                },
+                'roles': permissions['roles'],
+                'permissions': {
+                    column_value: permissions['columns'].get(column_value, 'none')
+                    for column_value, column_display in ColumnPermission.COLUMN_CHOICES
+                },
+                'system_permissions': permissions['system']
+            })
+        
+        return Response({
+            'message': 'Kullanıcı yetkileri',
+            'columns': [
+                {'column_name': column_value, 'display_name': column_display}
+                for column_value, column_display in ColumnPermission.COLUMN_CHOICES
+            ],
+            'users': users_data
+        })
+    
+    def _resolve_permission_subject(self, value):
+        """'user:<id>' veya 'role:<id>' formatındaki değerin yetki setini döndürür"""
+        subject_type, _, subject_id = (value or '').partition(':')
+        if subject_type not in ['user', 'role'] or not subject_id.isdigit():
+            return None, None
+        
+        if subject_type == 'role':
+            role = Role.objects.filter(id=subject_id).first()
+            if not role:
+                return None, None
+            role_permissions = PermissionChecker.get_role_permissions([role.id])
+            subject = {'type': 'role', 'id': role.id, 'name': role.name}
+            return subject, PermissionChecker.merge_role_permissions(role_permissions.values())
+        
+        user = User.objects.filter(id=subject_id).first()
+        if not user:
+            return None, None
+        permissions = PermissionChecker.get_bulk_user_permissions([user])[user.id]
+        subject = {'type': 'user', 'id': user.id, 'name': user.get_full_name() or user.username}
+        return subject, permissions
+    
+    @action(detail=False, methods=['get'])
+    def diff_permissions(self, request):
+        """
+        İki kullanıcı veya rol arasındaki yetki farklarını döndürür
+        Query params: left, right (ör. left=user:5&right=role:2)
+        """
+        left_subject, left_permissions = self._resolve_permission_subject(request.query_params.get('left'))
+        right_subject, right_permissions = self._resolve_permission_subject(request.query_params.get('right'))
+        
+        if not left_subject or not right_subject:
+            return Response({
+                'message': "left ve right parametreleri 'user:<id>' veya 'role:<id>' formatında olmalı"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'Yetki farkları',
+            'left': left_subject,
+            'right': right_subject,
+            'differences': PermissionChecker.diff_permissions(left_permissions, right_permissions)
+        })
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -195,20 +315,23 @@ def get_my_work_permissions(request):
     Kullanıcının Work modeli için kolon yetkilerini döndürür
     Sadece 'r' (read), 'w' (write), 'rw' (read-write) formatında
     """
+    permissions = PermissionChecker.get_user_column_permissions(request.user)
+    return Response(build_work_permissions_payload(request.user, permissions))
+
+
+def build_work_permissions_payload(user, permissions):
+    """my-work-permissions yanıtı (sync ve async view'lar ortak kullanır)"""
     # Superuser kontrolü
-    if request.user.is_superuser:
+    if user.is_superuser:
         # Superuser için tüm kolonlara tam yetki
         all_permissions = {}
         for column_value, column_display in ColumnPermission.COLUMN_CHOICES:
             all_permissions[column_value] = 'rw'
         
-        return Response({
+        return {
             'message': 'Kolon yetkileri (Superuser)',
             **all_permissions  # Direkt permissions'ı spread et
-        })
-    
-    # Normal kullanıcılar için yetki kontrolü
-    permissions = PermissionChecker.get_user_column_permissions(request.user)
+        }
     
     # Formatı sadeleştir
     simple_permissions = {}
@@ -219,7 +342,7 @@ def get_my_work_permissions(request):
             simple_permissions[column] = 'r'
         # 'none' olanları ekleme, frontend'de olmayan = yetki yok
     
-    return Response({
+    return {
         'message': 'Kolon yetkileri',
         **simple_permissions
-    })
\ No newline at end of file
+    }
\ No newline at end of file
@@ -1,7 +1,9 @@
 """Django settings for workflow_management project."""
 
+import os
 from pathlib import Path
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 # Build paths
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -41,6 +43,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReadReplicaMiddleware',
+    'core.middleware.RequestProfilingMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'workflow_management.urls'
@@ -70,6 +75,28 @@ DATABASES = {
     }
 }
 
+# Okuma replikaları: WM_DB_REPLICAS="replica1.sqlite3,replica2.sqlite3" (yerelde SQLite dosyaları,
+# bkz. sync_sqlite_replicas). Üretimde replika bağlantıları aynı şekilde DATABASES'a eklenir.
+DATABASE_REPLICAS = []
+for index, replica_name in enumerate(filter(None, os.environ.get('WM_DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / replica_name.strip(),
+        # Testlerde replika primary'nin aynısıdır
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Yazma yapan istemcinin okumaları bu kadar saniye primary'den yapılır (replika gecikmesinden uzun olmalı)
+READ_YOUR_WRITES_WINDOW = 5
+
+# Replikadan üretilen liste cache kayıtlarının en uzun ömrü: yazmadan hemen sonra gecikmeli replikadan
+# okunan eski veri yeni veri versiyonuyla cache'lenirse bu süre sonunda düşer
+REPLICA_CACHE_TIMEOUT = 15
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -88,6 +115,127 @@ USE_TZ = True
 # Static files
 STATIC_URL = 'static/'
 
+# Cache
+# Birden fazla process/sunucu ile çalışırken ortak bir backend (Redis, Memcached) kullanılmalı,
+# aksi halde liste cache'i diğer process'lerdeki yazmalardan haberdar olmaz
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# İş listesi yanıt cache'i (saniye) ve gzip uygulanacak minimum yanıt boyutu (byte)
+WORKFLOW_LIST_CACHE_TIMEOUT = 300
+WORKFLOW_LIST_GZIP_MIN_SIZE = 1024
+# İş listesi DRF serializer yerine values() tabanlı FastWorkflowSerializer ile üretilir (çıktı aynı)
+WORKFLOW_FAST_SERIALIZER = True
+# Liste (grid) gösteriminde notun en fazla kaç karakteri döner (?view=full ve detay tam notu döndürür)
+WORKFLOW_LIST_NOTE_LENGTH = 120
+
+# Takvim (workflows.timeline): tek istekte sorgulanabilecek en uzun pencere ve başlangıç indeksinden okunan
+# kısa aralıkların en uzun süresi (gün). Daha uzun aralıklar bitiş tarihine göre kısmi indeksten ayrıca okunur
+# (indeks koşulu bu değeri kullanır, değişirse makemigrations gerekir).
+WORKFLOW_TIMELINE_MAX_DAYS = 92
+WORKFLOW_TIMELINE_SHORT_SPAN_DAYS = 31
+
+# Birleştirilmiş (single-flight) isteklerde liderin sonucunu en fazla kaç saniye bekleyeceği
+COALESCING_WAIT_TIMEOUT = 30
+
+# Arka plan işleri (core.Job, run_jobs komutu)
+JOB_WORKERS = 2
+JOB_RETRY_DELAY = 30  # saniye, her denemede iki katına çıkar
+JOB_STALE_AFTER = 300  # heartbeat bu kadar saniye gelmezse iş tekrar kuyruğa alınır
+JOB_OUTPUT_DIR = BASE_DIR / 'job_output'
+
+# İstek profilleme: superuser'lar X-Profile: 1 header'ı ya da ?_profile=1 ile tek isteği profilleyebilir
+PROFILING_ENABLED = True
+PROFILE_QUERY_PARAM = '_profile'
+PROFILE_MAX_QUERIES = 1000  # saklanan en fazla sorgu (sayım ve toplam süre hepsini kapsar)
+PROFILE_STATS_LIMIT = 60  # cProfile çıktısındaki fonksiyon sayısı
+
+# Endpoint sorgu/yanıt boyutu bütçeleri (URL adı ya da 'METOD URL adı' -> bütçe)
+# Testler (core.testing.QueryBudgetTestCase) bütçeleri doğrular; QueryBudgetMiddleware geliştirme
+# ortamında aşımları 'core.query_budget' logger'ına uyarı olarak yazar. Sorgu sayıları satır sayısından
+# bağımsız olmalı; response_kb sadece boyutu veriyle büyümeyen endpoint'ler için tanımlanır.
+QUERY_BUDGET_WARNINGS = DEBUG
+QUERY_BUDGETS = {
+    # workflows
+    'work-list': {'queries': 10},
+    'POST work-list': {'queries': 14, 'response_kb': 8},
+    'work-detail': {'queries': 6, 'response_kb': 8},
+    'PATCH work-detail': {'queries': 24, 'response_kb': 8},
+    'PUT work-detail': {'queries': 24, 'response_kb': 8},
+    'DELETE work-detail': {'queries': 16},
+    'work-add-link': {'queries': 16, 'response_kb': 4},
+    'work-remove-link': {'queries': 18, 'response_kb': 4},
+    'work-restore': {'queries': 24, 'response_kb': 8},
+    'work-as-of': {'queries': 8, 'response_kb': 8},
+    'work-field-changes': {'queries': 4},
+    'bootstrap': {'queries': 12},
+    'work-analytics': {'queries': 6, 'response_kb': 16},
+    'work-calendar': {'queries': 5},
+    'work-overdue': {'queries': 5},
+    'work-links-lookup': {'queries': 5},
+    'work-import-works': {'queries': 40},
+    'movement-list': {'queries': 4},
+    'movement-detail': {'queries': 4, 'response_kb': 16},
+    'category-list': {'queries': 3},
+    'worktype-list': {'queries': 3},
+    'saleschannel-list': {'queries': 3},
+    'async-workflow-list': {'queries': 6},
+    'async-workflow-detail': {'queries': 6, 'response_kb': 8},
+    'async-movement-list': {'queries': 4},
+    'async-category-list': {'queries': 3},
+    'async-work-type-list': {'queries': 3},
+    'async-sales-channel-list': {'queries': 3},
+    # authentication
+    'login': {'queries': 3, 'response_kb': 4},
+    'register': {'queries': 6, 'response_kb': 4},
+    'list_users': {'queries': 4},
+    'search_users': {'queries': 3, 'response_kb': 16},
+    'user_detail': {'queries': 4, 'response_kb': 4},
+    'async-search-users': {'queries': 3, 'response_kb': 16},
+    # permissions
+    'role-list': {'queries': 5},
+    'POST role-list': {'queries': 34, 'response_kb': 4},
+    'role-detail': {'queries': 5, 'response_kb': 16},
+    'role-available-columns': {'queries': 2, 'response_kb': 8},
+    'role-update-permissions': {'queries': 18, 'response_kb': 16},
+    'userrole-list': {'queries': 5},
+    'POST userrole-list': {'queries': 15, 'response_kb': 16},
+    'userrole-my-permissions': {'queries': 3, 'response_kb': 8},
+    'userrole-user-permissions': {'queries': 5, 'response_kb': 8},
+    'userrole-bulk-permissions': {'queries': 6},
+    'userrole-diff-permissions': {'queries': 9, 'response_kb': 8},
+    'my-work-permissions': {'queries': 3, 'response_kb': 4},
+    'my-system-permissions': {'queries': 3, 'response_kb': 1},
+    'async-my-work-permissions': {'queries': 3, 'response_kb': 4},
+    'async-my-system-permissions': {'queries': 3, 'response_kb': 1},
+    # core
+    'coalescing-metrics': {'queries': 2, 'response_kb': 8},
+    'job-list': {'queries': 3},
+    'POST job-list': {'queries': 4, 'response_kb': 4},
+    'job-detail': {'queries': 3, 'response_kb': 8},
+    'job-types': {'queries': 2, 'response_kb': 4},
+    'job-cancel': {'queries': 5, 'response_kb': 4},
+    'job-retry': {'queries': 5, 'response_kb': 4},
+}
+
+# Bu sayıdan fazla kullanıcısı olan rolün yetki güncellemesi arka plan işine bırakılır
+PERMISSION_REFRESH_INLINE_LIMIT = 1000
+
+# Kaç güncelleme hareketinde bir işin tam snapshot'ı alınacağı (geçmiş sorgularında replay sınırı)
+WORK_SNAPSHOT_INTERVAL = 50
+
+# Aynı kullanıcının aynı işteki bu kadar saniye içindeki ardışık güncellemeleri tek harekete birleştirilir (0: kapalı)
+MOVEMENT_COALESCE_WINDOW = 60
+
+# Tamamlanmış işlerin son güncellemeden kaç gün sonra arşive taşınacağı (archive_works komutu)
+WORK_ARCHIVE_AFTER_DAYS = 90
+
+# Güncelleme hareketleri ve alan değişikliği kayıtları kaç gün saklanır (compact_audit komutu)
+AUDIT_RETENTION_DAYS = 365
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -111,4 +259,6 @@ REST_FRAMEWORK = {
 }
 
 # CORS
-CORS_ALLOWED_ORIGINS = ["http://localhost:3000"]
\ No newline at end of file
+CORS_ALLOWED_ORIGINS = ["http://localhost:3000"]
+CORS_ALLOW_HEADERS = (*default_headers, 'if-match')
+CORS_EXPOSE_HEADERS = ['ETag']
\ No newline at end of file
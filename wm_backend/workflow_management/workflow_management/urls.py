@@ -10,4 +10,6 @@ urlpatterns = [
     path('api/', include('workflows.urls')),
     path('api/auth/', include('authentication.urls')),
     path('api/permissions/', include('permissions.urls')),  # Yeni eklendi
+    path('api/core/', include('core.urls')),  # Sistem metrikleri ve arka plan işleri
+    path('api/async/', include('core.async_urls')),  # ASGI ile çalışan async okuma endpoint'leri
 ]
\ No newline at end of file
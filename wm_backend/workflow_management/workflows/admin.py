@@ -1,58 +1,74 @@
 # workflows/admin.py
 from django.contrib import admin
-from .models import Work, Movement, Category, SalesChannel, WorkType
-from django import forms
-from django.contrib import admin
-import json
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from core.admin_utils import AutocompleteFilter, EstimatedCountPaginator
+from .models import Work, Link, Movement, Category, SalesChannel, WorkType
 
-class PrettyJSONWidget(forms.Textarea):
-    """JSON verilerini düzgün göstermek için widget"""
-    
-    def format_value(self, value):
-        if value is None:
-            return None
-        try:
-            if isinstance(value, str):
-                value = json.loads(value)
-            return json.dumps(value, indent=2, ensure_ascii=False)
-        except:
-            return super().format_value(value)
 
-class WorkAdminForm(forms.ModelForm):
-    """Work admin formu"""
-    
-    class Meta:
-        model = Work
-        fields = '__all__'
-        widgets = {
-            'links': PrettyJSONWidget(attrs={'rows': 10, 'cols': 80})
-        }
+class LinkInline(admin.TabularInline):
+    """İş düzenleme sayfasında bağlantıları göstermek için"""
+    model = Link
+    extra = 1
+    fields = ['url', 'title', 'description', 'added_by', 'added_at']
+    readonly_fields = ['added_by', 'added_at']
+
+
+class UserFilter(AutocompleteFilter):
+    """Kullanıcı listesini sayfaya gömmeden, arama ile kullanıcı filtresi"""
+    title = 'Kullanıcı'
+    field_name = 'user'
+
 
 @admin.register(Work)
 class WorkAdmin(admin.ModelAdmin):
-    form = WorkAdminForm
     list_display = ['name', 'category', 'get_links_count', 'created', 'updated']
     list_filter = ['category', 'created']
+    list_select_related = ['category']
     search_fields = ['name', 'note']
-    date_hierarchy = 'created'
+    inlines = [LinkInline]
+    # Büyük tablolarda tam COUNT(*) ve date_hierarchy'nin tarih taraması yapılmaz
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_queryset(self, request):
+        # GROUP BY yerine sadece listelenen sayfa için çalışan alt sorgu
+        links_count = Link.objects.filter(work=OuterRef('pk')).order_by().values('work').annotate(
+            count=Count('id')
+        ).values('count')
+        return super().get_queryset(request).annotate(
+            links_count=Coalesce(Subquery(links_count, output_field=IntegerField()), 0)
+        )
     
     def get_links_count(self, obj):
         """Bağlantı sayısını göster"""
-        if obj.links:
-            return f"{len(obj.links)} bağlantı"
-        return "0 bağlantı"
+        return f"{obj.links_count} bağlantı"
     get_links_count.short_description = 'Bağlantılar'
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Admin'den yapılan değişiklikten önce API'den alınmış ETag'ler geçersiz olsun
+        if change:
+            form.instance.bump_version()
 
 @admin.register(Movement)
 class MovementAdmin(admin.ModelAdmin):
     list_display = ['user', 'action', 'get_work_name', 'created']
-    list_filter = ['action', 'created', 'user']
-    search_fields = ['description', 'work__name']
-    readonly_fields = ['user', 'work', 'action', 'description', 'changes', 'created']
-    date_hierarchy = 'created'
+    list_filter = ['action', 'created', UserFilter]
+    list_select_related = ['user']
+    # Kayıttaki isimler üzerinde önek araması (JOIN ve tam metin taraması yok)
+    search_fields = ['^work_name', '^user_fullname']
+    readonly_fields = ['user', 'work', 'action', 'description', 'changes', 'created', 'updated']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    @property
+    def media(self):
+        return super().media + AutocompleteFilter.autocomplete_media(Movement, 'user', self.admin_site)
     
     def get_work_name(self, obj):
-        return obj.work.name if obj.work else '-'
+        # İş arşivlenmiş olabilir, kayıttaki isim kullanılır
+        return obj.work_name or '-'
     get_work_name.short_description = 'İş'
     
     def has_add_permission(self, request):
@@ -0,0 +1,297 @@
+# workflows/analytics.py
+"""
+Üretim aşaması süre analitiği
+Her işin tamamlanmış aşamaları WorkStageFact'te, bunların dönem/boyut bazındaki gün histogramı
+StageDurationRollup'ta tutulur. İş kaydedildikçe sadece değişen kayıtlar histogramda artırılıp azaltılır;
+analitik sorgusu geçmişin uzunluğundan bağımsız olarak özet tablosundan okunur.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from functools import reduce
+import operator
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from .models import Work, ArchivedWork, WorkStageFact, StageDurationRollup, Category, SalesChannel
+
+# Aşama: (başlangıç alanı, bitiş alanı, görünen ad)
+STAGES = {
+    'design': ('design_start_date', 'design_end_date', 'Tasarım'),
+    'confirm': ('design_end_date', 'confirm_date', 'Onay'),
+    'printing': ('printing_start_date', 'printing_end_date', 'Baskı'),
+    'packaging': ('printing_end_date', 'packaging_date', 'Paketleme'),
+    'shipping': ('packaging_date', 'shipping_date', 'Sevkiyat'),
+    'lead_time': ('design_start_date', 'shipping_date', 'Toplam Süre'),
+}
+
+# Aşama kayıtlarının okuduğu iş alanları (bunlar değişmeyen kayıtlarda aşama kayıtları yenilenmez)
+FACT_SOURCE_FIELDS = sorted(
+    {field for start_field, end_field, _ in STAGES.values() for field in [start_field, end_field]}
+    | {'designer_id', 'category_id', 'sales_channel_id'}
+)
+
+# Boyut: (WorkStageFact alanı, isim kaynağı)
+DIMENSIONS = {
+    'all': None,
+    'designer': 'designer_id',
+    'category': 'category_id',
+    'sales_channel': 'sales_channel_id',
+}
+
+PERIODS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# Tek UPDATE sorgusundaki OR koşulu sayısı (SQLite ifade derinliği sınırı)
+ROLLUP_UPDATE_CHUNK = 100
+
+
+def period_start(value, period):
+    """Tarihin ait olduğu haftanın pazartesisi ya da ayın ilk günü"""
+    if period == 'week':
+        return value - timedelta(days=value.weekday())
+    return value.replace(day=1)
+
+
+def compute_work_facts(work):
+    """İşin tamamlanmış aşamaları: {stage: (süre, bitiş tarihi, tasarımcı, kategori, kanal)}"""
+    facts = {}
+    for stage, (start_field, end_field, _) in STAGES.items():
+        start, end = getattr(work, start_field), getattr(work, end_field)
+        # Bitişi başlangıçtan önce olan hatalı kayıtlar analitiğe alınmaz
+        if start and end and end >= start:
+            facts[stage] = (
+                (end - start).days, end, work.designer_id, work.category_id, work.sales_channel_id
+            )
+    return facts
+
+
+def _rollup_keys(stage, fact):
+    """Bir aşama kaydının katkı verdiği histogram satırları"""
+    duration_days, end_date, designer_id, category_id, sales_channel_id = fact
+    dimension_values = {
+        'all': 0,
+        'designer': designer_id or 0,
+        'category': category_id or 0,
+        'sales_channel': sales_channel_id or 0,
+    }
+    for dimension, dimension_id in dimension_values.items():
+        for period in PERIODS:
+            yield (stage, dimension, dimension_id, period, period_start(end_date, period), duration_days)
+
+
+def _apply_rollup_deltas(deltas):
+    """Histogram satırlarını artırır/azaltır (eksik satırlar önce sıfırla oluşturulur)"""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    
+    fields = ['stage', 'dimension', 'dimension_id', 'period', 'period_start', 'duration_days']
+    StageDurationRollup.objects.bulk_create(
+        [StageDurationRollup(**dict(zip(fields, key)), count=0) for key in deltas],
+        ignore_conflicts=True
+    )
+    
+    # Aynı miktarda değişen satırlar gruplar halinde tek UPDATE ile güncellenir
+    keys_by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        keys_by_delta[delta].append(Q(**dict(zip(fields, key))))
+    for delta, conditions in keys_by_delta.items():
+        for start in range(0, len(conditions), ROLLUP_UPDATE_CHUNK):
+            chunk = conditions[start:start + ROLLUP_UPDATE_CHUNK]
+            StageDurationRollup.objects.filter(reduce(operator.or_, chunk)).update(count=F('count') + delta)
+    
+    # Sadece azalan satırlar sıfıra inebilir
+    if any(delta < 0 for delta in deltas.values()):
+        StageDurationRollup.objects.filter(count__lte=0).delete()
+
+
+def refresh_work_facts(work, deleted=False):
+    """
+    İşin aşama kayıtlarını günceller ve sadece farkı histogram tablosuna yansıtır
+    İşin kaydedildiği transaction içinde çalışır; ayrı savepoint açılmaz, hata tüm kaydı geri alır
+    """
+    with transaction.atomic(savepoint=False):
+        old_facts = {
+            fact.stage: (fact.duration_days, fact.end_date, fact.designer_id, fact.category_id, fact.sales_channel_id)
+            for fact in WorkStageFact.objects.filter(work_id=work.pk)
+        }
+        new_facts = {} if deleted else compute_work_facts(work)
+        if old_facts == new_facts:
+            return
+        
+        deltas = defaultdict(int)
+        for stage in old_facts.keys() | new_facts.keys():
+            old, new = old_facts.get(stage), new_facts.get(stage)
+            if old == new:
+                continue
+            if old:
+                for key in _rollup_keys(stage, old):
+                    deltas[key] -= 1
+            if new:
+                for key in _rollup_keys(stage, new):
+                    deltas[key] += 1
+        
+        _apply_rollup_deltas(deltas)
+        
+        changed = [stage for stage in old_facts.keys() | new_facts.keys() if old_facts.get(stage) != new_facts.get(stage)]
+        WorkStageFact.objects.filter(work_id=work.pk, stage__in=changed).delete()
+        if not deleted:
+            WorkStageFact.objects.bulk_create([
+                WorkStageFact(
+                    work_id=work.pk, stage=stage, duration_days=fact[0], end_date=fact[1],
+                    designer_id=fact[2], category_id=fact[3], sales_channel_id=fact[4]
+                )
+                for stage, fact in new_facts.items() if stage in changed
+            ])
+
+
+def record_new_works_facts(works):
+    """
+    Toplu eklenen (henüz aşama kaydı olmayan) işlerin sürelerini tek seferde ekler
+    bulk_create sinyal tetiklemediği için toplu aktarım bunu çağırır
+    """
+    deltas = defaultdict(int)
+    facts = []
+    for work in works:
+        for stage, fact in compute_work_facts(work).items():
+            for key in _rollup_keys(stage, fact):
+                deltas[key] += 1
+            facts.append(WorkStageFact(
+                work_id=work.pk, stage=stage, duration_days=fact[0], end_date=fact[1],
+                designer_id=fact[2], category_id=fact[3], sales_channel_id=fact[4]
+            ))
+    
+    with transaction.atomic():
+        WorkStageFact.objects.bulk_create(facts, batch_size=1000)
+        _apply_rollup_deltas(deltas)
+
+
+def rebuild_stage_analytics(work_ids=None):
+    """
+    Aktif ve arşivlenmiş işlerin aşama kayıtlarını ve histogramı veritabanında yeniden hesaplar
+    Süreler tarih farkı, dönemler TruncWeek/TruncMonth ile SQL'de bulunur
+    """
+    if work_ids is not None:
+        # Kısmi yeniden hesaplamada histogram artımlı güncellenir
+        for model in [Work, ArchivedWork]:
+            for work in model.objects.filter(id__in=work_ids):
+                refresh_work_facts(work)
+        return WorkStageFact.objects.filter(work_id__in=work_ids).count(), None
+    
+    with transaction.atomic():
+        WorkStageFact.objects.all().delete()
+        StageDurationRollup.objects.all().delete()
+        
+        facts = []
+        for model in [Work, ArchivedWork]:
+            for stage, (start_field, end_field, _) in STAGES.items():
+                rows = model.objects.filter(**{
+                    f'{start_field}__isnull': False,
+                    f'{end_field}__isnull': False,
+                    f'{end_field}__gte': F(start_field),
+                }).annotate(
+                    duration=ExpressionWrapper(F(end_field) - F(start_field), output_field=DurationField())
+                ).values_list('id', 'duration', end_field, 'designer_id', 'category_id', 'sales_channel_id')
+                
+                facts.extend(
+                    WorkStageFact(
+                        work_id=work_id, stage=stage, duration_days=duration.days, end_date=end_date,
+                        designer_id=designer_id, category_id=category_id, sales_channel_id=sales_channel_id
+                    )
+                    for work_id, duration, end_date, designer_id, category_id, sales_channel_id in rows
+                )
+        WorkStageFact.objects.bulk_create(facts, batch_size=1000)
+        
+        rollups = []
+        for dimension, dimension_field in DIMENSIONS.items():
+            for period, trunc in PERIODS.items():
+                group_fields = ['stage', 'duration_days']
+                rows = WorkStageFact.objects.annotate(bucket=trunc('end_date'))
+                if dimension_field:
+                    rows = rows.values(*group_fields, 'bucket', dimension_field)
+                else:
+                    rows = rows.values(*group_fields, 'bucket')
+                
+                for row in rows.annotate(total=Count('id')).order_by():
+                    rollups.append(StageDurationRollup(
+                        stage=row['stage'],
+                        dimension=dimension,
+                        dimension_id=(row[dimension_field] or 0) if dimension_field else 0,
+                        period=period,
+                        period_start=row['bucket'],
+                        duration_days=row['duration_days'],
+                        count=row['total'],
+                    ))
+        StageDurationRollup.objects.bulk_create(rollups, batch_size=1000)
+    
+    return len(facts), len(rollups)
+
+
+def _percentile(histogram, total, pct):
+    """[(gün, adet)] sıralı histogramdan yüzdelik (nearest-rank)"""
+    rank = max(1, -(-total * pct // 100))
+    seen = 0
+    for duration_days, count in histogram:
+        seen += count
+        if seen >= rank:
+            return duration_days
+    return None
+
+
+def _dimension_names(dimension, ids):
+    ids = [dimension_id for dimension_id in ids if dimension_id]
+    if dimension == 'designer':
+        return {user.id: user.get_full_name() or user.username for user in User.objects.filter(id__in=ids)}
+    if dimension == 'category':
+        return dict(Category.objects.filter(id__in=ids).values_list('id', 'name'))
+    if dimension == 'sales_channel':
+        return dict(SalesChannel.objects.filter(id__in=ids).values_list('id', 'name'))
+    return {}
+
+
+def stage_summary(stage, dimension='all', period='month', start=None, end=None):
+    """
+    Dönem ve boyut bazında adet (throughput), ortalama, min/max ve p50/p90 süreler
+    Adet/ortalama/min/max SQL'de toplanır, yüzdelikler gün histogramından hesaplanır
+    """
+    rollups = StageDurationRollup.objects.filter(stage=stage, dimension=dimension, period=period)
+    if start:
+        rollups = rollups.filter(period_start__gte=period_start(start, period))
+    if end:
+        rollups = rollups.filter(period_start__lte=end)
+    
+    groups = rollups.values('dimension_id', 'period_start').annotate(
+        total=Sum('count'),
+        total_days=Sum(F('count') * F('duration_days')),
+        min_days=Min('duration_days'),
+        max_days=Max('duration_days'),
+    ).order_by('period_start', 'dimension_id')
+    
+    histograms = defaultdict(list)
+    for row in rollups.order_by('duration_days').values_list('dimension_id', 'period_start', 'duration_days', 'count'):
+        histograms[(row[0], row[1])].append((row[2], row[3]))
+    
+    groups = list(groups)
+    names = _dimension_names(dimension, {group['dimension_id'] for group in groups})
+    
+    results = []
+    for group in groups:
+        histogram = histograms[(group['dimension_id'], group['period_start'])]
+        total = group['total']
+        results.append({
+            'dimension_id': group['dimension_id'] or None,
+            'dimension_name': names.get(group['dimension_id'], 'Atanmamış') if dimension != 'all' else 'Tümü',
+            'period_start': group['period_start'].isoformat(),
+            'count': total,
+            'avg_days': round(group['total_days'] / total, 2) if total else None,
+            'min_days': group['min_days'],
+            'max_days': group['max_days'],
+            'p50_days': _percentile(histogram, total, 50),
+            'p90_days': _percentile(histogram, total, 90),
+        })
+    
+    return results
@@ -0,0 +1,125 @@
+# workflows/archive.py
+"""
+Tamamlanmış işlerin arşiv tablosuna taşınması ve geri alınması
+İşler aynı id ile taşınır; hareketler, snapshot'lar ve analitik kayıtları id ile bağlı kaldığı için
+arşivleme geçmişi kaybettirmez. Aktif tablo sadece devam eden işlerle büyür.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Work, ArchivedWork, Link, Movement
+
+# Work ve ArchivedWork'te ortak olan alanlar (ForeignKey'ler *_id olarak kopyalanır)
+COPY_FIELDS = [field.attname for field in Work._meta.concrete_fields if field.name != 'legacy_links']
+
+_state = threading.local()
+
+
+@contextmanager
+def archiving():
+    """Arşive taşıma sırasında işin silinmesi gerçek silme sayılmaz (sinyaller buna bakar)"""
+    previous = getattr(_state, 'active', False)
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = previous
+
+
+def is_archiving():
+    return getattr(_state, 'active', False)
+
+
+def _user_fullname(user):
+    if not user:
+        return None
+    return f"{user.first_name} {user.last_name}".strip() or user.username
+
+
+def archivable_works(days=None):
+    """Son güncellemesi days günden eski tamamlanmış (stok girişi yapılmış) işler"""
+    if days is None:
+        days = settings.WORK_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+    return Work.objects.filter(stock_entry=True, updated__lt=cutoff)
+
+
+def archive_works(days=None, batch_size=500, user=None, progress=None):
+    """
+    Uygun işleri batch'ler halinde arşive taşır, taşınan iş sayısını döndürür
+    progress(işlenen, toplam) her batch sonunda çağrılır
+    """
+    work_ids = list(archivable_works(days).order_by('id').values_list('id', flat=True))
+    archived = 0
+    
+    for start in range(0, len(work_ids), batch_size):
+        batch_ids = work_ids[start:start + batch_size]
+        
+        with transaction.atomic(), archiving():
+            # Seçimden sonra güncellenmiş işler atlanır
+            works = list(archivable_works(days).filter(id__in=batch_ids).prefetch_related('links'))
+            if not works:
+                continue
+            
+            now = timezone.now()
+            ArchivedWork.objects.bulk_create([
+                ArchivedWork(
+                    **{attname: getattr(work, attname) for attname in COPY_FIELDS},
+                    link_data=[link.to_dict() for link in work.links.all()],
+                    archived_at=now
+                )
+                for work in works
+            ])
+            
+            ids = [work.id for work in works]
+            Work.objects.filter(id__in=ids).delete()
+            
+            Movement.objects.create(
+                user=user,
+                user_fullname=_user_fullname(user),
+                action='archive',
+                description=f"{len(ids)} tamamlanmış iş arşive taşındı",
+                changes={'old': {}, 'new': {'archived_work_ids': ids}}
+            )
+            archived += len(ids)
+        
+        if progress:
+            progress(start + len(batch_ids), len(work_ids))
+    
+    return archived
+
+
+def restore_work(archived_work, user=None):
+    """Arşivdeki işi aynı id ile aktif tabloya geri alır"""
+    with transaction.atomic():
+        work = Work(**{attname: getattr(archived_work, attname) for attname in COPY_FIELDS})
+        # Arşivlemeden önce alınmış ETag'ler geri alınan kayıtla eşleşmesin
+        work.version += 1
+        work.save(force_insert=True)
+        
+        # auto_now/auto_now_add alanları kayıtta ezildiği için orijinal zamanlar geri yazılır
+        Work.objects.filter(pk=work.pk).update(created=archived_work.created, updated=archived_work.updated)
+        work.created, work.updated = archived_work.created, archived_work.updated
+        
+        links = archived_work.links.all()
+        for link in links:
+            link.work = work
+            link.added_at = link.added_at or archived_work.created
+        Link.objects.bulk_create(links)
+        
+        archived_work.delete()
+        
+        Movement.objects.create(
+            user=user,
+            user_fullname=_user_fullname(user),
+            work=work,
+            work_name=work.name,
+            action='restore',
+            description=f"{work.name} isimli iş arşivden geri alındı"
+        )
+    
+    return work
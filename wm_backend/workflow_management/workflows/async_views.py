@@ -0,0 +1,69 @@
+# workflows/async_views.py
+from rest_framework import exceptions
+from core.async_api import async_api_view, render_response
+from permissions.utils import PermissionChecker
+from workflows.models import Movement, Category, WorkType, SalesChannel
+from workflows.serializer import (
+    WorkflowSerializer, WorkflowListSerializer, MovementSerializer,
+    CategorySerializer, WorkTypeSerializer, SalesChannelSerializer
+)
+from workflows.views import WorkflowViewSet
+
+
+async def _filter_by_permissions(user, data):
+    """Yetki bazlı filtreleme - yetkiler async olarak bir kez yüklenir"""
+    if not user.is_superuser:
+        await PermissionChecker.aget_effective_permissions(user)
+    
+    if isinstance(data, list):
+        return [PermissionChecker.filter_readable_fields(user, item) for item in data]
+    return PermissionChecker.filter_readable_fields(user, data)
+
+
+@async_api_view()
+async def workflow_list(request):
+    """İş listesi (async) - yetki filtreli, sync liste gibi varsayılan kompakt (?view=full tam gösterim)"""
+    if request.GET.get('view') == 'full':
+        queryset, serializer_class = WorkflowViewSet.queryset.all(), WorkflowSerializer
+    else:
+        queryset = WorkflowListSerializer.annotate_queryset(WorkflowViewSet.queryset.prefetch_related(None))
+        serializer_class = WorkflowListSerializer
+    works = [work async for work in queryset]
+    serializer = serializer_class(works, many=True, context={'request': request})
+    return render_response(await _filter_by_permissions(request.user, serializer.data))
+
+
+@async_api_view()
+async def workflow_detail(request, pk):
+    """İş detayı (async) - yetki filtreli"""
+    work = await WorkflowViewSet.queryset.filter(pk=pk).afirst()
+    if work is None:
+        raise exceptions.NotFound()
+    
+    serializer = WorkflowSerializer(work, context={'request': request})
+    data = await _filter_by_permissions(request.user, serializer.data)
+    return render_response(data, headers={'ETag': work.etag})
+
+
+@async_api_view(admin_only=True)
+async def movement_list(request):
+    """Hareket kayıtları (async)"""
+    movements = [movement async for movement in Movement.objects.select_related('user', 'work')]
+    return render_response(MovementSerializer(movements, many=True).data)
+
+
+def _dropdown_view(model, serializer_class):
+    """Dropdown listesi için async view üretir"""
+    @async_api_view()
+    async def view(request):
+        items = [item async for item in model.objects.filter(is_active=True)]
+        return render_response(serializer_class(items, many=True).data)
+    
+    view.__name__ = f'{model.__name__.lower()}_list'
+    view.__doc__ = f'{model._meta.verbose_name_plural} listesi (async)'
+    return view
+
+
+category_list = _dropdown_view(Category, CategorySerializer)
+work_type_list = _dropdown_view(WorkType, WorkTypeSerializer)
+sales_channel_list = _dropdown_view(SalesChannel, SalesChannelSerializer)
@@ -0,0 +1,70 @@
+# workflows/audit_compaction.py
+"""
+Eski denetim kayıtlarının sıkıştırılması
+Saklama süresinden eski güncelleme hareketleri ve alan değişikliği kayıtları silinir; oluşturma, silme,
+arşivleme ve geri alma hareketleri kalır. Silmeden önce her iş için sınır anındaki hali snapshot olarak
+yazılır, böylece sınırdan sonraki anların geçmiş sorguları (as_of) değişmez. Sınırdan önceki anlar
+eski snapshot'lar kadar ayrıntılıdır.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Work, ArchivedWork, Movement, FieldChange, WorkSnapshot
+from .snapshots import applied_at, reconstruct
+
+
+def audit_cutoff(days=None):
+    if days is None:
+        days = settings.AUDIT_RETENTION_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def compactable_movements(cutoff):
+    """Sınırdan önce uygulanmış güncelleme hareketleri (sınırdan sonra birleştirme almış hareket kalır)"""
+    return Movement.objects.alias(applied_at=applied_at()).filter(action='update', applied_at__lt=cutoff)
+
+
+def compact_audit(days=None, batch_size=500, progress=None):
+    """
+    Saklama süresinden eski güncelleme hareketlerini iş batch'leri halinde siler
+    (silinen hareket sayısı, silinen alan değişikliği sayısı) döndürür
+    progress(işlenen, toplam) her batch sonunda çağrılır
+    """
+    cutoff = audit_cutoff(days)
+    old_updates = compactable_movements(cutoff)
+    work_ids = list(
+        old_updates.exclude(work_id=None).order_by('work_id').values_list('work_id', flat=True).distinct()
+    )
+    
+    movements = field_changes = 0
+    for start in range(0, len(work_ids), batch_size):
+        batch_ids = work_ids[start:start + batch_size]
+        
+        with transaction.atomic():
+            works = [work for model in [Work, ArchivedWork] for work in model.objects.filter(id__in=batch_ids)]
+            snapshots = []
+            for work in works:
+                result = reconstruct(work, cutoff)
+                if result is not None:
+                    snapshots.append(WorkSnapshot(work_id=work.pk, taken_at=cutoff, data=result[0]))
+            WorkSnapshot.objects.bulk_create(snapshots)
+            
+            deleted_movements, deleted_changes = _delete_movements(old_updates.filter(work_id__in=batch_ids))
+            movements += deleted_movements
+            field_changes += deleted_changes
+        
+        if progress:
+            progress(start + len(batch_ids), len(work_ids))
+    
+    # Gerçekten silinmiş işlerin hareketleri (work boşaltılmış) için snapshot gerekmez
+    with transaction.atomic():
+        deleted_movements, deleted_changes = _delete_movements(old_updates.filter(work_id=None))
+    return movements + deleted_movements, field_changes + deleted_changes
+
+
+def _delete_movements(movements):
+    """Hareketleri alan değişiklikleriyle (cascade) siler, (hareket, alan değişikliği) sayısını döndürür"""
+    _, counts = movements.delete()
+    return counts.get(Movement._meta.label, 0), counts.get(FieldChange._meta.label, 0)
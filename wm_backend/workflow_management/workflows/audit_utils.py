@@ -1,5 +1,9 @@
-from django.db import models
-from .models import Movement, Work
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from .models import FieldChange, Movement, Work, WorkSnapshot
 
 
 def serialize_value(value):
@@ -44,6 +48,9 @@ def log_work_action(user, work, action, old_data=None, new_data=None):
         description = changes['description']
         changes = changes['data'] if changes['data'] and changes['data']['old'] else None
         
+        if changes and _merge_into_recent_update(user, work, changes):
+            return
+    
     elif action == 'delete':
         description = f"{work_name} isimli iş silindi"
         changes = None
@@ -51,7 +58,7 @@ def log_work_action(user, work, action, old_data=None, new_data=None):
     else:
         return
     
-    Movement.objects.create(
+    movement = Movement.objects.create(
         user=user,
         user_fullname=user_fullname,
         work=work if action != 'delete' else None,
@@ -60,6 +67,112 @@ def log_work_action(user, work, action, old_data=None, new_data=None):
         description=description,
         changes=changes
     )
+    
+    if changes:
+        FieldChange.objects.bulk_create(build_field_changes(movement))
+    
+    # Periyodik checkpoint (snapshots modülü serialize_value'yu buradan kullandığı için geç import)
+    if action != 'delete':
+        from .snapshots import record_checkpoint
+        record_checkpoint(work, movement)
+
+
+def _merge_into_recent_update(user, work, changes):
+    """
+    Aynı kullanıcının aynı işteki son hareketi MOVEMENT_COALESCE_WINDOW saniye içinde yapılmış bir
+    güncellemeyse değişiklikleri ona ekler: her alan için ilk eski değer ve son yeni değer tutulur.
+    Birleştirme yapıldıysa True döner.
+    """
+    window = settings.MOVEMENT_COALESCE_WINDOW
+    if not window:
+        return False
+    
+    # Kaydın transaction'ı içindeyse ayrı savepoint açılmaz (çoğu çağrıda birleştirme yapılmaz)
+    with transaction.atomic(savepoint=False):
+        # İşin son hareketi (araya başka kullanıcı/işlem girdiyse birleştirilmez)
+        last = Movement.objects.select_for_update().filter(work=work).order_by('-id').first()
+        if (
+            last is None
+            or last.action != 'update'
+            or last.user_id != user.id
+            or not last.changes
+            or (last.updated or last.created) < timezone.now() - timedelta(seconds=window)
+            # Snapshot'ın referans aldığı hareket değişirse replay yanlış olur
+            or WorkSnapshot.objects.filter(movement=last).exists()
+        ):
+            return False
+        
+        merged = {'old': dict(last.changes.get('old', {})), 'new': dict(last.changes.get('new', {}))}
+        for field_name, new_value in changes['new'].items():
+            merged['old'].setdefault(field_name, changes['old'][field_name])
+            merged['new'][field_name] = new_value
+            # İlk değerine geri dönen alan değişiklik sayılmaz
+            if merged['old'][field_name] == merged['new'][field_name]:
+                del merged['old'][field_name]
+                del merged['new'][field_name]
+        
+        last.changes = merged if merged['old'] else None
+        last.description = _describe_serialized_changes(work, merged)
+        last.work_name = work.name
+        last.updated = timezone.now()
+        last.save(update_fields=['changes', 'description', 'work_name', 'updated'])
+        
+        # Alan kayıtları birleşmiş değişikliklerle yeniden yazılır (geri dönen alanlar düşer)
+        last.field_changes.all().delete()
+        FieldChange.objects.bulk_create(build_field_changes(last))
+    return True
+
+
+def build_field_changes(movement):
+    """Güncelleme hareketinin her alanı için kaydedilmemiş FieldChange nesneleri"""
+    if movement.action != 'update' or not movement.changes:
+        return []
+    
+    old_values = movement.changes.get('old', {})
+    new_values = movement.changes.get('new', {})
+    return [
+        FieldChange(
+            movement=movement,
+            work_id=movement.work_id,
+            field=field_name,
+            user_id=movement.user_id,
+            changed_at=movement.updated or movement.created,
+            old_value=old_value,
+            new_value=new_values.get(field_name)
+        )
+        for field_name, old_value in old_values.items()
+    ]
+
+
+def display_serialized(field, value):
+    """serialize_value çıktısını görüntüleme formatına çevirir"""
+    if value is None:
+        return 'Boş'
+    if isinstance(value, dict) and 'display' in value:
+        return value['display']
+    if isinstance(field, models.BooleanField):
+        return 'Evet' if value == 'True' else 'Hayır'
+    return str(value)
+
+
+def _describe_serialized_changes(work, changed_data):
+    """Birleştirilmiş (serialize edilmiş) değişikliklerden _get_changes ile aynı formatta açıklama"""
+    change_details = []
+    for field_name, old_value in changed_data['old'].items():
+        try:
+            field = work._meta.get_field(field_name)
+            field_verbose = field.verbose_name
+        except Exception:
+            field, field_verbose = None, field_name
+        
+        old_display = display_serialized(field, old_value)
+        new_display = display_serialized(field, changed_data['new'][field_name])
+        change_details.append(f"{field_verbose}: {old_display} → {new_display}")
+    
+    description = f"{work.name} isimli iş güncellendi"
+    if change_details:
+        description += f". Değişiklikler: {', '.join(change_details)}"
+    return description
 
 
 def _get_changes(work, old_data, new_data, work_name):
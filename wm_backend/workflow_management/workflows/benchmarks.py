@@ -0,0 +1,75 @@
+# workflows/benchmarks.py
+"""
+Benchmark komutları için örnek veri
+Veri geri alınan bir transaction içinde oluşturulur, gerçek veritabanında iz bırakmaz.
+"""
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from .analytics import record_new_works_facts
+from .models import Work, Link, Category, WorkType, SalesChannel
+from .timeline import record_new_works_intervals
+
+
+def seed_works(rows, seed=42, users=20, dropdown_size=8):
+    """rows adet gerçekçi dağılımda iş (ve bağlantı) oluşturur, oluşturulan iş id'lerini döndürür"""
+    rng = random.Random(seed)
+    suffix = uuid.uuid4().hex[:8]
+    
+    categories = Category.objects.bulk_create([Category(name=f'Kategori {suffix}-{i}') for i in range(dropdown_size)])
+    types = WorkType.objects.bulk_create([WorkType(name=f'Tip {suffix}-{i}') for i in range(dropdown_size)])
+    channels = SalesChannel.objects.bulk_create([SalesChannel(name=f'Kanal {suffix}-{i}') for i in range(dropdown_size)])
+    User.objects.bulk_create([
+        User(username=f'bench_{suffix}_{i}', first_name=f'Tasarımcı{i}', last_name='Test', email=f'bench{i}@example.com')
+        for i in range(users)
+    ])
+    designers = list(User.objects.filter(username__startswith=f'bench_{suffix}_'))
+    
+    base = date.today() - timedelta(days=365)
+    works = []
+    for i in range(rows):
+        start = base + timedelta(days=rng.randrange(360))
+        stage = rng.randrange(4)
+        works.append(Work(
+            name=f'Sipariş {i}',
+            category=rng.choice(categories),
+            type=rng.choice(types),
+            sales_channel=rng.choice(channels),
+            designer=rng.choice(designers),
+            price=round(rng.uniform(50, 5000), 2),
+            design_start_date=start,
+            design_end_date=start + timedelta(days=rng.randrange(1, 7)) if stage >= 1 else None,
+            printing_confirm=stage >= 2,
+            printing_start_date=start + timedelta(days=rng.randrange(7, 14)) if stage >= 2 else None,
+            printing_location=rng.choice(['Atölye', 'Fason', None]),
+            stock_entry=stage >= 3,
+            shipping_date=start + timedelta(days=rng.randrange(14, 40)) if stage >= 3 else None,
+            note=rng.choice([None, 'Acil', 'Müşteri ile görüşülecek. ' * rng.randrange(1, 5)]),
+        ))
+    works = Work.objects.bulk_create(works, batch_size=1000)
+    
+    now = timezone.now()
+    Link.objects.bulk_create([
+        Link(work=work, url=f'https://drive.example.com/{work.id}/{n}', title=f'Tasarım {n + 1}', added_at=now)
+        for work in works
+        for n in range(rng.randrange(3))
+    ], batch_size=1000)
+    
+    # bulk_create sinyal göndermez; aşama kayıtları ve takvim aralıkları toplu aktarımdaki gibi eklenir
+    record_new_works_facts(works)
+    record_new_works_intervals(works)
+    
+    return [work.id for work in works]
+
+
+@contextmanager
+def seeded_works(rows, **kwargs):
+    """Örnek veriyi oluşturur, blok bittiğinde tüm değişiklikleri geri alır"""
+    with transaction.atomic():
+        yield seed_works(rows, **kwargs)
+        transaction.set_rollback(True)
@@ -0,0 +1,161 @@
+# workflows/cache.py
+"""
+İş listesi için paylaşılan yanıt cache'i
+Aynı okunabilir kolon setine sahip kullanıcılar aynı render edilmiş yanıtı paylaşır.
+Anahtar: veri versiyonu + okuma kaynağı + yetki imzası + format + sorgu parametreleri.
+Çoklu process kurulumunda CACHES ortak bir backend (Redis, Memcached vb.) olmalı.
+"""
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from core.coalescing import get_flight
+from core.db_router import reads_from_replica
+from permissions.utils import PermissionChecker
+
+DATA_VERSION_KEY = 'workflows:data_version'
+
+
+def get_data_version():
+    """İş verisinin güncel versiyonu (her yazma işleminde artar)"""
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, 1, timeout=None)
+        version = cache.get(DATA_VERSION_KEY, 1)
+    return version
+
+
+def bump_data_version():
+    """Veri versiyonunu artırarak tüm liste cache'ini geçersiz kılar"""
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        cache.set(DATA_VERSION_KEY, 2, timeout=None)
+
+
+def permission_signature(user):
+    """Kullanıcının okuyabildiği kolon setinin özeti - aynı rollerdeki kullanıcılar için aynıdır"""
+    if user.is_superuser:
+        return 'superuser'
+    
+    permissions = PermissionChecker.get_user_column_permissions(user)
+    readable = sorted(column for column, permission in permissions.items() if permission in ['read', 'write'])
+    return hashlib.sha1(','.join(readable).encode()).hexdigest()[:16]
+
+
+def read_source():
+    """
+    Yanıtın okunduğu kaynak ('primary' / 'replica')
+    Gecikmeli replikadan üretilen yanıt güncel versiyon anahtarında olabilir; yazma sonrası primary'ye
+    sabitlenmiş istemci (read-your-writes) onu ne cache'ten ne de ortak istekten (flight) almamalı
+    """
+    return 'replica' if reads_from_replica() else 'primary'
+
+
+def build_cache_key(prefix, request):
+    """Veri versiyonu, okuma kaynağı, yetki imzası, yanıt formatı ve sorgu parametrelerinden cache anahtarı üretir"""
+    query = '&'.join(
+        f'{key}={value}'
+        for key in sorted(request.query_params)
+        for value in sorted(request.query_params.getlist(key))
+    )
+    query_hash = hashlib.sha1(query.encode()).hexdigest()[:16]
+    renderer_format = getattr(getattr(request, 'accepted_renderer', None), 'format', '')
+    return (
+        f'{prefix}:v{get_data_version()}:{read_source()}:{permission_signature(request.user)}:'
+        f'{renderer_format}:{query_hash}'
+    )
+
+
+def _cache_timeout():
+    """Replikadan okunan veri gecikmeli olabilir, cache ömrü kısaltılır"""
+    if reads_from_replica():
+        return min(settings.WORKFLOW_LIST_CACHE_TIMEOUT, settings.REPLICA_CACHE_TIMEOUT)
+    return settings.WORKFLOW_LIST_CACHE_TIMEOUT
+
+
+def _accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+def render_content(view, request, response):
+    """DRF yanıtını seçilen renderer ile byte'a çevirir, (içerik, content type) döndürür"""
+    renderer = request.accepted_renderer
+    renderer_context = {**view.get_renderer_context(), 'response': response}
+    content = renderer.render(response.data, request.accepted_media_type, renderer_context)
+    
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f'{content_type}; charset={renderer.charset}'
+    return content, content_type
+
+
+def cached_response(request, cache_key, build_content, flight=None):
+    """
+    Cache'teki render edilmiş yanıtı döndürür, yoksa build_content() ile üretip saklar
+    build_content (content, content_type) döndürmeli. flight verilirse cache'te olmayan
+    aynı anahtar için eşzamanlı istekler tek build_content çağrısını paylaşır (X-Cache: COALESCED)
+    """
+    if getattr(request, 'profiling', False):
+        content, content_type = build_content()
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Cache'] = 'BYPASS'
+        return response
+    
+    entry = cache.get(cache_key)
+    cache_status = 'HIT'
+    
+    if entry is None:
+        def build_entry():
+            content, content_type = build_content()
+            entry = {'content': content, 'content_type': content_type, 'gzip': None, 'timeout': _cache_timeout()}
+            cache.set(cache_key, entry, entry['timeout'])
+            return entry
+        
+        if flight:
+            entry, shared = get_flight(flight).do(cache_key, build_entry)
+        else:
+            entry, shared = build_entry(), False
+        cache_status = 'COALESCED' if shared else 'MISS'
+    
+    content = entry['content']
+    use_gzip = _accepts_gzip(request) and len(content) >= settings.WORKFLOW_LIST_GZIP_MIN_SIZE
+    
+    if use_gzip:
+        if entry['gzip'] is None:
+            entry['gzip'] = gzip.compress(content)
+            cache.set(cache_key, entry, entry.get('timeout', settings.WORKFLOW_LIST_CACHE_TIMEOUT))
+        content = entry['gzip']
+    
+    response = HttpResponse(content, content_type=entry['content_type'])
+    if use_gzip:
+        response['Content-Encoding'] = 'gzip'
+    response['X-Cache'] = cache_status
+    patch_vary_headers(response, ['Accept-Encoding', 'Authorization'])
+    return response
+
+
+def cached_data(request, cache_key, build_data, flight=None):
+    """
+    cached_response'un render edilmemiş veri için karşılığı (başka bir yanıtın parçası olacak veriler)
+    Cache'te yoksa build_data() ile üretilip saklanır; profil isteklerinde cache atlanır
+    """
+    if getattr(request, 'profiling', False):
+        return build_data()
+    
+    data = cache.get(cache_key)
+    if data is not None:
+        return data
+    
+    def build_entry():
+        data = build_data()
+        cache.set(cache_key, data, _cache_timeout())
+        return data
+    
+    if flight:
+        data, _ = get_flight(flight).do(cache_key, build_entry)
+        return data
+    return build_entry()
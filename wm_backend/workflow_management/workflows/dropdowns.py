@@ -0,0 +1,61 @@
+# workflows/dropdowns.py
+"""
+Dropdown seçeneklerinin process belleğindeki kopyası
+Seçenekler nadiren değiştiği için her istekte veritabanından okunmaz. Dropdown modellerindeki her
+değişiklik ortak cache'teki versiyon token'ını yeniler, process'ler kopyalarını token değişince yükler.
+"""
+import threading
+import uuid
+
+from django.core.cache import cache
+from .models import Category, WorkType, SalesChannel
+from .serializer import CategorySerializer, WorkTypeSerializer, SalesChannelSerializer
+
+DROPDOWN_VERSION_KEY = 'workflows:dropdown_version'
+
+DROPDOWNS = {
+    'categories': (Category, CategorySerializer),
+    'work_types': (WorkType, WorkTypeSerializer),
+    'sales_channels': (SalesChannel, SalesChannelSerializer),
+}
+
+_lock = threading.Lock()
+# (versiyon token'ı, veri) - tek atama ile değiştirilir, okuma kilitsizdir
+_memory = (None, None)
+
+
+def get_dropdown_version():
+    """
+    Dropdown verisinin güncel versiyon token'ı
+    Sayaç yerine rastgele token kullanılır: cache temizlenince eski kopya aynı versiyonla eşleşmesin
+    """
+    version = cache.get(DROPDOWN_VERSION_KEY)
+    if version is None:
+        cache.add(DROPDOWN_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(DROPDOWN_VERSION_KEY)
+    return version
+
+
+def bump_dropdown_version():
+    """Tüm process'lerin dropdown kopyasını geçersiz kılar"""
+    cache.set(DROPDOWN_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def get_dropdowns():
+    """Aktif dropdown seçenekleri, dropdown endpoint'leriyle aynı formatta ({ad: [{id, name}, ...]})"""
+    global _memory
+    version = get_dropdown_version()
+    
+    cached_version, data = _memory
+    if cached_version == version:
+        return data
+    
+    with _lock:
+        cached_version, data = _memory
+        if cached_version != version:
+            data = {
+                name: [dict(item) for item in serializer_class(model.objects.filter(is_active=True), many=True).data]
+                for name, (model, serializer_class) in DROPDOWNS.items()
+            }
+            _memory = (version, data)
+    return data
@@ -0,0 +1,192 @@
+# workflows/fast_serializer.py
+"""
+WorkflowSerializer'ın liste için salt okunur hızlı yolu
+Model nesnesi ve DRF alan makinesi yerine values() projeksiyonu kullanılır; dropdown ve kullanıcı
+detayları tek sorguda yüklenen sözlüklerden, bağlantılar her chunk için tek sorgudan okunur.
+Çıktı (alan sırası dahil) WorkflowSerializer ile, compact=True iken WorkflowListSerializer ile aynıdır,
+bkz. tests.FastWorkflowSerializerParityTest.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework import serializers
+from .models import Work, Link, Category, WorkType, SalesChannel
+from .serializer import WorkflowSerializer, WorkflowListSerializer, truncate_note
+
+# Detay alanı: (model alanı, model)
+DROPDOWN_DETAILS = {
+    'category_detail': ('category', Category),
+    'type_detail': ('type', WorkType),
+    'sales_channel_detail': ('sales_channel', SalesChannel),
+}
+USER_DETAILS = {
+    'designer_detail': 'designer',
+    'printing_controller_detail': 'printing_controller',
+}
+STATUS_FIELDS = {'status_code': 'code', 'status_text': 'text', 'status_color': 'color'}
+LINK_COLUMNS = ['work_id', 'url', 'title', 'description', 'added_at', 'added_by']
+
+# Kompakt gösterimde veritabanında hesaplanan özet kolonlar (WorkflowListSerializer.annotate_queryset)
+COMPACT_ANNOTATIONS = ['links_count', 'first_link_url', 'first_link_title', 'note_preview']
+
+# Bağlantı ve kullanıcı sorguları bu kadar işlik gruplar halinde yapılır
+CHUNK_SIZE = 2000
+
+
+def _user_detail(user):
+    """WorkflowSerializer.get_user_detail ile aynı yapı"""
+    full_name = f"{user['first_name']} {user['last_name']}".strip()
+    return {
+        'id': user['id'],
+        'username': user['username'],
+        'full_name': full_name or user['username'],
+        'email': user['email']
+    }
+
+
+def _link_representation(link):
+    """LinkListField.to_representation ile aynı yapı (None değerler atlanır)"""
+    data = {'url': link['url']}
+    for key in ['title', 'description', 'added_at', 'added_by']:
+        value = link[key]
+        if value is not None:
+            data[key] = value.isoformat() if key == 'added_at' else value
+    return data
+
+
+class FastWorkflowSerializer:
+    """
+    FastWorkflowSerializer(fields=None, compact=False).serialize(queryset) -> list[dict]
+    fields: WorkflowSerializer'daki gibi sparse fieldset (None ise tüm alanlar)
+    compact: liste (grid) gösterimi, bkz. WorkflowListSerializer
+    """
+    
+    def __init__(self, fields=None, compact=False):
+        self.compact = compact
+        self.serializer_class = WorkflowListSerializer if compact else WorkflowSerializer
+        serializer = self.serializer_class(fields=fields)
+        self.requested_fields = serializer.requested_fields
+        # DRF'nin çıktı sırası: serializer alanları, ardından isim ve eski bağlantı alanları
+        self.output_fields = list(serializer.fields)
+        self.datetime_fields = {
+            name: field for name, field in serializer.fields.items() if isinstance(field, serializers.DateTimeField)
+        }
+        self.date_fields = {
+            name for name, field in serializer.fields.items() if isinstance(field, serializers.DateField)
+        }
+        
+        requested = self.requested_fields
+        legacy_link_fields = set(self.serializer_class.LEGACY_LINK_FIELDS)
+        self.include_legacy_links = bool(legacy_link_fields) and (requested is None or bool(requested & legacy_link_fields))
+        self.include_links = 'links' in self.output_fields or self.include_legacy_links
+        
+        model_fields = {field.name: field for field in Work._meta.concrete_fields}
+        columns = {'id'}
+        for name in self.output_fields:
+            if name in model_fields:
+                columns.add(model_fields[name].attname)
+            for dependency in self.serializer_class.FIELD_DEPENDENCIES.get(name, []):
+                if dependency in model_fields:
+                    columns.add(model_fields[dependency].attname)
+        if compact:
+            # Tam not yerine note_preview okunur
+            columns.discard('note')
+        self.columns = sorted(columns)
+    
+    def _load_dropdowns(self):
+        maps = {}
+        for detail_field, (_, model) in DROPDOWN_DETAILS.items():
+            if detail_field in self.output_fields:
+                maps[detail_field] = {item['id']: item for item in model.objects.values('id', 'name')}
+        return maps
+    
+    def _load_users(self, rows):
+        user_fields = [field for detail_field, field in USER_DETAILS.items() if detail_field in self.output_fields]
+        user_ids = {row[f'{field}_id'] for row in rows for field in user_fields} - {None}
+        if not user_ids:
+            return {}
+        users = User.objects.filter(id__in=user_ids).values('id', 'username', 'first_name', 'last_name', 'email')
+        return {user['id']: _user_detail(user) for user in users}
+    
+    def _load_links(self, rows):
+        links = {}
+        if not self.include_links:
+            return links
+        # Link.Meta.ordering (added_at, id) prefetch ile aynı sırayı verir
+        for link in Link.objects.filter(work_id__in=[row['id'] for row in rows]).values(*LINK_COLUMNS):
+            links.setdefault(link['work_id'], []).append(link)
+        return links
+    
+    def _represent(self, row, dropdowns, users, links):
+        data = {}
+        status = None
+        work_links = links.get(row['id'], [])
+        
+        for name in self.output_fields:
+            if name in STATUS_FIELDS:
+                if status is None:
+                    status = Work.status_for(row['stock_entry'], row['printing_confirm'])
+                data[name] = status[STATUS_FIELDS[name]]
+            elif name in DROPDOWN_DETAILS:
+                data[name] = dropdowns[name].get(row[f'{DROPDOWN_DETAILS[name][0]}_id'])
+            elif name in USER_DETAILS:
+                data[name] = users.get(row[f'{USER_DETAILS[name]}_id'])
+            elif name == 'links':
+                data[name] = [_link_representation(link) for link in work_links]
+            elif name == 'links_count':
+                data[name] = row['links_count']
+            elif name == 'first_link':
+                data[name] = {'url': row['first_link_url'], 'title': row['first_link_title']} if row['first_link_url'] else None
+            elif name == 'note' and self.compact:
+                data[name] = truncate_note(row['note_preview'], settings.WORKFLOW_LIST_NOTE_LENGTH)[0]
+            elif name == 'note_truncated':
+                data[name] = truncate_note(row['note_preview'], settings.WORKFLOW_LIST_NOTE_LENGTH)[1]
+            elif name in self.datetime_fields:
+                value = row[name]
+                data[name] = self.datetime_fields[name].to_representation(value) if value is not None else None
+            elif name in self.date_fields:
+                value = row[name]
+                data[name] = value.isoformat() if value is not None else None
+            elif name in row:
+                data[name] = row[name]
+            else:
+                # İlişki alanları (category, designer ...) id olarak
+                data[name] = row[f'{name}_id']
+        
+        for name_field, detail_field in WorkflowSerializer.NAME_FIELDS.items():
+            detail = data.get(detail_field)
+            if detail:
+                data[name_field] = detail['name'] if 'name' in detail else detail['full_name']
+        
+        if self.include_legacy_links and work_links:
+            data['link'] = work_links[0]['url']
+            data['link_title'] = work_links[0]['title']
+        
+        if self.requested_fields is not None:
+            data = {key: value for key, value in data.items() if key in self.requested_fields}
+        return data
+    
+    def serialize(self, queryset):
+        """Queryset'in sırasını koruyarak satırları serialize eder"""
+        queryset = queryset.select_related(None).prefetch_related(None)
+        columns = self.columns
+        if self.compact:
+            queryset = WorkflowListSerializer.annotate_queryset(queryset, self.requested_fields)
+            columns = columns + [name for name in COMPACT_ANNOTATIONS if name in queryset.query.annotations]
+        rows = queryset.values(*columns)
+        dropdowns = self._load_dropdowns()
+        
+        result = []
+        chunk = []
+        for row in rows.iterator(chunk_size=CHUNK_SIZE):
+            chunk.append(row)
+            if len(chunk) >= CHUNK_SIZE:
+                result.extend(self._serialize_chunk(chunk, dropdowns))
+                chunk = []
+        if chunk:
+            result.extend(self._serialize_chunk(chunk, dropdowns))
+        return result
+    
+    def _serialize_chunk(self, rows, dropdowns):
+        users = self._load_users(rows)
+        links = self._load_links(rows)
+        return [self._represent(row, dropdowns, users, links) for row in rows]
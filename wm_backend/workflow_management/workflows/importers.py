@@ -0,0 +1,386 @@
+# workflows/importers.py
+"""
+CSV / JSON / NDJSON dosyalarından toplu iş aktarımı
+Dosya parça parça okunur, kayıtlar batch_size'lık gruplar halinde tek transaction'da bulk_create ile eklenir.
+Dropdown ve kullanıcı isimleri tek seferde yüklenen sözlüklerden çözülür; hatalı satırlar raporlanır,
+dosyanın geri kalanı aktarılmaya devam eder.
+"""
+import codecs
+import csv
+import json
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from permissions.utils import PermissionChecker
+from .analytics import record_new_works_facts
+from .cache import bump_data_version
+from .snapshots import record_new_works_snapshots
+from .timeline import record_new_works_intervals
+from .models import Work, Link, Movement, Category, WorkType, SalesChannel
+
+SUPPORTED_FORMATS = ['csv', 'json', 'ndjson']
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Dosyadaki kolon: model alanı
+DROPDOWN_FIELDS = {'category': Category, 'type': WorkType, 'sales_channel': SalesChannel}
+USER_FIELDS = ['designer', 'printing_controller']
+DATE_FIELDS = [
+    'design_start_date', 'design_end_date', 'confirm_date', 'printing_start_date',
+    'printing_end_date', 'packaging_date', 'shipping_date'
+]
+BOOLEAN_FIELDS = ['printing_confirm', 'printing_control', 'stock_entry']
+TEXT_FIELDS = {'name': 200, 'printing_location': 100, 'mixed': 200, 'note': None}
+
+TRUE_VALUES = {'1', 'true', 'evet', 'e', 'yes', 'y', 'x'}
+FALSE_VALUES = {'0', 'false', 'hayır', 'hayir', 'h', 'no', 'n', ''}
+
+
+def detect_format(filename, default='csv'):
+    """Dosya uzantısından format tahmini"""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension in ['jsonl', 'ndjson']:
+        return 'ndjson'
+    return extension if extension in SUPPORTED_FORMATS else default
+
+
+def _iter_text_chunks(stream):
+    """Binary ya da text stream'i UTF-8 metin parçaları olarak okur"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def _iter_json_array(stream):
+    """[ {...}, {...} ] dizisini tamamını belleğe almadan eleman eleman okur"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    chunks = _iter_text_chunks(stream)
+    exhausted = False
+    
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if buffer:
+                if buffer[0] != '[':
+                    raise ValueError('JSON dosyası bir dizi ([...]) olmalı')
+                buffer = buffer[1:]
+                started = True
+                continue
+        elif buffer.startswith(']'):
+            return
+        elif buffer.startswith(','):
+            buffer = buffer[1:]
+            continue
+        elif buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise ValueError('JSON dosyası okunamadı')
+            else:
+                # Sayı gibi değerler parçanın sonunda bölünmüş olabilir, devamı okunana kadar bekle
+                if end < len(buffer) or exhausted:
+                    yield item
+                    buffer = buffer[end:]
+                    continue
+        
+        if exhausted:
+            if started:
+                raise ValueError('JSON dizisi kapanmadan dosya bitti')
+            return
+        try:
+            buffer += next(chunks)
+        except StopIteration:
+            exhausted = True
+
+
+def _iter_lines(stream):
+    """Satır sonları korunarak satır satır okuma (CSV'de tırnaklı çok satırlı alanlar için gerekli)"""
+    pending = ''
+    for chunk in _iter_text_chunks(stream):
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line + '\n'
+    if pending:
+        yield pending
+
+
+def iter_records(stream, file_format):
+    """(satır no, kayıt ya da okuma hatası) ikilileri üretir"""
+    if file_format == 'csv':
+        reader = csv.DictReader(_iter_lines(stream))
+        for row in reader:
+            # Başlık satırı 1. satır sayılır
+            yield reader.line_num, {key.strip(): value for key, value in row.items() if key}
+    elif file_format == 'ndjson':
+        for line_number, line in enumerate(_iter_lines(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f'Geçersiz JSON: {e.msg}')
+    elif file_format == 'json':
+        for index, item in enumerate(_iter_json_array(stream), start=1):
+            yield index, item
+    else:
+        raise ValueError(f'Desteklenmeyen format: {file_format}')
+
+
+class WorkImporter:
+    """Kayıtları doğrulayıp toplu olarak ekler; sonuç özetini ve satır hatalarını tutar"""
+    
+    def __init__(self, user, batch_size=500, source_name=None, max_reported_errors=1000):
+        self.user = user
+        self.batch_size = batch_size
+        self.source_name = source_name or 'dosya'
+        self.max_reported_errors = max_reported_errors
+        
+        self.created = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors = []
+        
+        self.url_validator = URLValidator()
+        self.user_info = f"{user.get_full_name() or user.username} ({user.id})"
+        
+        # İsim (küçük harf) ya da id ile eşleşme için tek seferde yüklenen sözlükler
+        self.dropdown_maps = {}
+        for field, model in DROPDOWN_FIELDS.items():
+            values = {}
+            for item_id, name in model.objects.filter(is_active=True).values_list('id', 'name'):
+                values[name.strip().lower()] = item_id
+                values[str(item_id)] = item_id
+            self.dropdown_maps[field] = values
+        
+        self.user_map = {}
+        for user_id, username in User.objects.filter(is_active=True).values_list('id', 'username'):
+            self.user_map[username.lower()] = user_id
+            self.user_map[str(user_id)] = user_id
+    
+    def _add_error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'row': row_number, 'errors': errors})
+    
+    def _parse_links(self, record, errors):
+        """links (liste, JSON metni ya da | ile ayrılmış URL'ler) veya link/link_title kolonları"""
+        raw_links = record.get('links')
+        if isinstance(raw_links, str):
+            raw_links = raw_links.strip()
+            if raw_links.startswith('['):
+                try:
+                    raw_links = json.loads(raw_links)
+                except json.JSONDecodeError:
+                    errors['links'] = 'Geçersiz JSON'
+                    return []
+            else:
+                raw_links = [{'url': url.strip()} for url in raw_links.split('|') if url.strip()]
+        
+        if raw_links in [None, '']:
+            raw_links = []
+        if record.get('link'):
+            raw_links = [{'url': record['link'], 'title': record.get('link_title')}] + list(raw_links)
+        
+        if not isinstance(raw_links, list):
+            errors['links'] = 'Bağlantılar liste formatında olmalıdır'
+            return []
+        
+        links = []
+        for index, item in enumerate(raw_links, start=1):
+            if isinstance(item, str):
+                item = {'url': item}
+            url = str(item.get('url') or '').strip() if isinstance(item, dict) else ''
+            try:
+                self.url_validator(url)
+            except ValidationError:
+                errors['links'] = f'Bağlantı {index}: Geçerli bir URL giriniz'
+                return []
+            links.append({
+                'url': url,
+                'title': (item.get('title') or '').strip() or None,
+                'description': (item.get('description') or '').strip() or None,
+            })
+        return links
+    
+    def build_work(self, record):
+        """Kaydı Work nesnesine çevirir: (work, links, hatalar)"""
+        if not isinstance(record, dict):
+            return None, [], {'row': 'Kayıt bir nesne olmalı'}
+        
+        errors = {}
+        values = {}
+        
+        for field, max_length in TEXT_FIELDS.items():
+            value = record.get(field)
+            value = str(value).strip() if value not in [None, ''] else None
+            if value and max_length and len(value) > max_length:
+                errors[field] = f'En fazla {max_length} karakter olabilir'
+            values[field] = value
+        if not values['name']:
+            errors['name'] = 'Bu alan zorunludur'
+        
+        price = record.get('price')
+        if price in [None, '']:
+            values['price'] = None
+        else:
+            try:
+                values['price'] = float(str(price).replace(',', '.'))
+            except ValueError:
+                errors['price'] = 'Geçerli bir sayı giriniz'
+        
+        for field in DROPDOWN_FIELDS:
+            value = record.get(field)
+            if value in [None, '']:
+                values[f'{field}_id'] = None
+                continue
+            item_id = self.dropdown_maps[field].get(str(value).strip().lower())
+            if item_id is None:
+                errors[field] = f"'{value}' bulunamadı"
+            values[f'{field}_id'] = item_id
+        
+        for field in USER_FIELDS:
+            value = record.get(field)
+            if value in [None, '']:
+                values[f'{field}_id'] = None
+                continue
+            user_id = self.user_map.get(str(value).strip().lower())
+            if user_id is None:
+                errors[field] = f"'{value}' kullanıcısı bulunamadı"
+            values[f'{field}_id'] = user_id
+        
+        for field in DATE_FIELDS:
+            value = record.get(field)
+            if value in [None, '']:
+                values[field] = None
+                continue
+            try:
+                values[field] = parse_date(str(value).strip()[:10])
+            except ValueError:
+                values[field] = None
+            if values[field] is None:
+                errors[field] = 'Tarih YYYY-AA-GG formatında olmalı'
+        
+        for field in BOOLEAN_FIELDS:
+            value = record.get(field)
+            if isinstance(value, bool):
+                values[field] = value
+                continue
+            value = str(value if value is not None else '').strip().lower()
+            if value in TRUE_VALUES:
+                values[field] = True
+            elif value in FALSE_VALUES:
+                values[field] = False
+            else:
+                errors[field] = 'Evet/Hayır değeri bekleniyor'
+        
+        # Serializer ile aynı kural
+        if not values.get('printing_control') and values.get('printing_controller_id'):
+            errors['printing_controller'] = 'Baskı kontrolü seçili değilken kontrolü yapan kişi atanamaz.'
+        if values.get('printing_control'):
+            values['printing_control_date'] = timezone.now()
+        
+        links = self._parse_links(record, errors)
+        
+        if errors:
+            return None, [], errors
+        return Work(**values), links, {}
+    
+    def _check_permissions(self, record):
+        """Kayıttaki kolonlara yazma yetkisi (boş kolonlar kontrol edilmez)"""
+        if self.user.is_superuser or not isinstance(record, dict):
+            return None
+        provided = {key: value for key, value in record.items() if value not in [None, '']}
+        if 'link' in provided or 'link_title' in provided:
+            provided['links'] = True
+        provided.pop('link', None)
+        provided.pop('link_title', None)
+        is_valid, error_message = PermissionChecker.validate_writable_fields(self.user, provided)
+        return None if is_valid else error_message
+    
+    def _flush(self, pending):
+        """Bekleyen kayıtları tek transaction içinde ekler, özet hareket kaydı ve oluşturma snapshot'larını yazar"""
+        if not pending:
+            return
+        
+        now = timezone.now()
+        with transaction.atomic():
+            works = Work.objects.bulk_create([work for _, work, _ in pending])
+            Link.objects.bulk_create([
+                Link(work=work, added_by=self.user_info, added_at=now, **link)
+                for (_, _, links), work in zip(pending, works)
+                for link in links
+            ])
+            
+            first_row, last_row = pending[0][0], pending[-1][0]
+            movement = Movement.objects.create(
+                user=self.user,
+                user_fullname=f"{self.user.first_name} {self.user.last_name}".strip() or self.user.username,
+                work=None,
+                work_name=None,
+                action='create',
+                description=(
+                    f"{self.source_name} dosyasından toplu aktarım: {len(works)} iş oluşturuldu "
+                    f"(satır {first_row}-{last_row})"
+                ),
+                changes={'old': {}, 'new': {'imported_work_ids': [work.id for work in works]}}
+            )
+            
+            # Toplu ekleme sinyal tetiklemediği için analitik, takvim ve liste cache'i burada güncellenir;
+            # iş başına hareket yazılmadığından geçmiş sorguları (as_of) aktarılan hali oluşturma snapshot'ından okur
+            record_new_works_snapshots(works, movement)
+            record_new_works_facts(works)
+            record_new_works_intervals(works)
+            transaction.on_commit(bump_data_version)
+        
+        self.created += len(works)
+        self.batches += 1
+    
+    def run(self, records):
+        """iter_records çıktısını işler, özet sözlüğü döndürür"""
+        pending = []
+        
+        for row_number, record in records:
+            if isinstance(record, Exception):
+                self._add_error(row_number, {'row': str(record)})
+                continue
+            
+            permission_error = self._check_permissions(record)
+            if permission_error:
+                self._add_error(row_number, {'permission': permission_error})
+                continue
+            
+            work, links, errors = self.build_work(record)
+            if errors:
+                self._add_error(row_number, errors)
+                continue
+            
+            pending.append((row_number, work, links))
+            if len(pending) >= self.batch_size:
+                self._flush(pending)
+                pending = []
+        
+        self._flush(pending)
+        return self.summary()
+    
+    def summary(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'batches': self.batches,
+            'row_errors': self.errors,
+            'row_errors_truncated': self.failed > len(self.errors),
+        }
@@ -0,0 +1,107 @@
+# workflows/jobs.py
+"""İş verisi üzerindeki uzun süren bakım ve raporlama işleri (core.jobs ile kuyruğa alınır)"""
+import csv
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from core.jobs import register_job
+from permissions.models import ColumnPermission
+from permissions.utils import PermissionChecker
+from .analytics import rebuild_stage_analytics
+from .archive import archive_works
+from .audit_compaction import compact_audit
+from .importers import BOOLEAN_FIELDS, DATE_FIELDS, DROPDOWN_FIELDS, USER_FIELDS
+from .models import Work
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _export_value(column, work):
+    """Kolon değerini import_works ile tekrar okunabilecek biçimde yazar"""
+    if column in DROPDOWN_FIELDS:
+        related = getattr(work, column)
+        return related.name if related else ''
+    if column in USER_FIELDS:
+        related = getattr(work, column)
+        return related.username if related else ''
+    if column == 'links':
+        return '|'.join(link.url for link in work.links.all())
+    
+    value = getattr(work, column)
+    if value is None:
+        return ''
+    if column in BOOLEAN_FIELDS:
+        return 'true' if value else 'false'
+    if column in DATE_FIELDS:
+        return value.isoformat()
+    return value
+
+
+@register_job('workflows.export_works')
+def export_works_job(context, columns=None):
+    """
+    İşleri CSV dosyasına aktarır (JOB_OUTPUT_DIR); dosya jobs/<id>/download/ ile indirilir
+    İşi oluşturan kullanıcının okuyamadığı kolonlar dosyaya yazılmaz
+    """
+    all_columns = [column for column, _ in ColumnPermission.COLUMN_CHOICES]
+    columns = [column for column in (columns or all_columns) if column in all_columns]
+    
+    user = context.job.created_by
+    if user is not None and not user.is_superuser:
+        permissions = PermissionChecker.get_user_column_permissions(user)
+        columns = [column for column in columns if permissions.get(column) in ['read', 'write']]
+    
+    queryset = Work.objects.order_by('id').select_related(
+        *[column for column in columns if column in DROPDOWN_FIELDS or column in USER_FIELDS]
+    )
+    if 'links' in columns:
+        queryset = queryset.prefetch_related('links')
+    total = queryset.count()
+    
+    output_dir = Path(settings.JOB_OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    file_name = f"works_{context.job.pk}_{timezone.now():%Y%m%d%H%M%S}.csv"
+    
+    written = 0
+    with open(output_dir / file_name, 'w', newline='', encoding='utf-8-sig') as output:
+        writer = csv.writer(output)
+        writer.writerow(['id', *columns])
+        for work in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            writer.writerow([work.id, *[_export_value(column, work) for column in columns]])
+            written += 1
+            if written % EXPORT_CHUNK_SIZE == 0:
+                context.progress(written, total, f'{written}/{total} iş yazıldı')
+    
+    return {'file': file_name, 'rows': written, 'columns': columns}
+
+
+@register_job('workflows.rebuild_stage_analytics')
+def rebuild_stage_analytics_job(context, work_ids=None):
+    """Aşama analitiği tablolarını yeniden hesaplar (bkz. rebuild_stage_analytics komutu)"""
+    context.progress(0, message='Aşama kayıtları hesaplanıyor')
+    facts, rollups = rebuild_stage_analytics(work_ids=work_ids)
+    return {'facts': facts, 'rollups': rollups}
+
+
+@register_job('workflows.archive_works')
+def archive_works_job(context, days=None, batch_size=500):
+    """Tamamlanmış eski işleri arşive taşır (bkz. archive_works komutu)"""
+    archived = archive_works(
+        days=days,
+        batch_size=batch_size,
+        user=context.job.created_by,
+        progress=lambda done, total: context.progress(done, total, f'{done}/{total} iş işlendi')
+    )
+    return {'archived': archived}
+
+
+@register_job('workflows.compact_audit')
+def compact_audit_job(context, days=None, batch_size=500):
+    """Saklama süresinden eski güncelleme hareketlerini ve alan değişikliklerini siler (bkz. compact_audit komutu)"""
+    movements, field_changes = compact_audit(
+        days=days,
+        batch_size=batch_size,
+        progress=lambda done, total: context.progress(done, total, f'{done}/{total} işin geçmişi sıkıştırıldı')
+    )
+    return {'movements': movements, 'field_changes': field_changes}
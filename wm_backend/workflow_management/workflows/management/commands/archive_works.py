@@ -0,0 +1,25 @@
+# workflows/management/commands/archive_works.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from workflows.archive import archivable_works, archive_works
+
+
+class Command(BaseCommand):
+    help = 'Son güncellemesi belirtilen günden eski tamamlanmış işleri arşiv tablosuna taşır'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.WORK_ARCHIVE_AFTER_DAYS,
+                            help='Tamamlandıktan (son güncellemeden) kaç gün sonra arşivleneceği')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Tek transaction içinde taşınacak iş sayısı')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Sadece taşınacak iş sayısını göster')
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archivable_works(options['days']).count()
+            self.stdout.write(f'{count} iş arşive taşınacak.')
+            return
+        
+        archived = archive_works(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{archived} iş arşive taşındı.'))
@@ -0,0 +1,45 @@
+# workflows/management/commands/backfill_field_changes.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from workflows.audit_utils import build_field_changes
+from workflows.models import Movement, FieldChange
+
+
+class Command(BaseCommand):
+    help = 'Mevcut güncelleme hareketlerinin değişikliklerinden alan bazında FieldChange kayıtları oluşturur'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Tüm FieldChange kayıtlarını silip yeniden oluştur')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Tek transaction içinde işlenecek hareket sayısı')
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        
+        if options['rebuild']:
+            FieldChange.objects.all().delete()
+        
+        # Alan kaydı olmayan güncelleme hareketleri (id sırasıyla, kaldığı yerden devam edebilir)
+        movements = Movement.objects.filter(
+            action='update', changes__isnull=False, field_changes__isnull=True
+        ).only('id', 'action', 'work_id', 'user_id', 'created', 'updated', 'changes').order_by('id')
+        
+        last_id = 0
+        total_movements = total_changes = 0
+        while True:
+            batch = list(movements.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            
+            with transaction.atomic():
+                changes = [change for movement in batch for change in build_field_changes(movement)]
+                FieldChange.objects.bulk_create(changes, batch_size=1000)
+            
+            last_id = batch[-1].id
+            total_movements += len(batch)
+            total_changes += len(changes)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{total_movements} hareket için {total_changes} alan değişikliği kaydı oluşturuldu.'
+        ))
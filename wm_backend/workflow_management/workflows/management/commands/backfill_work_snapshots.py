@@ -0,0 +1,72 @@
+# workflows/management/commands/backfill_work_snapshots.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from workflows.models import Work, Movement, WorkSnapshot
+from workflows.snapshots import snapshot_state, update_movements
+
+
+class Command(BaseCommand):
+    help = 'Mevcut işler için hareket kayıtlarını geriye sararak periyodik snapshot (checkpoint) oluşturur'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--work', type=int, action='append', dest='work_ids',
+                            help='Sadece belirtilen iş(ler) için oluştur')
+        parser.add_argument('--interval', type=int, default=settings.WORK_SNAPSHOT_INTERVAL,
+                            help='Kaç güncelleme hareketinde bir snapshot alınacağı')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Snapshot\'ı olan işlerin mevcut snapshot\'larını silip yeniden oluştur')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Tek transaction içinde işlenecek iş sayısı')
+    
+    def handle(self, *args, **options):
+        interval = options['interval']
+        batch_size = options['batch_size']
+        
+        works = Work.objects.select_related(
+            'category', 'type', 'sales_channel', 'designer', 'printing_controller'
+        ).order_by('id')
+        if options['work_ids']:
+            works = works.filter(id__in=options['work_ids'])
+        if not options['rebuild']:
+            works = works.filter(snapshots__isnull=True)
+        
+        work_ids = list(works.values_list('id', flat=True))
+        total_works = total_snapshots = 0
+        
+        for start in range(0, len(work_ids), batch_size):
+            batch_ids = work_ids[start:start + batch_size]
+            
+            with transaction.atomic():
+                if options['rebuild']:
+                    WorkSnapshot.objects.filter(work_id__in=batch_ids).delete()
+                
+                snapshots = []
+                for work in works.filter(id__in=batch_ids):
+                    snapshots.extend(self._build_snapshots(work, interval))
+                    total_works += 1
+                
+                WorkSnapshot.objects.bulk_create(snapshots)
+                total_snapshots += len(snapshots)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{total_works} iş için {total_snapshots} snapshot oluşturuldu.'
+        ))
+    
+    def _build_snapshots(self, work, interval):
+        """Güncel halden başlayıp eski değerlere dönerek checkpoint'leri hesaplar"""
+        movements = list(update_movements(work.id).only('id', 'created', 'changes'))
+        create_movement = Movement.objects.filter(work_id=work.id, action='create').order_by('id').first()
+        
+        state = snapshot_state(work)
+        snapshots = []
+        
+        for index in range(len(movements), 0, -1):
+            movement = movements[index - 1]
+            if index % interval == 0:
+                snapshots.append(WorkSnapshot(work=work, movement=movement, taken_at=movement.created, data=dict(state)))
+            state.update(movement.changes.get('old', {}))
+        
+        # Oluşturma anındaki hal
+        snapshots.append(WorkSnapshot(work=work, movement=create_movement, taken_at=work.created, data=state))
+        return snapshots
@@ -0,0 +1,47 @@
+# workflows/management/commands/benchmark_list_formats.py
+import gzip
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from core.renderers import CustomJSONRenderer, ColumnarJSONRenderer
+from workflows.benchmarks import seeded_works
+from workflows.serializer import WorkflowSerializer
+from workflows.views import WorkflowViewSet
+
+
+class Command(BaseCommand):
+    help = 'İş listesinin standart ve kolon bazlı (columnar) çıktılarının boyut ve encode süresi karşılaştırması'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Örnek iş sayısı')
+        parser.add_argument('--repeat', type=int, default=3, help='Her ölçümün tekrar sayısı (en iyisi alınır)')
+    
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        
+        # Örnek veri geri alınan transaction içinde oluşturulur
+        with seeded_works(rows) as work_ids:
+            works = WorkflowViewSet.queryset.filter(id__in=work_ids)
+            data = WorkflowSerializer(works, many=True).data
+            
+            context = {'response': SimpleNamespace(status_code=200)}
+            results = []
+            for renderer in [CustomJSONRenderer(), ColumnarJSONRenderer()]:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    content = renderer.render(data, renderer.media_type, context)
+                    timings.append(time.perf_counter() - started)
+                results.append((renderer.format, len(content), len(gzip.compress(content)), min(timings)))
+        
+        self.stdout.write(f'{rows} satır, {repeat} tekrarın en iyisi')
+        self.stdout.write(f"{'format':<10} {'boyut':>12} {'gzip':>12} {'encode (ms)':>12}")
+        for renderer_format, size, gzip_size, elapsed in results:
+            self.stdout.write(f'{renderer_format:<10} {size:>12,} {gzip_size:>12,} {elapsed * 1000:>12.1f}')
+        
+        (_, json_size, json_gzip, json_time), (_, columnar_size, columnar_gzip, columnar_time) = results
+        self.stdout.write(self.style.SUCCESS(
+            f'columnar: boyut %{100 * columnar_size / json_size:.0f}, gzip %{100 * columnar_gzip / json_gzip:.0f}, '
+            f'encode süresi %{100 * columnar_time / json_time:.0f} (json = %100)'
+        ))
@@ -0,0 +1,52 @@
+# workflows/management/commands/benchmark_serializers.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from workflows.benchmarks import seeded_works
+from workflows.fast_serializer import FastWorkflowSerializer
+from workflows.serializer import WorkflowSerializer
+from workflows.views import WorkflowViewSet
+
+
+class Command(BaseCommand):
+    help = 'İş listesinin WorkflowSerializer ve FastWorkflowSerializer ile serialize süresi karşılaştırması'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='1000,10000,100000',
+                            help='Denenecek satır sayıları (virgülle ayrılmış)')
+        parser.add_argument('--repeat', type=int, default=3, help='Her ölçümün tekrar sayısı (en iyisi alınır)')
+        parser.add_argument('--fields', help='Sparse fieldset (ör. name,category_name,status_code)')
+    
+    def _measure(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+    
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['rows'].split(',') if level.strip()]
+        except ValueError:
+            raise CommandError('--rows virgülle ayrılmış sayılardan oluşmalı')
+        fields = set(options['fields'].split(',')) if options['fields'] else None
+        repeat = options['repeat']
+        
+        self.stdout.write(f'{repeat} tekrarın en iyisi (sorgu + serialize)')
+        self.stdout.write(f"{'satır':>8} {'drf (ms)':>10} {'hızlı (ms)':>11} {'hızlanma':>9}")
+        
+        for rows in levels:
+            # Örnek veri geri alınan transaction içinde oluşturulur
+            with seeded_works(rows) as work_ids:
+                # Çok büyük id__in listeleri SQLite parametre sınırını aşar, bu durumda tüm tablo ölçülür
+                if rows <= 20000:
+                    queryset = WorkflowViewSet.queryset.filter(id__in=work_ids)
+                else:
+                    queryset = WorkflowViewSet.queryset.all()
+                drf_time = self._measure(repeat, lambda: WorkflowSerializer(queryset.all(), many=True, fields=fields).data)
+                fast_time = self._measure(repeat, lambda: FastWorkflowSerializer(fields=fields).serialize(queryset.all()))
+            
+            self.stdout.write(
+                f'{rows:>8,} {drf_time * 1000:>10.1f} {fast_time * 1000:>11.1f} {drf_time / fast_time:>8.1f}x'
+            )
@@ -0,0 +1,27 @@
+# workflows/management/commands/compact_audit.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from workflows.audit_compaction import audit_cutoff, compact_audit, compactable_movements
+
+
+class Command(BaseCommand):
+    help = 'Saklama süresinden eski güncelleme hareketlerini ve alan değişikliği kayıtlarını siler'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.AUDIT_RETENTION_DAYS,
+                            help='Güncelleme hareketlerinin kaç gün saklanacağı')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Tek transaction içinde geçmişi sıkıştırılacak iş sayısı')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Sadece silinecek hareket sayısını göster')
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = compactable_movements(audit_cutoff(options['days'])).count()
+            self.stdout.write(f'{count} güncelleme hareketi silinecek.')
+            return
+        
+        movements, field_changes = compact_audit(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{movements} güncelleme hareketi ve {field_changes} alan değişikliği kaydı silindi.'
+        ))
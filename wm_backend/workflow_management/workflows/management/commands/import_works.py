@@ -0,0 +1,46 @@
+# workflows/management/commands/import_works.py
+import csv
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from workflows.importers import SUPPORTED_FORMATS, WorkImporter, detect_format, iter_records
+
+
+class Command(BaseCommand):
+    help = 'CSV / JSON / NDJSON dosyasındaki işleri toplu olarak içe aktarır'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='İçe aktarılacak dosya')
+        parser.add_argument('--username', required=True,
+                            help='Aktarımı yapan kullanıcı (yetki kontrolü ve hareket kaydı için)')
+        parser.add_argument('--format', choices=SUPPORTED_FORMATS,
+                            help='Dosya formatı (verilmezse uzantıdan tahmin edilir)')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Tek transaction içinde eklenecek iş sayısı')
+    
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"'{options['username']}' kullanıcısı bulunamadı")
+        
+        file_format = options['format'] or detect_format(options['path'])
+        importer = WorkImporter(user, batch_size=options['batch_size'], source_name=options['path'])
+        
+        try:
+            with open(options['path'], 'rb') as stream:
+                summary = importer.run(iter_records(stream, file_format))
+        except OSError as e:
+            raise CommandError(f'Dosya açılamadı: {e}')
+        except (ValueError, csv.Error) as e:
+            raise CommandError(f'Dosya okunamadı ({importer.created} iş aktarılmıştı): {e}')
+        
+        for row_error in summary['row_errors']:
+            details = '; '.join(f'{field}: {message}' for field, message in row_error['errors'].items())
+            self.stderr.write(f"Satır {row_error['row']}: {details}")
+        if summary['row_errors_truncated']:
+            self.stderr.write('Hata listesi kısaltıldı.')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['created']} iş {summary['batches']} batch halinde aktarıldı, {summary['failed']} satır hatalı."
+        ))
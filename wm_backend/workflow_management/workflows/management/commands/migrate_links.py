@@ -0,0 +1,69 @@
+# workflows/management/commands/migrate_links.py
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.core.validators import URLValidator
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from workflows.models import Work, Link
+
+
+class Command(BaseCommand):
+    help = 'Work.links JSON alanındaki eski bağlantıları Link tablosuna taşır'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Tek transaction içinde işlenecek iş sayısı')
+        parser.add_argument('--keep-legacy', action='store_true',
+                            help='Taşıma sonrası JSON alanını temizleme')
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        validator = URLValidator()
+        
+        # Daha önce taşınmış (Link kaydı olan) işleri atla
+        work_ids = list(
+            Work.objects.exclude(legacy_links=[])
+            .filter(links__isnull=True)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        
+        migrated_works = migrated_links = skipped_links = 0
+        
+        for start in range(0, len(work_ids), batch_size):
+            batch_ids = work_ids[start:start + batch_size]
+            
+            with transaction.atomic():
+                works = Work.objects.filter(id__in=batch_ids).only('id', 'legacy_links', 'created')
+                new_links = []
+                
+                for work in works:
+                    for link_data in work.legacy_links or []:
+                        url = link_data.get('url') if isinstance(link_data, dict) else None
+                        try:
+                            validator(url)
+                        except (ValidationError, TypeError):
+                            skipped_links += 1
+                            self.stderr.write(f'İş {work.id}: geçersiz bağlantı atlandı: {link_data!r}')
+                            continue
+                        
+                        added_at = link_data.get('added_at')
+                        new_links.append(Link(
+                            work_id=work.id,
+                            url=url,
+                            title=link_data.get('title'),
+                            description=link_data.get('description'),
+                            added_by=link_data.get('added_by'),
+                            added_at=(parse_datetime(added_at) if added_at else None) or work.created
+                        ))
+                    migrated_works += 1
+                
+                Link.objects.bulk_create(new_links)
+                migrated_links += len(new_links)
+                
+                if not options['keep_legacy']:
+                    Work.objects.filter(id__in=batch_ids).update(legacy_links=[])
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{migrated_works} iş için {migrated_links} bağlantı taşındı, {skipped_links} bağlantı atlandı.'
+        ))
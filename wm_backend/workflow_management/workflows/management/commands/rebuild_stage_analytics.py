@@ -0,0 +1,19 @@
+# workflows/management/commands/rebuild_stage_analytics.py
+from django.core.management.base import BaseCommand
+from workflows.analytics import rebuild_stage_analytics
+
+
+class Command(BaseCommand):
+    help = 'Aşama süre kayıtlarını ve özet (histogram) tablosunu iş tarihlerinden yeniden oluşturur'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--work', type=int, action='append', dest='work_ids',
+                            help='Sadece belirtilen iş(ler)i yeniden hesapla (özet artımlı güncellenir)')
+    
+    def handle(self, *args, **options):
+        facts, rollups = rebuild_stage_analytics(options['work_ids'])
+        
+        message = f'{facts} aşama kaydı oluşturuldu'
+        if rollups is not None:
+            message += f', {rollups} özet satırı yazıldı'
+        self.stdout.write(self.style.SUCCESS(message + '.'))
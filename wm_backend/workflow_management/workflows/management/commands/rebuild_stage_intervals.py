@@ -0,0 +1,14 @@
+# workflows/management/commands/rebuild_stage_intervals.py
+from django.core.management.base import BaseCommand
+from workflows.timeline import rebuild_stage_intervals
+
+
+class Command(BaseCommand):
+    help = 'Takvim ve gecikme sorgularının okuduğu aşama aralıklarını iş tarihlerinden yeniden oluşturur'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Tek seferde yazılacak aralık sayısı')
+    
+    def handle(self, *args, **options):
+        written = rebuild_stage_intervals(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{written} aşama aralığı yazıldı.'))
@@ -1,7 +1,7 @@
 from django.db import models
 from django.conf import settings
-from django.core.validators import URLValidator
-from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 
 class BaseDropdownModel(models.Model):
@@ -40,8 +40,8 @@ class SalesChannel(BaseDropdownModel):
         verbose_name_plural = 'Satış Kanalları'
 
 
-class Work(models.Model):
-    """İş kayıtları"""
+class AbstractWork(models.Model):
+    """İş alanları - aktif (Work) ve arşivlenmiş (ArchivedWork) işler aynı yapıyı paylaşır"""
     
     # Temel bilgiler
     name = models.CharField(max_length=200, verbose_name='İsim')
@@ -86,48 +86,35 @@ class Work(models.Model):
     shipping_date = models.DateField(verbose_name='Sevkiyat Tarihi', blank=True, null=True)
     
     # Diğer
-    links = models.JSONField(
-        verbose_name='Bağlantılar',
-        default=list,
-        blank=True,
-        help_text='[{"url": "https://...", "title": "Başlık", "description": "Açıklama"}]'
-    )
     note = models.TextField(verbose_name='Not', blank=True, null=True)
     created = models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')
     updated = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')
     
+    # İyimser eşzamanlılık kontrolü için her güncellemede artar
+    version = models.PositiveIntegerField(default=1, editable=False, verbose_name='Versiyon')
+    
     def __str__(self):
         return f"{self.name} - {self.category}"
     
-    def clean(self):
-        """Link formatlarını validate et"""
-        if not self.links:
-            return
-            
-        validator = URLValidator()
-        for i, link_data in enumerate(self.links):
-            if not isinstance(link_data, dict):
-                raise ValidationError(f'Bağlantı {i+1}: Geçersiz format')
-            
-            url = link_data.get('url')
-            if not url:
-                raise ValidationError(f'Bağlantı {i+1}: URL zorunludur')
-            
-            try:
-                validator(url)
-            except ValidationError:
-                raise ValidationError(f'Bağlantı {i+1}: Geçersiz URL formatı')
-    
     @property
-    def calculated_status(self):
-        """İşin durumunu otomatik hesapla"""
-        if self.stock_entry:
+    def etag(self):
+        return f'"{self.version}"'
+    
+    @staticmethod
+    def status_for(stock_entry, printing_confirm):
+        """Durum bilgisi (model nesnesi olmadan da hesaplanabilsin diye ayrı)"""
+        if stock_entry:
             return {'code': 'completed', 'text': 'Tamamlandı', 'color': '#dc3545'}
-        elif self.printing_confirm:
+        elif printing_confirm:
             return {'code': 'printing', 'text': 'Baskı', 'color': '#28a745'}
         else:
             return {'code': 'waiting', 'text': 'Beklemede', 'color': '#6c757d'}
     
+    @property
+    def calculated_status(self):
+        """İşin durumunu otomatik hesapla"""
+        return self.status_for(self.stock_entry, self.printing_confirm)
+    
     @property
     def status_code(self):
         return self.calculated_status['code']
@@ -140,10 +127,171 @@ class Work(models.Model):
     def status_color(self):
         return self.calculated_status['color']
     
+    class Meta:
+        abstract = True
+
+
+class Work(AbstractWork):
+    """İş kayıtları"""
+    
+    # Bağlantılar Link tablosunda tutulur (work.links). Bu alan sadece eski JSON verisini
+    # taşımak için duruyor, bkz. migrate_links komutu
+    legacy_links = models.JSONField(
+        db_column='links',
+        verbose_name='Eski Bağlantılar (JSON)',
+        default=list,
+        blank=True,
+        editable=False
+    )
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kayıtta türetilmiş tablolar (aşama kayıtları, takvim) sadece kaynak alanları değiştiyse yenilenir
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def save(self, *args, update_fields=None, **kwargs):
+        super().save(*args, update_fields=update_fields, **kwargs)
+        # Sinyaller eski değerlerle çalıştıktan sonra karşılaştırma kaydedilen hale taşınır (ertelenmiş alanlar okunmaz)
+        saved = {field.attname for field in self._meta.concrete_fields if field.attname in self.__dict__}
+        if update_fields is None:
+            self._loaded_values = {}
+        elif getattr(self, '_loaded_values', None) is None:
+            return
+        else:
+            saved &= {self._meta.get_field(name).attname for name in update_fields}
+        self._loaded_values.update((attname, self.__dict__[attname]) for attname in saved)
+    
+    def refresh_from_db(self, *args, **kwargs):
+        # Kısmi yenilemeden sonra hangi değerin veritabanında olduğu bilinmez, sonraki kayıt her şeyi yeniler
+        self._loaded_values = None
+        super().refresh_from_db(*args, **kwargs)
+    
+    def fields_changed(self, attnames):
+        """Veritabanından okunduğundan beri verilen alanlardan biri değişti mi? (yeni ve okunmamış alanlarda True)"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return True
+        return any(attname not in loaded or loaded[attname] != getattr(self, attname) for attname in attnames)
+    
+    def claim_version(self, expected_version):
+        """
+        Versiyonu sadece veritabanındaki değer beklenenle aynıysa artırır
+        (UPDATE ... SET version = version + 1 WHERE id = ? AND version = ?)
+        Transaction içinde çağrılmalı; başarılıysa True döner
+        """
+        claimed = Work.objects.filter(pk=self.pk, version=expected_version).update(
+            version=models.F('version') + 1
+        )
+        if claimed:
+            self.version = expected_version + 1
+        return bool(claimed)
+    
+    def bump_version(self):
+        """Versiyonu koşulsuz artırır (admin gibi If-Match taşımayan yazma yolları için)"""
+        Work.objects.filter(pk=self.pk).update(version=models.F('version') + 1)
+        self.version += 1
+    
     class Meta:
         verbose_name = 'İş'
         verbose_name_plural = 'İşler'
         ordering = ['-created']
+        indexes = [
+            # Admin ve API listeleri created'a göre sıralanır
+            models.Index(fields=['created'], name='work_created_idx'),
+        ]
+
+
+class Link(models.Model):
+    """İşe ait bağlantılar"""
+    work = models.ForeignKey(Work, on_delete=models.CASCADE, related_name='links', verbose_name='İş')
+    url = models.URLField(max_length=2048, verbose_name='URL')
+    title = models.CharField(max_length=255, verbose_name='Başlık', blank=True, null=True)
+    description = models.TextField(verbose_name='Açıklama', blank=True, null=True)
+    added_by = models.CharField(max_length=200, verbose_name='Ekleyen', blank=True, null=True)
+    added_at = models.DateTimeField(default=timezone.now, verbose_name='Eklenme Tarihi')
+    
+    def __str__(self):
+        return self.title or self.url
+    
+    def to_dict(self):
+        """Eski JSON formatıyla aynı yapıda sözlük döndürür"""
+        return {
+            'url': self.url,
+            'title': self.title,
+            'description': self.description,
+            'added_at': self.added_at.isoformat() if self.added_at else None,
+            'added_by': self.added_by
+        }
+    
+    class Meta:
+        verbose_name = 'Bağlantı'
+        verbose_name_plural = 'Bağlantılar'
+        ordering = ['added_at', 'id']
+        indexes = [
+            models.Index(fields=['work', 'url'], name='link_work_url_idx'),
+            models.Index(fields=['url'], name='link_url_idx'),
+        ]
+
+
+class ArchivedLinkSet:
+    """Arşivlenmiş işin bağlantıları; Link related manager'ı gibi .all() ile okunur"""
+    
+    def __init__(self, link_data):
+        self.link_data = link_data or []
+    
+    def all(self):
+        return [
+            Link(
+                url=item.get('url'),
+                title=item.get('title'),
+                description=item.get('description'),
+                added_by=item.get('added_by'),
+                added_at=parse_datetime(item['added_at']) if item.get('added_at') else None
+            )
+            for item in self.link_data
+        ]
+
+
+class ArchivedWork(AbstractWork):
+    """
+    Arşive taşınmış tamamlanmış işler (aynı id ile)
+    Aktif tablo sadece devam eden işleri tutar; hareketler, snapshot'lar ve analitik kayıtları
+    iş id'si ile bağlı kalır, geri alındığında tekrar eşleşir
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name='ID')
+    designer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_designed_works',
+        verbose_name='Tasarımcı'
+    )
+    printing_controller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_controlled_prints',
+        verbose_name='Kontrolü Yapan Kişi'
+    )
+    # Orijinal zamanlar korunur
+    created = models.DateTimeField(verbose_name='Oluşturulma Tarihi')
+    updated = models.DateTimeField(verbose_name='Güncellenme Tarihi')
+    
+    link_data = models.JSONField(verbose_name='Bağlantılar', default=list, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='Arşivlenme Tarihi')
+    
+    @property
+    def links(self):
+        return ArchivedLinkSet(self.link_data)
+    
+    class Meta:
+        verbose_name = 'Arşivlenmiş İş'
+        verbose_name_plural = 'Arşivlenmiş İşler'
+        ordering = ['-created']
 
 
 class Movement(models.Model):
@@ -152,7 +300,9 @@ class Movement(models.Model):
     ACTION_CHOICES = [
         ('create', 'Oluşturma'),
         ('update', 'Güncelleme'),
-        ('delete', 'Silme')
+        ('delete', 'Silme'),
+        ('archive', 'Arşivleme'),
+        ('restore', 'Arşivden Geri Alma')
     ]
     
     user = models.ForeignKey(
@@ -163,7 +313,15 @@ class Movement(models.Model):
         verbose_name='Kullanıcı'
     )
     user_fullname = models.CharField(max_length=200, verbose_name='Kullanıcı Adı', blank=True, null=True)
-    work = models.ForeignKey(Work, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='İş')
+    # İş arşive taşındığında kayıt iş id'sini korur (db constraint yok); gerçek silmede view tarafından boşaltılır
+    work = models.ForeignKey(
+        Work,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        verbose_name='İş'
+    )
     work_name = models.CharField(max_length=200, verbose_name='İş Adı', blank=True, null=True)
     action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name='İşlem')
     description = models.TextField(verbose_name='Açıklama')
@@ -174,6 +332,8 @@ class Movement(models.Model):
         help_text='Güncelleme durumunda eski ve yeni değerler'
     )
     created = models.DateTimeField(auto_now_add=True, verbose_name='Tarih')
+    # Ardışık düzenlemeler bu harekete birleştirildiyse son düzenlemenin zamanı
+    updated = models.DateTimeField(blank=True, null=True, verbose_name='Son Birleştirme')
     
     def __str__(self):
         user_display = self.user_fullname or (self.user.username if self.user else 'Bilinmiyor')
@@ -182,4 +342,181 @@ class Movement(models.Model):
     class Meta:
         verbose_name = 'Hareket'
         verbose_name_plural = 'Hareketler'
-        ordering = ['-created']
\ No newline at end of file
+        ordering = ['-created']
+        indexes = [
+            models.Index(fields=['work', 'created'], name='movement_work_created_idx'),
+            # Admin listesi: sıralama ve action/user filtreleri created ile birlikte indeksten okunur
+            models.Index(fields=['created'], name='movement_created_idx'),
+            models.Index(fields=['action', 'created'], name='movement_action_created_idx'),
+            models.Index(fields=['user', 'created'], name='movement_user_created_idx'),
+        ]
+
+
+class FieldChange(models.Model):
+    """
+    Güncelleme hareketindeki her alan değişikliğinin ayrı, indeksli kaydı
+    "Şu işlerin fiyatını geçen ay kim değiştirdi" gibi sorgular Movement.changes JSON'ını
+    taramadan indeks aralığından okunur. Kayıtlar hareketle birlikte yazılır ve birleştirilen
+    güncellemelerde hareketin değişiklikleriyle yeniden oluşturulur.
+    """
+    movement = models.ForeignKey(
+        Movement, on_delete=models.CASCADE, related_name='field_changes', verbose_name='Hareket'
+    )
+    # Hareket gibi arşivlemede iş id'sini korur; gerçek silmede view tarafından boşaltılır
+    work = models.ForeignKey(
+        Work,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='İş'
+    )
+    field = models.CharField(max_length=50, verbose_name='Alan')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Kullanıcı'
+    )
+    changed_at = models.DateTimeField(verbose_name='Değişiklik Zamanı')
+    old_value = models.JSONField(blank=True, null=True, verbose_name='Eski Değer')
+    new_value = models.JSONField(blank=True, null=True, verbose_name='Yeni Değer')
+    
+    def __str__(self):
+        return f"{self.work_id} - {self.field} - {self.changed_at}"
+    
+    class Meta:
+        verbose_name = 'Alan Değişikliği'
+        verbose_name_plural = 'Alan Değişiklikleri'
+        ordering = ['-changed_at', '-id']
+        indexes = [
+            models.Index(fields=['field', 'changed_at'], name='field_change_field_idx'),
+            models.Index(fields=['work', 'field', 'changed_at'], name='field_change_work_idx'),
+            models.Index(fields=['user', 'changed_at'], name='field_change_user_idx'),
+        ]
+
+
+class WorkSnapshot(models.Model):
+    """
+    İşin belirli bir hareketten sonraki tam hali
+    Geçmişteki bir anı bulmak için tüm hareketler yerine en yakın checkpoint'ten itibaren replay yapılır
+    """
+    # Arşivlemede korunur, gerçek silmede view tarafından silinir
+    work = models.ForeignKey(
+        Work, on_delete=models.DO_NOTHING, db_constraint=False, related_name='snapshots', verbose_name='İş'
+    )
+    movement = models.ForeignKey(
+        Movement,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Son Hareket',
+        help_text='Snapshot bu hareket uygulandıktan sonraki hali tutar'
+    )
+    taken_at = models.DateTimeField(verbose_name='Snapshot Zamanı')
+    data = models.JSONField(verbose_name='Alan Değerleri', help_text='Hareket kayıtlarıyla aynı formatta alan değerleri')
+    
+    def __str__(self):
+        return f"{self.work_id} - {self.taken_at}"
+    
+    class Meta:
+        verbose_name = 'İş Snapshot'
+        verbose_name_plural = 'İş Snapshotları'
+        ordering = ['-taken_at', '-id']
+        indexes = [
+            models.Index(fields=['work', 'taken_at'], name='snapshot_work_taken_idx'),
+        ]
+
+
+class WorkStageFact(models.Model):
+    """
+    İşin tamamlanmış her aşaması için süre kaydı (analitik için)
+    İş kaydedildikçe güncellenir, StageDurationRollup bu kayıtlardan beslenir
+    """
+    # Arşivlenen işler analitikte kalır; gerçek silmede pre_delete sinyali kayıtları düşer
+    work = models.ForeignKey(
+        Work, on_delete=models.DO_NOTHING, db_constraint=False, related_name='stage_facts', verbose_name='İş'
+    )
+    stage = models.CharField(max_length=20, verbose_name='Aşama')
+    duration_days = models.IntegerField(verbose_name='Süre (Gün)')
+    end_date = models.DateField(verbose_name='Aşama Bitiş Tarihi')
+    designer_id = models.IntegerField(null=True, blank=True, verbose_name='Tasarımcı')
+    category_id = models.IntegerField(null=True, blank=True, verbose_name='Kategori')
+    sales_channel_id = models.IntegerField(null=True, blank=True, verbose_name='Satış Kanalı')
+    
+    class Meta:
+        verbose_name = 'Aşama Süresi'
+        verbose_name_plural = 'Aşama Süreleri'
+        constraints = [
+            models.UniqueConstraint(fields=['work', 'stage'], name='stage_fact_work_stage_uniq'),
+        ]
+
+
+class StageDurationRollup(models.Model):
+    """
+    Aşama sürelerinin dönem ve boyut bazında gün histogramı
+    Süreler tam gün olduğundan ortalama ve yüzdelikler bu tablodan kesin olarak hesaplanır
+    dimension_id 0: boyut 'all' ya da atanmamış
+    """
+    stage = models.CharField(max_length=20, verbose_name='Aşama')
+    dimension = models.CharField(max_length=20, verbose_name='Boyut')
+    dimension_id = models.IntegerField(default=0, verbose_name='Boyut Değeri')
+    period = models.CharField(max_length=10, verbose_name='Dönem Tipi')
+    period_start = models.DateField(verbose_name='Dönem Başlangıcı')
+    duration_days = models.IntegerField(verbose_name='Süre (Gün)')
+    count = models.IntegerField(default=0, verbose_name='Adet')
+    
+    class Meta:
+        verbose_name = 'Aşama Süresi Özeti'
+        verbose_name_plural = 'Aşama Süresi Özetleri'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['stage', 'dimension', 'dimension_id', 'period', 'period_start', 'duration_days'],
+                name='stage_rollup_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['stage', 'dimension', 'period', 'period_start'], name='stage_rollup_lookup_idx'),
+        ]
+
+class StageInterval(models.Model):
+    """
+    İşin üretim aşamalarının takvim aralıkları (takvim ve geciken iş sorguları için)
+    Bitiş tarihi girilmemiş aşama açıktır (is_open); is_done işin durum bayraklarından hesaplanır.
+    İş kaydedildikçe güncellenir, bkz. workflows.timeline
+    """
+    # Arşivlenen işler takvimde kalır; gerçek silmede pre_delete sinyali kayıtları düşer
+    work = models.ForeignKey(
+        Work, on_delete=models.DO_NOTHING, db_constraint=False, related_name='stage_intervals', verbose_name='İş'
+    )
+    stage = models.CharField(max_length=20, verbose_name='Aşama')
+    start_date = models.DateField(verbose_name='Başlangıç')
+    end_date = models.DateField(null=True, blank=True, verbose_name='Bitiş')
+    span_days = models.IntegerField(default=0, verbose_name='Süre (Gün)')
+    is_open = models.BooleanField(default=False, verbose_name='Açık')
+    is_done = models.BooleanField(default=False, verbose_name='Tamamlandı')
+    
+    class Meta:
+        verbose_name = 'Aşama Aralığı'
+        verbose_name_plural = 'Aşama Aralıkları'
+        constraints = [
+            models.UniqueConstraint(fields=['work', 'stage'], name='stage_interval_work_stage_uniq'),
+        ]
+        indexes = [
+            # Kısa aralıklar pencereden SHORT_SPAN gün önce başlayanlardan okunur
+            models.Index(fields=['start_date'], name='stage_interval_start_idx'),
+            # Uzun aralıklar pencere başlangıcından sonra bitenlerden okunur; geçmişte kalanlar taranmaz
+            # (ayar değişirse koşul da değişir, makemigrations gerekir)
+            models.Index(
+                fields=['end_date', 'start_date'],
+                condition=models.Q(span_days__gt=settings.WORKFLOW_TIMELINE_SHORT_SPAN_DAYS),
+                name='stage_interval_long_idx'
+            ),
+            # Açık ve tamamlanmamış aralıklar sadece aktif işlerde olur; indeks geçmişle büyümez
+            models.Index(fields=['start_date'], condition=models.Q(is_open=True), name='stage_interval_open_idx'),
+            models.Index(fields=['end_date'], condition=models.Q(is_done=False), name='stage_interval_pending_idx'),
+        ]
@@ -1,10 +1,16 @@
 from rest_framework import serializers
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Left
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib.auth.models import User
-from workflows.models import Work, Movement, Category, SalesChannel, WorkType
+from workflows.models import Work, Link, Movement, Category, SalesChannel, WorkType
 from permissions.utils import PermissionChecker
+from core.exceptions import PreconditionFailed
 
 
 class LinkListField(serializers.ListField):
@@ -42,6 +48,9 @@ class LinkListField(serializers.ListField):
     
     def to_representation(self, value):
         """Çıktıda gereksiz None değerleri temizle"""
+        if hasattr(value, 'all'):
+            value = [link.to_dict() for link in value.all()]
+        
         if not value:
             return []
         
@@ -119,7 +128,59 @@ class WorkflowSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Work
-        fields = '__all__'
+        exclude = ['legacy_links']
+    
+    # İsim alanları detay alanlarından türetilir
+    NAME_FIELDS = {
+        'category_name': 'category_detail',
+        'type_name': 'type_detail',
+        'sales_channel_name': 'sales_channel_detail',
+        'designer_name': 'designer_detail',
+        'printing_controller_name': 'printing_controller_detail'
+    }
+    LEGACY_LINK_FIELDS = ['link', 'link_title']
+    # Sparse fieldset'te başka alanların yerine geçen adlar
+    FIELD_ALIASES = {}
+    
+    # Hesaplanan alanların okuduğu model alanları (sparse fieldset'te queryset'e eklenir)
+    FIELD_DEPENDENCIES = {
+        'status_code': ['stock_entry', 'printing_confirm'],
+        'status_text': ['stock_entry', 'printing_confirm'],
+        'status_color': ['stock_entry', 'printing_confirm'],
+        'category_detail': ['category'],
+        'category_name': ['category'],
+        'type_detail': ['type'],
+        'type_name': ['type'],
+        'sales_channel_detail': ['sales_channel'],
+        'sales_channel_name': ['sales_channel'],
+        'designer_detail': ['designer'],
+        'designer_name': ['designer'],
+        'printing_controller_detail': ['printing_controller'],
+        'printing_controller_name': ['printing_controller'],
+        'link': ['links'],
+        'link_title': ['links'],
+    }
+    
+    def __init__(self, *args, **kwargs):
+        """fields: sadece istenen çıktı alanları (None ise hepsi)"""
+        requested_fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        
+        self.requested_fields = None
+        if requested_fields is not None:
+            self.requested_fields = set(requested_fields) | {'id'}
+            # İsim alanı istendiyse kaynağı olan detay alanı da hesaplanmalı
+            needed = self.requested_fields | {
+                self.NAME_FIELDS[field] for field in self.requested_fields if field in self.NAME_FIELDS
+            }
+            for field_name in list(self.fields):
+                if field_name not in needed:
+                    self.fields.pop(field_name)
+    
+    @classmethod
+    def available_fields(cls):
+        """İstemcinin seçebileceği tüm çıktı alanları"""
+        return list(cls().fields) + list(cls.NAME_FIELDS) + cls.LEGACY_LINK_FIELDS + list(cls.FIELD_ALIASES)
     
     def get_user_detail(self, user):
         """Kullanıcı detay bilgisi"""
@@ -159,25 +220,59 @@ class WorkflowSerializer(serializers.ModelSerializer):
                     data[name_field] = data[detail_field]['full_name']
         
         # Legacy link alanları
-        if instance.links and len(instance.links) > 0:
-            data['link'] = instance.links[0].get('url')
-            data['link_title'] = instance.links[0].get('title', '')
+        requested = self.requested_fields
+        if self.LEGACY_LINK_FIELDS and (requested is None or requested & set(self.LEGACY_LINK_FIELDS)):
+            first_link = next(iter(instance.links.all()), None)
+            if first_link:
+                data['link'] = first_link.url
+                data['link_title'] = first_link.title
+        
+        if requested is not None:
+            data = {key: value for key, value in data.items() if key in requested}
         
         return data
-            
+    
+    def _parse_added_at(self, value):
+        """Bağlantı eklenme zamanını datetime'a çevir"""
+        if isinstance(value, str):
+            value = parse_datetime(value)
+        return value or timezone.now()
+    
+    def _save_links(self, work, links_data):
+        """İşin bağlantılarını verilen liste ile değiştir"""
+        work.links.all().delete()
+        Link.objects.bulk_create([
+            Link(
+                work=work,
+                url=link['url'],
+                title=link.get('title'),
+                description=link.get('description'),
+                added_by=link.get('added_by'),
+                added_at=self._parse_added_at(link.get('added_at'))
+            )
+            for link in links_data
+        ])
+    
     def create(self, validated_data):
         """Link eklerken kullanıcı bilgisini ekle"""
+        links_data = validated_data.pop('links', None)
+        
         request = self.context.get('request')
-        if request and validated_data.get('links'):
+        if request and links_data:
             user = request.user
             user_info = f"{user.get_full_name() or user.username} ({user.id})"
             timestamp = timezone.now().isoformat()
             
-            for link in validated_data['links']:
+            for link in links_data:
                 link['added_by'] = user_info
                 link['added_at'] = timestamp
         
-        return super().create(validated_data)
+        with transaction.atomic():
+            work = super().create(validated_data)
+            if links_data:
+                self._save_links(work, links_data)
+        
+        return work
     
     def validate(self, attrs):
         """İş mantığı ve yetki kontrolü"""
@@ -210,7 +305,99 @@ class WorkflowSerializer(serializers.ModelSerializer):
             validated_data['printing_controller'] = None
             validated_data['printing_control_date'] = None
         
-        return super().update(instance, validated_data)
+        links_data = validated_data.pop('links', None)
+        expected_version = validated_data.pop('expected_version', instance.version)
+        
+        with transaction.atomic():
+            if not instance.claim_version(expected_version):
+                raise PreconditionFailed()
+            
+            instance = super().update(instance, validated_data)
+            if links_data is not None:
+                self._save_links(instance, links_data)
+        
+        return instance
+
+
+def truncate_note(note, length):
+    """Notu liste için kısaltır, (not, kısaltıldı mı) döndürür"""
+    if note is None or len(note) <= length:
+        return note, False
+    return note[:length].rstrip() + '…', True
+
+
+class WorkflowListSerializer(WorkflowSerializer):
+    """
+    İş listesi (grid) için kompakt, salt okunur gösterim
+    Bağlantı listesi yerine bağlantı sayısı ve ilk bağlantı, tam not yerine kısaltılmış not döner;
+    böylece satır boyutu işin biriktirdiği bağlantı ve not miktarından bağımsızdır. Detay WorkflowSerializer'dadır.
+    """
+    
+    links = None
+    links_count = serializers.SerializerMethodField()
+    first_link = serializers.SerializerMethodField()
+    note = serializers.SerializerMethodField()
+    note_truncated = serializers.SerializerMethodField()
+    
+    # first_link zaten ilk bağlantıyı taşır
+    LEGACY_LINK_FIELDS = []
+    # ?fields=links / ?exclude=links gibi mevcut istekler özet alanlarla karşılanır
+    FIELD_ALIASES = {
+        'links': ['links_count', 'first_link'],
+        'link': ['first_link'],
+        'link_title': ['first_link'],
+    }
+    
+    # Arşivlenmiş işlerde özet alanlar link_data'dan hesaplanır (aktif işte bu kolon yoktur, atlanır)
+    FIELD_DEPENDENCIES = {
+        **WorkflowSerializer.FIELD_DEPENDENCIES,
+        'links_count': ['link_data'],
+        'first_link': ['link_data'],
+        'note_truncated': ['note'],
+    }
+    
+    @classmethod
+    def annotate_queryset(cls, queryset, fields=None):
+        """
+        Özet alanları veritabanında hesaplar: bağlantı sayısı ve ilk bağlantı alt sorgu ile,
+        not ise kısaltılmış haliyle okunur; bağlantılar ve tam not hiç yüklenmez
+        """
+        annotations = {}
+        if fields is None or {'links_count', 'first_link'} & set(fields):
+            links = Link.objects.filter(work=OuterRef('pk'))
+            annotations['links_count'] = Coalesce(
+                Subquery(links.order_by().values('work').annotate(count=Count('id')).values('count')), 0
+            )
+            first_link = links.order_by('added_at', 'id')
+            annotations['first_link_url'] = Subquery(first_link.values('url')[:1])
+            annotations['first_link_title'] = Subquery(first_link.values('title')[:1])
+        if fields is None or {'note', 'note_truncated'} & set(fields):
+            # Bir karakter fazlası okunur ki kısaltılıp kısaltılmadığı anlaşılsın
+            annotations['note_preview'] = Left('note', settings.WORKFLOW_LIST_NOTE_LENGTH + 1)
+        # Zaten hesaplanmış özetler tekrar eklenmez (view queryset'i ve hızlı serializer aynı fonksiyonu kullanır)
+        annotations = {name: value for name, value in annotations.items() if name not in queryset.query.annotations}
+        return queryset.annotate(**annotations).defer('note')
+    
+    def _note(self, obj):
+        note = obj.note_preview if hasattr(obj, 'note_preview') else obj.note
+        return truncate_note(note, settings.WORKFLOW_LIST_NOTE_LENGTH)
+    
+    def get_links_count(self, obj):
+        if hasattr(obj, 'links_count'):
+            return obj.links_count
+        return len(obj.links.all())
+    
+    def get_first_link(self, obj):
+        if hasattr(obj, 'first_link_url'):
+            return {'url': obj.first_link_url, 'title': obj.first_link_title} if obj.first_link_url else None
+        link = next(iter(obj.links.all()), None)
+        return {'url': link.url, 'title': link.title} if link else None
+    
+    def get_note(self, obj):
+        return self._note(obj)[0]
+    
+    def get_note_truncated(self, obj):
+        return self._note(obj)[1]
 
 
 class MovementSerializer(serializers.ModelSerializer):
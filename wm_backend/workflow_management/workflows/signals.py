@@ -0,0 +1,64 @@
+# workflows/signals.py
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .analytics import FACT_SOURCE_FIELDS, refresh_work_facts
+from .archive import is_archiving
+from .timeline import INTERVAL_SOURCE_FIELDS, refresh_work_intervals
+from .cache import bump_data_version
+from .dropdowns import bump_dropdown_version
+from .models import Work, Link, Category, WorkType, SalesChannel
+
+
+@receiver([post_save, post_delete], sender=Work)
+@receiver([post_save, post_delete], sender=Link)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=WorkType)
+@receiver([post_save, post_delete], sender=SalesChannel)
+def invalidate_work_list_cache(sender, **kwargs):
+    """
+    İş listesinde görünen veriler değiştiğinde liste cache'ini geçersiz kıl
+    Commit'ten önce artırılırsa aradaki istek eski satırları yeni versiyon anahtarıyla cache'ler
+    """
+    transaction.on_commit(bump_data_version)
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=WorkType)
+@receiver([post_save, post_delete], sender=SalesChannel)
+def invalidate_dropdowns(sender, **kwargs):
+    """Process'lerdeki dropdown kopyalarını yenilet (commit'ten önce yenilenirse eski veri okunabilir)"""
+    transaction.on_commit(bump_dropdown_version)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_work_list_cache_for_user(sender, update_fields=None, **kwargs):
+    """Tasarımcı/kontrolcü isimleri listede göründüğü için kullanıcı değişikliklerinde de geçersiz kıl"""
+    # Girişte sadece last_login güncellenir, listeyi etkilemez
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    transaction.on_commit(bump_data_version)
+
+
+@receiver(post_save, sender=Work)
+def update_stage_analytics(sender, instance, **kwargs):
+    """Aşama tarihleri değiştiyse süre kayıtlarını ve özet tablosunu güncelle"""
+    if instance.fields_changed(FACT_SOURCE_FIELDS):
+        refresh_work_facts(instance)
+
+
+@receiver(post_save, sender=Work)
+def update_stage_intervals(sender, instance, **kwargs):
+    """Aşama tarihleri ya da durum bayrakları değiştiyse takvim aralıklarını güncelle"""
+    if instance.fields_changed(INTERVAL_SOURCE_FIELDS):
+        refresh_work_intervals(instance)
+
+
+@receiver(pre_delete, sender=Work)
+def remove_stage_analytics(sender, instance, **kwargs):
+    """Silinen işin süreleri özet tablosundan düşülür; arşive taşınan işler analitikte kalır"""
+    if is_archiving():
+        return
+    refresh_work_facts(instance, deleted=True)
+    refresh_work_intervals(instance, deleted=True)
@@ -0,0 +1,162 @@
+# workflows/snapshots.py
+"""
+Hareket kayıtlarından işin geçmişteki halini yeniden oluşturma
+Her WORK_SNAPSHOT_INTERVAL güncellemede bir tam snapshot alınır; bir anın hali en yakın
+önceki snapshot'tan ileriye ('new' değerleri) ya da sonraki snapshot'tan geriye ('old' değerleri)
+replay ile bulunur, böylece replay edilen hareket sayısı aralıkla sınırlı kalır.
+Birleştirilmiş hareketler (bkz. audit_utils._merge_into_recent_update) son düzenlemenin anında uygulanmış
+sayılır: birleşen düzenlemelerin arasındaki anlar düzenlemeler öncesindeki hali gösterir, henüz yapılmamış
+bir düzenlemenin değerini değil.
+"""
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Coalesce
+from .audit_utils import serialize_value
+from .models import Work, Movement, WorkSnapshot
+
+# Hareket kayıtlarında tutulmayan alanlar (views._get_instance_data ile aynı)
+UNTRACKED_FIELDS = ['id', 'created', 'updated', 'version', 'legacy_links']
+
+
+def tracked_fields():
+    return [field for field in Work._meta.fields if field.name not in UNTRACKED_FIELDS]
+
+
+def snapshot_state(work):
+    """İşin güncel alan değerleri, hareket kayıtlarıyla aynı formatta"""
+    return {field.name: serialize_value(getattr(work, field.name)) for field in tracked_fields()}
+
+
+def applied_at():
+    """Hareketin işe uygulandığı an (birleştirilmiş hareketlerde son düzenleme, FieldChange.changed_at ile aynı)"""
+    return Coalesce('updated', 'created')
+
+
+def update_movements(work_id):
+    """Alan değişikliği içeren güncelleme hareketleri, uygulanma sırasıyla (applied_at alias'ı ile)"""
+    return Movement.objects.filter(
+        work_id=work_id, action='update', changes__isnull=False
+    ).alias(applied_at=applied_at()).order_by('applied_at', 'id')
+
+
+def take_snapshot(work, movement=None):
+    # Oluşturma snapshot'ı kaydın oluşturulduğu andan itibaren geçerlidir
+    taken_at = (movement.updated or movement.created) if movement and movement.action != 'create' else work.created
+    return WorkSnapshot.objects.create(
+        work=work,
+        movement=movement,
+        taken_at=taken_at,
+        data=snapshot_state(work)
+    )
+
+
+def record_new_works_snapshots(works, movement=None):
+    """
+    Toplu eklenen (sinyal ve hareket kaydı olmayan) işlerin oluşturma snapshot'larını tek seferde ekler
+    İlişkili kayıtlar alan başına tek sorguyla yüklenir, snapshot_state satır başına sorgu atmaz
+    """
+    for field in tracked_fields():
+        if not isinstance(field, models.ForeignKey):
+            continue
+        ids = {getattr(work, field.attname) for work in works} - {None}
+        related = field.related_model.objects.in_bulk(ids) if ids else {}
+        for work in works:
+            if getattr(work, field.attname) is not None:
+                field.set_cached_value(work, related.get(getattr(work, field.attname)))
+    
+    WorkSnapshot.objects.bulk_create([
+        WorkSnapshot(work=work, movement=movement, taken_at=work.created, data=snapshot_state(work))
+        for work in works
+    ], batch_size=1000)
+
+
+def record_checkpoint(work, movement):
+    """
+    Hareket loglandıktan sonra çağrılır
+    Oluşturmada ilk snapshot alınır, sonrasında son snapshot'tan beri aralık kadar güncelleme birikince
+    """
+    if movement.action == 'create':
+        take_snapshot(work, movement)
+        return
+    
+    # work_id da okunur, yoksa ilişki yöneticisi her satır için ayrı sorguyla yükler
+    last = work.snapshots.only('movement_id', 'work_id').first()
+    if last is not None:
+        pending = update_movements(work.id).filter(id__gt=last.movement_id or 0).count()
+        if pending < settings.WORK_SNAPSHOT_INTERVAL:
+            return
+    
+    take_snapshot(work, movement)
+
+
+def reconstruct(work, at):
+    """
+    İşin at anındaki halini döndürür: (alan değerleri, kullanılan snapshot, replay edilen hareket sayısı)
+    İş o anda henüz yoksa None döner
+    """
+    if at < work.created:
+        return None
+    
+    movements = update_movements(work.id).only('id', 'changes')
+    # Arşivlenmiş işler (ArchivedWork) için de çalışsın diye ilişki yerine id ile okunur
+    snapshots = WorkSnapshot.objects.filter(work_id=work.pk)
+    snapshot = snapshots.filter(taken_at__lte=at).first()
+    
+    if snapshot is not None:
+        # İleri replay: snapshot'tan sonraki, at anına kadarki hareketlerin yeni değerleri
+        state = dict(snapshot.data)
+        replay = movements.filter(applied_at__lte=at)
+        if snapshot.movement_id:
+            replay = replay.filter(id__gt=snapshot.movement_id)
+        else:
+            replay = replay.filter(applied_at__gt=snapshot.taken_at)
+        
+        replayed = 0
+        for movement in replay:
+            state.update(movement.changes.get('new', {}))
+            replayed += 1
+        return state, snapshot, replayed
+    
+    # Geri replay: at anından sonraki ilk snapshot'tan (yoksa güncel kayıttan) eski değerlere dönülür
+    snapshot = snapshots.filter(taken_at__gt=at).order_by('taken_at', 'id').first()
+    if snapshot is not None:
+        state = dict(snapshot.data)
+        replay = movements.filter(applied_at__gt=at)
+        if snapshot.movement_id:
+            replay = replay.filter(id__lte=snapshot.movement_id)
+    else:
+        state = snapshot_state(work)
+        replay = movements.filter(applied_at__gt=at)
+    
+    replayed = 0
+    for movement in replay.reverse():
+        state.update(movement.changes.get('old', {}))
+        replayed += 1
+    return state, snapshot, replayed
+
+
+def decode_state(state):
+    """Snapshot formatındaki değerleri API formatına çevirir (ilişkiler id + isim olarak)"""
+    data = {}
+    for field in tracked_fields():
+        value = state.get(field.name)
+        
+        if value is None:
+            data[field.name] = None
+            # İlişki boş olsa da isim alanı döner, yanıtın yapısı değere göre değişmez
+            if isinstance(field, models.ForeignKey):
+                data[f'{field.name}_name'] = None
+        elif isinstance(field, models.ForeignKey):
+            data[field.name] = value.get('id') if isinstance(value, dict) else value
+            data[f'{field.name}_name'] = value.get('display') if isinstance(value, dict) else None
+        elif isinstance(field, models.BooleanField):
+            data[field.name] = value in [True, 'True']
+        elif isinstance(field, models.FloatField):
+            try:
+                data[field.name] = float(value)
+            except (TypeError, ValueError):
+                data[field.name] = None
+        else:
+            data[field.name] = value
+    
+    return data
@@ -1,3 +1,1226 @@
-from django.test import TestCase
+# workflows/tests.py
+import csv
+import gzip
+import json
+from contextlib import ExitStack
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from datetime import date, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.renderers import ColumnarJSONRenderer
+from core.jobs import claim_next_job, enqueue, execute_job
+from core.testing import QueryBudgetTestCase, create_role, create_user
+from permissions.models import Role, UserRole, ColumnPermission
+from .analytics import rebuild_stage_analytics, stage_summary
+from .archive import archive_works
+from .audit_compaction import compact_audit
+from . import importers
+from .benchmarks import seed_works
+from .cache import bump_data_version, get_data_version
+from .fast_serializer import FastWorkflowSerializer
+from .models import (
+    Work, ArchivedWork, Link, Movement, FieldChange, Category, StageInterval, WorkSnapshot, StageDurationRollup, WorkStageFact
+)
+from .serializer import WorkflowSerializer, WorkflowListSerializer
+from .timeline import intervals_in_window
+from .views import WorkflowViewSet
+
+
+class FastWorkflowSerializerParityTest(TestCase):
+    """FastWorkflowSerializer çıktısı WorkflowSerializer ile (alan sırası dahil) aynı olmalı"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        seed_works(40, seed=7)
+        
+        # Sınır durumları: isimsiz kullanıcı, baskı kontrolü, boş alanlı bağlantı, pasif kategori, ilişkisiz iş
+        controller = User.objects.create_user('kontrol', email='')
+        passive = Category.objects.create(name='Pasif', is_active=False)
+        work = Work.objects.create(
+            name='Kontrol edilen', category=passive, printing_confirm=True, printing_control=True,
+            printing_controller=controller, printing_control_date=timezone.now(), price=12.5
+        )
+        Link.objects.create(work=work, url='https://example.com/a', title=None, added_by='test')
+        Link.objects.create(work=work, url='https://example.com/b', title='İkinci', description='Açıklama')
+        Work.objects.create(name='Boş iş')
+        Work.objects.create(name='Uzun notlu iş', note='Uzun not ' * 100)
+    
+    def assert_parity(self, fields=None, compact=False):
+        queryset = WorkflowViewSet.queryset.all()
+        if compact:
+            queryset = WorkflowListSerializer.annotate_queryset(queryset.prefetch_related(None), fields)
+            expected = WorkflowListSerializer(queryset, many=True, fields=fields).data
+        else:
+            expected = WorkflowSerializer(queryset, many=True, fields=fields).data
+        actual = FastWorkflowSerializer(fields=fields, compact=compact).serialize(queryset)
+        self.assertEqual(json.dumps(expected, ensure_ascii=False), json.dumps(actual, ensure_ascii=False))
+    
+    def test_all_fields(self):
+        self.assert_parity()
+    
+    def test_sparse_fields(self):
+        for fields in [
+            {'name'},
+            {'name', 'category_name', 'designer_name'},
+            {'status_code', 'links'},
+            {'link', 'link_title', 'printing_control_date'},
+            set(WorkflowSerializer.available_fields()) - {'note', 'links'},
+        ]:
+            with self.subTest(fields=sorted(fields)):
+                self.assert_parity(fields)
+    
+    def test_compact_fields(self):
+        for fields in [
+            None,
+            {'name', 'links_count'},
+            {'first_link', 'note_truncated'},
+            {'note', 'status_code', 'category_name'},
+        ]:
+            with self.subTest(fields=sorted(fields) if fields else None):
+                self.assert_parity(fields, compact=True)
+    
+    def test_list_endpoint_matches_serializer_path(self):
+        user = User.objects.create_user('okuyucu')
+        role = Role.objects.create(name='Okuyucu')
+        ColumnPermission.objects.filter(role=role, column_name__in=['price', 'note']).update(permission='none')
+        UserRole.objects.create(user=user, role=role)
+        
+        client = APIClient()
+        client.force_authenticate(user)
+        for query in ['', '?fields=name,category_name,price', '?exclude=links', '?view=full', '?view=full&exclude=links']:
+            with self.subTest(query=query):
+                # Liste cache'i iki yolun aynı yanıtı paylaşmasına izin vermesin
+                cache.clear()
+                with override_settings(WORKFLOW_FAST_SERIALIZER=False):
+                    expected = client.get(f'/api/workflows/{query}')
+                cache.clear()
+                fast = client.get(f'/api/workflows/{query}')
+                self.assertEqual(len(fast.json()['data']), Work.objects.count())
+                # json.dumps alan sırasını da karşılaştırır
+                self.assertEqual(json.dumps(expected.json()['data']), json.dumps(fast.json()['data']))
+
+
+class WorkflowQueryBudgetTest(QueryBudgetTestCase):
+    """workflows endpoint'lerinin sorgu ve yanıt boyutu bütçeleri (bkz. settings.QUERY_BUDGETS)"""
+    
+    # Satır sayısı bütçelerden büyük olmalı ki satır başına sorgu (N+1) bütçeyi aşsın
+    ROWS = 30
+    # Liste yanıtında iş başına izin verilen en fazla boyut
+    ROW_KB = 1.5
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work_ids = seed_works(cls.ROWS, seed=11)
+        cls.work = Work.objects.get(id=cls.work_ids[0])
+        Link.objects.create(work=cls.work, url='https://example.com/budget', title='Bütçe')
+    
+    def list_limit(self):
+        return Work.objects.count() * self.ROW_KB
+    
+    def test_work_list(self):
+        self.assert_budget_for_users('get', '/api/workflows/', max_response_kb=self.list_limit())
+        self.assert_budget_for_users('get', '/api/workflows/?fields=name,status_code,links')
+        self.assert_budget_for_users('get', '/api/async/workflows/', max_response_kb=self.list_limit())
+        self.assert_budget_for_users('get', '/api/workflows/?view=full', max_response_kb=self.list_limit())
+    
+    def test_compact_list_size(self):
+        # Liste satırı işin biriktirdiği bağlantı ve not miktarıyla büyümemeli, detay ise tamamını döndürmeli
+        client = self.client_for(self.users['superuser'])
+        
+        def list_size(query=''):
+            cache.clear()
+            return len(client.get(f'/api/workflows/{query}').content)
+        
+        before, full_before = list_size(), list_size('?view=full')
+        self.work.note = 'Uzun not ' * 500
+        self.work.save()
+        Link.objects.bulk_create([
+            Link(work=self.work, url=f'https://example.com/ek/{index}', title=f'Ek {index}', added_by='test')
+            for index in range(50)
+        ])
+        
+        self.assertLess(list_size() - before, 200)
+        self.assertGreater(list_size('?view=full') - full_before, 5000)
+        
+        row = next(work for work in client.get('/api/workflows/').json()['data'] if work['id'] == self.work.id)
+        first_link = self.work.links.first()
+        self.assertEqual(row['links_count'], self.work.links.count())
+        self.assertEqual(row['first_link'], {'url': first_link.url, 'title': first_link.title})
+        self.assertTrue(row['note_truncated'])
+        self.assertNotIn('links', row)
+        
+        detail = client.get(f'/api/workflows/{self.work.id}/').json()['data']
+        self.assertEqual(len(detail['links']), row['links_count'])
+        self.assertEqual(detail['note'], self.work.note)
+        
+        # Okuyucu not kolonunu göremez, bağlantı özetlerini görür
+        reader_row = self.client_for(self.users['reader']).get('/api/workflows/').json()['data'][0]
+        self.assertIn('links_count', reader_row)
+        self.assertNotIn('note', reader_row)
+        self.assertNotIn('note_truncated', reader_row)
+    
+    def test_work_detail(self):
+        self.assert_budget_for_users('get', f'/api/workflows/{self.work.id}/')
+        self.assert_budget_for_users('get', f'/api/async/workflows/{self.work.id}/')
+    
+    def test_work_write_cycle(self):
+        for name in ['superuser', 'editor']:
+            with self.subTest(user=name):
+                user = self.users[name]
+                response = self.request_with_budget('post', '/api/workflows/', user, status_code=201, data={
+                    'name': 'Bütçe işi', 'category': self.work.category_id, 'price': 100
+                })
+                work_id = response.json()['data']['id']
+                detail = f'/api/workflows/{work_id}/'
+                
+                self.request_with_budget('patch', detail, user, data={'note': 'Not', 'price': 150})
+                self.request_with_budget('patch', detail, user, data={'note': 'Birleşen not'})
+                self.request_with_budget('post', f'{detail}add_link/', user, data={
+                    'url': 'https://example.com/yeni', 'title': 'Yeni'
+                })
+                self.request_with_budget('post', f'{detail}remove_link/', user, data={'url': 'https://example.com/yeni'})
+                self.request_with_budget('delete', detail, user, status_code=204)
+    
+    def test_update_seeded_work(self):
+        # Tüm ilişkileri dolu iş: güncelleme sonrası ilişkiler satır satır okunmamalı
+        for name in ['superuser', 'editor']:
+            with self.subTest(user=name):
+                self.request_with_budget('patch', f'/api/workflows/{self.work_ids[1]}/', self.users[name], data={
+                    'note': f'{name} notu', 'price': 321
+                })
+    
+    def test_history_and_reports(self):
+        self.client_for(self.users['superuser']).patch(
+            f'/api/workflows/{self.work.id}/', {'note': 'Geçmiş'}, format='json'
+        )
+        users = ['superuser', 'editor', 'reader', 'mixed']
+        self.assert_budget_for_users('get', f'/api/workflows/{self.work.id}/as_of/?at={timezone.now().isoformat()}'.replace('+', '%2B'))
+        self.assert_budget_for_users('get', '/api/workflows/analytics/', users=users)
+        self.assert_budget_for_users('get', '/api/workflows/links_lookup/?url=https://example.com/budget', users=users)
+    
+    def test_field_changes(self):
+        client = self.client_for(self.users['editor'])
+        for work_id in self.work_ids[:12]:
+            client.patch(f'/api/workflows/{work_id}/', {'price': 999, 'note': 'Fiyat'}, format='json')
+        
+        ids = ','.join(str(work_id) for work_id in self.work_ids[:12])
+        response = self.request_with_budget(
+            'get', f'/api/workflows/field_changes/?field=price&work={ids}&since={timezone.now().date()}',
+            self.users['superuser']
+        )
+        self.assertEqual(response.json()['data']['count'], 12)
+        self.assert_budget_for_users('get', '/api/workflows/field_changes/?field=price', users=['editor', 'reader'], status_code=403)
+        
+        # Admin paneline erişen ama rolü kısıtlı kullanıcı sadece okuyabildiği alanları görür
+        staff = create_user('budget_staff', roles=[Role.objects.get(name='Bütçe Okuyucu')], is_staff=True)
+        self.request_with_budget('get', '/api/workflows/field_changes/?field=price', staff, status_code=403)
+        response = self.request_with_budget('get', f"/api/workflows/field_changes/?user={self.users['editor'].id}", staff)
+        self.assertEqual({change['field'] for change in response.json()['data']['results']}, set())
+    
+    def test_movements(self):
+        client = self.client_for(self.users['superuser'])
+        for work_id in self.work_ids[:10]:
+            client.patch(f'/api/workflows/{work_id}/', {'note': 'Hareket'}, format='json')
+        
+        self.assert_budget_for_users('get', '/api/movements/', users=['superuser'])
+        self.assert_budget_for_users('get', '/api/async/movements/', users=['superuser'])
+        self.assert_budget_for_users('get', '/api/movements/', users=['reader'], status_code=403)
+    
+    def test_bootstrap(self):
+        responses = self.assert_budget_for_users('get', '/api/bootstrap/', max_response_kb=self.list_limit() + 8)
+        
+        for name, response in responses.items():
+            with self.subTest(user=name):
+                data = response.json()['data']
+                client = self.client_for(self.users[name])
+                self.assertEqual(json.dumps(data['works']), json.dumps(client.get('/api/workflows/').json()['data']))
+                self.assertEqual(data['dropdowns']['categories'], client.get('/api/categories/').json()['data'])
+        
+        # Sıcak yolda sadece kimlik doğrulama ve yetki sorgusu kalır (liste cache'ten, dropdown'lar bellekten)
+        client = self.client_for(self.users['reader'])
+        client.get('/api/bootstrap/')
+        with self.assertNumQueries(2):
+            client.get('/api/bootstrap/')
+    
+    def test_timeline(self):
+        today = timezone.localdate()
+        client = self.client_for(self.users['editor'])
+        
+        def patch(work_id, **data):
+            response = client.patch(f'/api/workflows/{work_id}/', {
+                field: value.isoformat() if hasattr(value, 'isoformat') else value for field, value in data.items()
+            }, format='json')
+            self.assertEqual(response.status_code, 200, response.content[:300])
+        
+        # Pencereyle kesişen kısa, uzun ve açık aralıklar; pencere dışı eski geçmiş; geciken baskı
+        designing, long_printing, open_design, history, late = self.work_ids[2:7]
+        patch(designing, design_start_date=today - timedelta(days=2), design_end_date=today + timedelta(days=1),
+              printing_confirm=False, stock_entry=False)
+        patch(long_printing, printing_start_date=today - timedelta(days=200), printing_end_date=today + timedelta(days=3),
+              stock_entry=False)
+        patch(open_design, design_start_date=today - timedelta(days=400), design_end_date=None,
+              printing_confirm=False, stock_entry=False)
+        patch(history, design_start_date=today - timedelta(days=300), design_end_date=today - timedelta(days=290))
+        patch(late, printing_start_date=today - timedelta(days=10), printing_end_date=today - timedelta(days=4),
+              printing_control=False, stock_entry=False)
+        self.assertEqual(StageInterval.objects.get(work_id=long_printing, stage='printing').span_days, 203)
+        
+        url = f'/api/workflows/calendar/?since={today}&until={today + timedelta(days=6)}'
+        responses = self.assert_budget_for_users('get', url, users=['superuser', 'editor', 'reader', 'mixed'])
+        data = responses['superuser'].json()['data']
+        days = {day['date']: day for day in data['days']}
+        self.assertEqual(len(days), 7)
+        self.assertIn(designing, days[str(today + timedelta(days=1))]['design'])
+        self.assertNotIn(designing, days[str(today + timedelta(days=2))]['design'])
+        self.assertIn(long_printing, days[str(today + timedelta(days=3))]['printing'])
+        self.assertIn(open_design, days[str(today + timedelta(days=6))]['design'])
+        self.assertFalse(any(history in day['design'] for day in data['days']))
+        self.assertNotIn(late, days[str(today)]['printing'])
+        
+        # Baskı kolonlarını okuyamayan okuyucu aşamayı isteyemez, isimleri göremez
+        self.request_with_budget('get', f'{url}&stage=printing', self.users['no_role'], status_code=403)
+        self.request_with_budget('get', '/api/workflows/calendar/?since=2026-01-10&until=2026-01-01',
+                                 self.users['editor'], status_code=400)
+        
+        responses = self.assert_budget_for_users('get', '/api/workflows/overdue/?stage=printing,design',
+                                                 users=['superuser', 'editor'])
+        data = responses['editor'].json()['data']
+        due_day = next(day for day in data['days'] if day['date'] == str(today - timedelta(days=4)))
+        self.assertIn(late, due_day['printing'])
+        late_work = next(work for work in data['works'] if work['id'] == late)
+        self.assertEqual(late_work['stages']['printing']['overdue_days'], 4)
+        self.assertNotIn(open_design, {work['id'] for work in data['works']})
+        
+        # Aşama tamamlanınca gecikmeden düşer
+        patch(late, printing_control=True)
+        data = client.get('/api/workflows/overdue/?stage=printing').json()['data']
+        self.assertNotIn(late, {work['id'] for work in data['works']})
+    
+    def test_timeline_long_intervals_bounded_by_window(self):
+        today = timezone.localdate()
+        # Pencereden önce bitmiş uzun aralıklar (geçmiş) sonuca girmez ve indekste taranmaz
+        StageInterval.objects.bulk_create([
+            StageInterval(work_id=self.work.id, stage=f'eski-{index}', start_date=today - timedelta(days=400 + index),
+                          end_date=today - timedelta(days=100 + index), span_days=300)
+            for index in range(20)
+        ] + [
+            StageInterval(work_id=self.work.id, stage='uzun', start_date=today - timedelta(days=90),
+                          end_date=today + timedelta(days=2), span_days=92)
+        ])
+        stages = ['uzun'] + [f'eski-{index}' for index in range(20)]
+        with CaptureQueriesContext(connection) as queries:
+            rows = intervals_in_window(today, today + timedelta(days=6), stages)
+        self.assertEqual([row[1] for row in rows], ['uzun'])
+        
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn('stage_interval_long_idx (end_date>?)', plan)
+    
+    def test_dropdowns(self):
+        for path in ['categories', 'work-types', 'sales-channels']:
+            self.assert_budget_for_users('get', f'/api/{path}/', max_response_kb=4)
+            self.assert_budget_for_users('get', f'/api/async/{path}/', max_response_kb=4)
+
+
+class SparseFieldsetTest(QueryBudgetTestCase):
+    """?fields= / ?exclude=: sadece istenen alanlar döner, geçersiz alan 400, yetkisiz kolonlar çıkarılır"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work = Work.objects.create(name='Seçmeli iş', price=15, note='Uzun not')
+        Link.objects.create(work=cls.work, url='https://example.com/secmeli')
+    
+    def get(self, url, user='editor'):
+        response = self.client_for(self.users[user]).get(url)
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        return response.json()['data']
+    
+    def test_fields_on_list_and_detail(self):
+        self.assertEqual(self.get('/api/workflows/?fields=name,price'), [{'id': self.work.id, 'name': 'Seçmeli iş', 'price': 15.0}])
+        self.assertEqual(self.get(f'/api/workflows/{self.work.id}/?fields=name,status_code'), {
+            'id': self.work.id, 'name': 'Seçmeli iş', 'status_code': 'waiting'
+        })
+        # Kompakt listede links takma adı özet alanlara açılır
+        self.assertEqual(set(self.get('/api/workflows/?fields=links')[0]), {'id', 'links_count', 'first_link'})
+    
+    def test_exclude(self):
+        row = self.get('/api/workflows/?view=full&exclude=note,links')[0]
+        self.assertNotIn('note', row)
+        self.assertNotIn('links', row)
+        self.assertEqual(row['price'], 15.0)
+    
+    def test_unknown_field_is_rejected(self):
+        for query in ['?fields=name,yok', '?exclude=yok']:
+            response = self.client_for(self.users['editor']).get(f'/api/workflows/{query}')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('yok', response.json()['errors']['field_errors']['fields'][0])
+    
+    def test_unreadable_columns_are_dropped(self):
+        self.assertEqual(self.get('/api/workflows/?fields=name,price,note', user='reader'), [{'id': self.work.id, 'name': 'Seçmeli iş'}])
+        self.assertEqual(self.get(f'/api/workflows/{self.work.id}/?fields=price', user='reader'), {'id': self.work.id})
+
+
+class ColumnarFormatTest(QueryBudgetTestCase):
+    """?format=columnar: kolonlar ve sözlükler çözüldüğünde standart liste yanıtıyla aynı satırlar elde edilir"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        seed_works(20, seed=9)
+    
+    def decode(self, data):
+        """Kolon bazlı yanıtı satırlara geri açar"""
+        dictionaries = data['dictionaries']
+        rows = []
+        for index in range(data['row_count']):
+            row = {name: values[index] for name, values in data['columns'].items()}
+            for column, (detail_field, name_field) in ColumnarJSONRenderer.DICTIONARY_COLUMNS.items():
+                entry = dictionaries.get(column, {}).get(str(row.get(column)))
+                if entry:
+                    row[name_field] = entry['name']
+                    if 'detail' in entry:
+                        row[detail_field] = entry['detail']
+            if 'status_code' in row:
+                status = dictionaries['status'][row['status_code']]
+                row['status_text'], row['status_color'] = status['text'], status['color']
+            rows.append(row)
+        return rows
+    
+    def without_nulls(self, row):
+        return {key: value for key, value in row.items() if value is not None}
+    
+    def test_round_trip(self):
+        for user in ['editor', 'reader']:
+            client = self.client_for(self.users[user])
+            for query in ['', 'view=full&']:
+                with self.subTest(user=user, query=query):
+                    expected = client.get(f'/api/workflows/?{query}').json()['data']
+                    response = client.get(f'/api/workflows/?{query}format=columnar')
+                    self.assertEqual(response.status_code, 200)
+                    data = response.json()['data']
+                    self.assertEqual(data['row_count'], len(expected))
+                    # Boş ilişkilerin detay/isim alanları sözlükte yer almaz, karşılaştırmada None değerler atlanır
+                    self.assertEqual(
+                        [self.without_nulls(row) for row in self.decode(data)],
+                        [self.without_nulls(row) for row in expected]
+                    )
+    
+    def test_accept_header_and_non_list_responses(self):
+        client = self.client_for(self.users['editor'])
+        response = client.get('/api/workflows/?fields=name', HTTP_ACCEPT=ColumnarJSONRenderer.media_type)
+        self.assertEqual(set(response.json()['data']['columns']), {'id', 'name'})
+        
+        work_id = Work.objects.values_list('id', flat=True).first()
+        detail = client.get(f'/api/workflows/{work_id}/?format=columnar').json()['data']
+        self.assertEqual(detail['id'], work_id)
+
+
+class AdminChangelistTest(QueryBudgetTestCase):
+    """İş ve hareket admin listelerinin sorgu sayısı kayıt sayısından bağımsızdır"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work = Work.objects.create(name='Admin işi')
+        Link.objects.create(work=cls.work, url='https://example.com/admin/1')
+        Link.objects.create(work=cls.work, url='https://example.com/admin/2')
+        Movement.objects.create(user=cls.users['editor'], user_fullname='budget_editor', work=cls.work,
+                                work_name='Admin işi', action='update', description='Güncellendi')
+        Movement.objects.create(user=cls.users['reader'], user_fullname='budget_reader', action='create',
+                                work_name='Başka iş', description='Oluşturuldu')
+    
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.users['superuser'])
+    
+    def get_changelist(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+    
+    def test_work_changelist(self):
+        response, small = self.get_changelist('/admin/workflows/work/')
+        self.assertContains(response, '2 bağlantı')
+        seed_works(40, seed=3)
+        _, large = self.get_changelist('/admin/workflows/work/')
+        self.assertEqual(large, small)
+    
+    def test_movement_changelist_filters(self):
+        response, _ = self.get_changelist(f"/admin/workflows/movement/?user__id__exact={self.users['editor'].id}")
+        self.assertContains(response, 'Admin işi')
+        self.assertNotContains(response, 'Başka iş')
+        
+        response, small = self.get_changelist('/admin/workflows/movement/?q=Baş')
+        self.assertContains(response, 'Başka iş')
+        self.assertNotContains(response, 'Admin işi')
+        
+        Movement.objects.bulk_create([
+            Movement(user=self.users['reader'], user_fullname='budget_reader', action='create', work_name=f'Başka iş {index}')
+            for index in range(40)
+        ])
+        _, large = self.get_changelist('/admin/workflows/movement/?q=Baş')
+        self.assertEqual(large, small)
+
+
+class FieldChangesTest(QueryBudgetTestCase):
+    """field_changes: sadece admin; kısıtlı rollü admin okuyamadığı alanları ve iş adını görmez"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work = Work.objects.create(name='Gizli isimli iş', price=10)
+    
+    def setUp(self):
+        super().setUp()
+        client = self.client_for(self.users['superuser'])
+        client.patch(f'/api/workflows/{self.work.id}/', {'price': 20, 'printing_location': 'Atölye'}, format='json')
+    
+    def changes(self, user, query=None, status_code=200):
+        response = self.client_for(user).get('/api/workflows/field_changes/', {'work': self.work.id, **(query or {})})
+        self.assertEqual(response.status_code, status_code)
+        return response.json()['data']['results'] if status_code == 200 else None
+    
+    def test_requires_admin(self):
+        for user in ['editor', 'reader', 'no_role']:
+            self.changes(self.users[user], status_code=403)
+        results = self.changes(self.users['superuser'])
+        self.assertEqual({change['field'] for change in results}, {'price', 'printing_location'})
+        self.assertEqual(results[0]['work_name'], 'Gizli isimli iş')
+        self.assertEqual(results[0]['user_id'], self.users['superuser'].id)
+    
+    def test_staff_sees_only_readable_columns(self):
+        role = create_role('Kısıtlı Admin', columns={'name': 'none', 'price': 'none'})
+        staff = create_user('kisitli_admin', roles=[role], is_staff=True)
+        
+        [change] = self.changes(staff)
+        self.assertEqual((change['field'], change['new_value']), ('printing_location', 'Atölye'))
+        self.assertNotIn('work_name', change)
+        self.changes(staff, {'field': 'price'}, status_code=403)
+
+
+class LinkTest(QueryBudgetTestCase):
+    """Link tablosu: bağlantı araması ve eski JSON alanından taşıma"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work = Work.objects.create(name='Bağlantılı iş')
+        Link.objects.create(work=cls.work, url='https://example.com/ortak', title='Ortak')
+    
+    def test_links_lookup_hides_name_without_permission(self):
+        url = '/api/workflows/links_lookup/?url=https://example.com/ortak&url=https://example.com/yok'
+        results = self.client_for(self.users['reader']).get(url).json()['data']['results']
+        self.assertEqual(results['https://example.com/ortak'], [{'work_id': self.work.id, 'work_name': 'Bağlantılı iş'}])
+        self.assertEqual(results['https://example.com/yok'], [])
+        
+        nameless = create_user('isimsiz', roles=[create_role('İsimsiz', columns={'name': 'none'})])
+        results = self.client_for(nameless).get(url).json()['data']['results']
+        self.assertEqual(results['https://example.com/ortak'], [{'work_id': self.work.id}])
+    
+    def test_migrate_links_round_trip(self):
+        added_at = timezone.now() - timedelta(days=3)
+        legacy = [
+            {'url': 'https://example.com/eski/1', 'title': 'Bir', 'description': 'Açıklama', 'added_by': 'ali',
+             'added_at': added_at.isoformat()},
+            {'url': 'https://example.com/eski/2'},
+            {'url': 'bağlantı değil'},
+        ]
+        work = Work.objects.create(name='Eski bağlantılı iş', legacy_links=legacy)
+        
+        call_command('migrate_links', stdout=StringIO(), stderr=StringIO())
+        work.refresh_from_db()
+        self.assertEqual(work.legacy_links, [])
+        links = list(work.links.values('url', 'title', 'description', 'added_by', 'added_at'))
+        self.assertEqual(links, [
+            {'url': 'https://example.com/eski/1', 'title': 'Bir', 'description': 'Açıklama', 'added_by': 'ali',
+             'added_at': added_at},
+            {'url': 'https://example.com/eski/2', 'title': None, 'description': None, 'added_by': None,
+             'added_at': work.created},
+        ])
+        # Bağlantısı taşınan işler tekrar çalıştırmada atlanır
+        Work.objects.filter(id=work.id).update(legacy_links=legacy)
+        call_command('migrate_links', '--keep-legacy', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(work.links.count(), 2)
+        
+        # API eski JSON ile aynı bağlantıları (geçersiz olan hariç) döndürür
+        data = self.client_for(self.users['superuser']).get(f'/api/workflows/{work.id}/').json()['data']
+        self.assertEqual([link['url'] for link in data['links']], [link['url'] for link in legacy[:2]])
+        self.assertEqual(data['links'][0]['title'], 'Bir')
+        self.assertEqual(data['links'][0]['added_by'], 'ali')
+
+
+class ConcurrencyTest(QueryBudgetTestCase):
+    """If-Match / version ile iyimser eşzamanlılık kontrolü"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work = Work.objects.create(name='Eşzamanlı iş', price=10)
+        Link.objects.create(work=cls.work, url='https://example.com/mevcut', title='Mevcut')
+    
+    def setUp(self):
+        super().setUp()
+        self.api = self.client_for(self.users['editor'])
+        self.detail = f'/api/workflows/{self.work.id}/'
+    
+    def etag(self):
+        return self.api.get(self.detail)['ETag']
+    
+    def patch(self, etag, **data):
+        return self.api.patch(self.detail, data, format='json', HTTP_IF_MATCH=etag)
+    
+    def test_stale_if_match_returns_current(self):
+        etag = self.etag()
+        self.assertEqual(etag, f'"{self.work.version}"')
+        response = self.patch(etag, name='İlk düzenleme')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        
+        response = self.patch(etag, name='Çakışan düzenleme')
+        self.assertEqual(response.status_code, 412)
+        body = response.json()
+        self.assertFalse(body['success'])
+        self.assertEqual(body['data']['name'], 'İlk düzenleme')
+        self.assertEqual(response['ETag'], self.etag())
+        self.assertEqual(Work.objects.get(id=self.work.id).name, 'İlk düzenleme')
+    
+    def test_if_match_forms(self):
+        etag = self.etag()
+        self.assertEqual(self.patch(f'W/{etag}, "999"', price=11).status_code, 200)
+        self.assertEqual(self.patch('*', price=12).status_code, 200)
+        self.assertEqual(self.patch('"abc"', price=13).status_code, 412)
+    
+    def test_stale_body_version_returns_412(self):
+        version = Work.objects.get(id=self.work.id).version
+        response = self.api.patch(self.detail, {'price': 30, 'version': version - 1}, format='json')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.json()['data']['price'], 10)
+        
+        response = self.api.patch(self.detail, {'price': 30, 'version': version}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Work.objects.get(id=self.work.id).version, version + 1)
+    
+    def test_link_changes_invalidate_etag(self):
+        etag = self.etag()
+        response = self.api.post(f'{self.detail}add_link/', {'url': 'https://example.com/yeni'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.patch(etag, price=20).status_code, 412)
+        
+        etag = response['ETag']
+        response = self.api.post(f'{self.detail}remove_link/', {'url': 'https://example.com/yeni'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([link['url'] for link in response.json()['data']['links']], ['https://example.com/mevcut'])
+        self.assertEqual(self.patch(etag, price=20).status_code, 412)
+        self.assertEqual(self.patch(response['ETag'], price=20).status_code, 200)
+    
+    def test_stale_link_change_is_rejected(self):
+        etag = self.etag()
+        self.patch(etag, price=20)
+        response = self.api.post(f'{self.detail}add_link/', {'url': 'https://example.com/eski'}, format='json',
+                                    HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertFalse(Link.objects.filter(url='https://example.com/eski').exists())
+        
+        response = self.api.post(f'{self.detail}remove_link/', {'url': 'https://example.com/mevcut'},
+                                    format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertTrue(Link.objects.filter(url='https://example.com/mevcut').exists())
+    
+    def test_missing_link_keeps_version(self):
+        etag = self.etag()
+        response = self.api.post(f'{self.detail}remove_link/', {'url': 'https://example.com/yok'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.etag(), etag)
+    
+    def test_restore_invalidates_etag(self):
+        etag = self.etag()
+        Work.objects.filter(id=self.work.id).update(stock_entry=True, updated=timezone.now() - timedelta(days=1))
+        self.assertEqual(archive_works(days=0), 1)
+        
+        response = self.client_for(self.users['superuser']).post(f'{self.detail}restore/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.patch(etag, price=20).status_code, 412)
+        self.assertEqual(self.patch(response['ETag'], price=20).status_code, 200)
+
+
+class WorkListCacheTest(QueryBudgetTestCase):
+    """Liste yanıtı aynı okunabilir kolon setine sahip kullanıcılar arasında paylaşılır, yazmada geçersizleşir"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work_ids = seed_works(30, seed=5)
+        reader_role = Role.objects.get(name='Bütçe Okuyucu')
+        cls.other_reader = create_user('ikinci_okuyucu', roles=[reader_role])
+    
+    def get_list(self, user, **extra):
+        return self.client_for(user).get('/api/workflows/', **extra)
+    
+    def test_shared_between_same_permissions(self):
+        first = self.get_list(self.users['reader'])
+        second = self.get_list(self.other_reader)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+        
+        # Farklı kolon yetkisi farklı kayıt kullanır
+        editor = self.get_list(self.users['editor'])
+        self.assertEqual(editor['X-Cache'], 'MISS')
+        self.assertIn('price', editor.json()['data'][0])
+        self.assertNotIn('price', second.json()['data'][0])
+    
+    def test_invalidated_by_writes(self):
+        self.get_list(self.users['editor'])
+        self.assertEqual(self.get_list(self.users['editor'])['X-Cache'], 'HIT')
+        
+        work = Work.objects.get(id=self.work_ids[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client_for(self.users['editor']).patch(f'/api/workflows/{work.id}/', {'name': 'Önbellek sonrası'}, format='json')
+        response = self.get_list(self.users['editor'])
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Önbellek sonrası', {row['name'] for row in response.json()['data']})
+        
+        # Listede tasarımcı/kontrolcü adları göründüğü için kullanıcı değişikliği de geçersiz kılar
+        self.assertEqual(self.get_list(self.users['editor'])['X-Cache'], 'HIT')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_reader.first_name = 'Yeni Ad'
+            self.other_reader.save()
+        self.assertEqual(self.get_list(self.users['editor'])['X-Cache'], 'MISS')
+    
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_pinned_writer_skips_replica_entries(self):
+        # Gecikmeli replikadan güncel versiyon anahtarıyla üretilmiş yanıtlar (test veritabanı tek olduğu için
+        # replika okuması taklit edilir, versiyon sabit tutulur)
+        def from_replica():
+            stack = ExitStack()
+            stack.enter_context(mock.patch('core.middleware.random.choice', return_value='default'))
+            stack.enter_context(mock.patch('workflows.cache.reads_from_replica', return_value=True))
+            return stack
+        
+        work_id = self.work_ids[0]
+        writer = self.client_for(self.users['editor'])
+        with mock.patch('workflows.cache.get_data_version', return_value=1):
+            with from_replica():
+                self.assertEqual(self.get_list(self.users['editor'])['X-Cache'], 'MISS')
+                self.assertEqual(self.client_for(self.users['editor']).get('/api/bootstrap/').status_code, 200)
+            
+            with self.captureOnCommitCallbacks(execute=True):
+                response = writer.patch(f'/api/workflows/{work_id}/', {'name': 'Yazan okur'}, format='json')
+            self.assertEqual(response.status_code, 200)
+            
+            # Yazan istemci primary'ye sabitlenmiştir, replikadan üretilmiş kayıtları almaz
+            response = writer.get('/api/workflows/')
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertIn('Yazan okur', {row['name'] for row in response.json()['data']})
+            works = writer.get('/api/bootstrap/').json()['data']['works']
+            self.assertIn('Yazan okur', {row['name'] for row in works})
+            
+            # Replikadan okuyanlar kendi aralarında paylaşmaya devam eder
+            with from_replica():
+                self.assertEqual(self.get_list(self.other_reader)['X-Cache'], 'MISS')
+                self.assertEqual(self.get_list(self.users['reader'])['X-Cache'], 'HIT')
+    
+    def test_version_bumped_after_commit(self):
+        # Commit'ten önce artan versiyonla eski satırlar yeni anahtara cache'lenebilirdi
+        version = get_data_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            Work.objects.filter(id=self.work_ids[0]).get().save()
+            self.assertEqual(get_data_version(), version)
+        self.assertIn(bump_data_version, callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_data_version(), version)
+    
+    def test_gzip(self):
+        plain = self.get_list(self.users['reader'])
+        compressed = self.get_list(self.users['reader'], HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+
+@override_settings(MOVEMENT_COALESCE_WINDOW=0, WORK_SNAPSHOT_INTERVAL=2)
+class AsOfTest(QueryBudgetTestCase):
+    """as_of: hareket ve snapshot'lardan yeniden oluşturulan hal, o anda kaydedilmiş hal ile aynıdır"""
+    
+    def as_of(self, work_id, at, status_code=200):
+        response = self.client_for(self.users['editor']).get(
+            f'/api/workflows/{work_id}/as_of/', {'at': at.isoformat() if hasattr(at, 'isoformat') else at}
+        )
+        self.assertEqual(response.status_code, status_code, response.content[:300])
+        return response.json()['data']
+    
+    def test_replay_matches_recorded_states(self):
+        client = self.client_for(self.users['editor'])
+        category = Category.objects.create(name='Geçmiş kategori')
+        response = client.post('/api/workflows/', {'name': 'Sürüm 0', 'price': 10}, format='json')
+        work_id = response.json()['data']['id']
+        
+        edits = [
+            {'price': 20},
+            {'note': 'Birinci not', 'category': category.id},
+            {'price': 40, 'printing_confirm': True},
+            {'name': 'Sürüm 4', 'note': None},
+            {'price': 60},
+        ]
+        states = [(timezone.now(), client.get(f'/api/workflows/{work_id}/').json()['data'])]
+        for edit in edits:
+            self.assertEqual(client.patch(f'/api/workflows/{work_id}/', edit, format='json').status_code, 200)
+            states.append((timezone.now(), client.get(f'/api/workflows/{work_id}/').json()['data']))
+        # Aralık 2 olduğu için ara snapshot'lar alınır; son hal oluşturma snapshot'ından değil ara snapshot'tan replay edilir
+        self.assertGreater(WorkSnapshot.objects.filter(work_id=work_id).count(), 1)
+        latest = self.as_of(work_id, states[-1][0])
+        self.assertLess(latest['replayed_movements'], len(edits))
+        
+        for index, (at, expected) in enumerate(states):
+            with self.subTest(state=index):
+                work = self.as_of(work_id, at)['work']
+                for field in ['name', 'price', 'note', 'category', 'printing_confirm']:
+                    self.assertEqual(work[field], expected[field], field)
+                self.assertEqual(work['category_name'], expected.get('category_name'))
+    
+    @override_settings(MOVEMENT_COALESCE_WINDOW=60)
+    def test_merged_edits_apply_at_last_edit(self):
+        client = self.client_for(self.users['editor'])
+        work_id = client.post('/api/workflows/', {'name': 'Birleşen geçmiş', 'price': 10}, format='json').json()['data']['id']
+        self.assertEqual(client.patch(f'/api/workflows/{work_id}/', {'price': 20}, format='json').status_code, 200)
+        between = timezone.now()
+        self.assertEqual(client.patch(f'/api/workflows/{work_id}/', {'price': 30}, format='json').status_code, 200)
+        after = timezone.now()
+        
+        [movement] = Movement.objects.filter(work_id=work_id, action='update')
+        self.assertLess(movement.created, between)
+        self.assertGreater(movement.updated, between)
+        # İki düzenlemenin arası henüz yapılmamış son değeri değil, birleşen düzenlemeler öncesini gösterir
+        self.assertEqual(self.as_of(work_id, between)['work']['price'], 10.0)
+        self.assertEqual(self.as_of(work_id, after)['work']['price'], 30.0)
+        
+        # Alan geçmişi de aynı anı kullanır
+        [change] = FieldChange.objects.filter(work_id=work_id)
+        self.assertEqual((change.changed_at, change.old_value, change.new_value), (movement.updated, '10.0', '30.0'))
+    
+    def test_invalid_and_early_dates(self):
+        work = Work.objects.create(name='Yeni iş')
+        self.as_of(work.id, work.created - timedelta(days=1), status_code=404)
+        self.as_of(work.id, 'dün', status_code=400)
+
+
+@override_settings(MOVEMENT_COALESCE_WINDOW=0, WORK_SNAPSHOT_INTERVAL=100, AUDIT_RETENTION_DAYS=365)
+class AuditCompactionTest(QueryBudgetTestCase):
+    """compact_audit: eski güncelleme hareketleri silinir, sınırdan sonraki geçmiş sorguları değişmez"""
+    
+    def setUp(self):
+        super().setUp()
+        client = self.client_for(self.users['editor'])
+        self.work_id = client.post('/api/workflows/', {'name': 'Denetlenen iş', 'price': 10}, format='json').json()['data']['id']
+        
+        # Fiyat 400, 380 ve 10 gün önce değişmiş olsun
+        now = timezone.now()
+        self.times = {days: now - timedelta(days=days) for days in [500, 400, 390, 380, 100, 10, 5]}
+        Work.objects.filter(pk=self.work_id).update(created=self.times[500])
+        WorkSnapshot.objects.filter(work_id=self.work_id).update(taken_at=self.times[500])
+        Movement.objects.filter(work_id=self.work_id).update(created=self.times[500])
+        for price, days in [(20, 400), (30, 380), (40, 10)]:
+            self.assertEqual(client.patch(f'/api/workflows/{self.work_id}/', {'price': price}, format='json').status_code, 200)
+            movement = Movement.objects.filter(work_id=self.work_id, action='update').latest('id')
+            Movement.objects.filter(pk=movement.pk).update(created=self.times[days])
+            FieldChange.objects.filter(movement=movement).update(changed_at=self.times[days])
+    
+    def price_at(self, days):
+        response = self.client_for(self.users['editor']).get(
+            f'/api/workflows/{self.work_id}/as_of/', {'at': self.times[days].isoformat()}
+        )
+        return response.json()['data']['work']['price']
+    
+    def test_compaction_keeps_recent_history(self):
+        self.assertEqual([self.price_at(days) for days in [390, 100, 5]], [20, 30, 40])
+        
+        job = enqueue('workflows.compact_audit')
+        self.assertEqual(execute_job(claim_next_job()), 'succeeded')
+        job.refresh_from_db()
+        self.assertEqual(job.result, {'movements': 2, 'field_changes': 2})
+        
+        self.assertEqual(
+            list(Movement.objects.filter(work_id=self.work_id).order_by('id').values_list('action', flat=True)),
+            ['create', 'update']
+        )
+        self.assertEqual(list(FieldChange.objects.filter(work_id=self.work_id).values_list('new_value', flat=True)), ['40.0'])
+        # Sınırdan sonraki anlar aynı, öncesi en yakın snapshot (oluşturma) kadar ayrıntılı
+        self.assertEqual([self.price_at(days) for days in [390, 100, 5]], [10, 30, 40])
+        
+        # İkinci çalıştırma silecek bir şey bulmaz
+        call_command('compact_audit', stdout=StringIO())
+        self.assertEqual(Movement.objects.filter(work_id=self.work_id).count(), 2)
+    
+    def test_merged_movement_across_cutoff_is_kept(self):
+        # 380 gün önce başlayıp 100 gün önceki düzenlemeyle birleşmiş hareket sınırdan sonra uygulanmıştır
+        Movement.objects.filter(work_id=self.work_id, created=self.times[380]).update(updated=self.times[100])
+        self.assertEqual(self.price_at(390), 20)
+        self.assertEqual(compact_audit(), (1, 1))
+        
+        self.assertTrue(Movement.objects.filter(work_id=self.work_id, created=self.times[380]).exists())
+        self.assertEqual(WorkSnapshot.objects.filter(work_id=self.work_id).first().data['price'], '20.0')
+        self.assertEqual([self.price_at(days) for days in [100, 5]], [30, 40])
+    
+    def test_archived_works_are_compacted(self):
+        Work.objects.filter(pk=self.work_id).update(stock_entry=True, updated=self.times[5])
+        self.assertEqual(archive_works(days=1), 1)
+        call_command('compact_audit', stdout=StringIO())
+        
+        self.assertFalse(Movement.objects.filter(work_id=self.work_id, created__lt=self.times[390]).exclude(action='create').exists())
+        snapshot = WorkSnapshot.objects.filter(work_id=self.work_id).first()
+        self.assertEqual(snapshot.data['price'], '30.0')
+
+
+@override_settings(MOVEMENT_COALESCE_WINDOW=60, WORK_SNAPSHOT_INTERVAL=100)
+class MovementCoalescingTest(QueryBudgetTestCase):
+    """Aynı kullanıcının pencere içindeki ardışık güncellemeleri tek harekette birleşir"""
+    
+    def setUp(self):
+        super().setUp()
+        self.editor = self.client_for(self.users['editor'])
+        self.work_id = self.editor.post('/api/workflows/', {'name': 'Birleşen iş', 'price': 10}, format='json').json()['data']['id']
+    
+    def patch(self, data, client=None):
+        response = (client or self.editor).patch(f'/api/workflows/{self.work_id}/', data, format='json')
+        self.assertEqual(response.status_code, 200, response.content[:300])
+    
+    def updates(self):
+        return list(Movement.objects.filter(work_id=self.work_id, action='update').order_by('id'))
+    
+    def test_edits_inside_window_merge(self):
+        self.patch({'price': 20})
+        self.patch({'note': 'İlk not'})
+        self.patch({'price': 30})
+        
+        [movement] = self.updates()
+        self.assertEqual(movement.changes, {'old': {'price': '10.0', 'note': None}, 'new': {'price': '30.0', 'note': 'İlk not'}})
+        self.assertEqual(
+            sorted(FieldChange.objects.filter(movement=movement).values_list('field', 'old_value', 'new_value')),
+            [('note', None, 'İlk not'), ('price', '10.0', '30.0')]
+        )
+        
+        # İlk değerine dönen alan hareketten düşer
+        self.patch({'price': 10})
+        [movement] = self.updates()
+        self.assertEqual(movement.changes, {'old': {'note': None}, 'new': {'note': 'İlk not'}})
+        self.assertEqual(list(FieldChange.objects.filter(movement=movement).values_list('field', flat=True)), ['note'])
+    
+    def test_edits_outside_window_are_separate(self):
+        self.patch({'price': 20})
+        past = timezone.now() - timedelta(seconds=120)
+        Movement.objects.filter(work_id=self.work_id).update(created=past, updated=past)
+        self.patch({'price': 30})
+        
+        self.assertEqual([movement.changes['new'] for movement in self.updates()], [{'price': '20.0'}, {'price': '30.0'}])
+    
+    def test_other_user_breaks_the_chain(self):
+        self.patch({'price': 20})
+        self.patch({'price': 25}, client=self.client_for(self.users['superuser']))
+        self.patch({'price': 30})
+        
+        self.assertEqual(
+            [(movement.user_id, movement.changes['new']['price']) for movement in self.updates()],
+            [(self.users['editor'].id, '20.0'), (self.users['superuser'].id, '25.0'), (self.users['editor'].id, '30.0')]
+        )
+    
+    @override_settings(MOVEMENT_COALESCE_WINDOW=0)
+    def test_disabled(self):
+        self.patch({'price': 20})
+        self.patch({'price': 30})
+        self.assertEqual(len(self.updates()), 2)
+
+
+class StageAnalyticsTest(QueryBudgetTestCase):
+    """Aşama süre özetleri: artımlı güncellenen histogram tam yeniden hesaplamayla aynıdır"""
+    
+    DESIGN_DAYS = [1, 2, 3, 4, 10]
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.end = date(2026, 3, 20)
+        cls.works = [
+            Work.objects.create(
+                name=f'Analitik {days}', design_start_date=cls.end - timedelta(days=days), design_end_date=cls.end
+            )
+            for days in cls.DESIGN_DAYS
+        ]
+    
+    def rollup_rows(self):
+        return set(StageDurationRollup.objects.values_list(
+            'stage', 'dimension', 'dimension_id', 'period', 'period_start', 'duration_days', 'count'
+        ))
+    
+    def design_summary(self):
+        (row,) = stage_summary('design', 'all', 'month', start=self.end, end=self.end)
+        return row
+    
+    def test_summary_statistics(self):
+        row = self.design_summary()
+        self.assertEqual(row['period_start'], '2026-03-01')
+        self.assertEqual(
+            (row['count'], row['avg_days'], row['min_days'], row['max_days'], row['p50_days'], row['p90_days']),
+            (5, 4.0, 1, 10, 3, 10)
+        )
+    
+    def test_edits_and_deletes_are_incremental(self):
+        work = self.works[-1]
+        work.design_start_date = self.end - timedelta(days=5)
+        work.save()
+        self.assertEqual(self.design_summary()['max_days'], 5)
+        
+        self.works[0].delete()
+        row = self.design_summary()
+        self.assertEqual((row['count'], row['min_days']), (4, 2))
+    
+    def test_unrelated_edits_skip_refresh(self):
+        derived_tables = [StageInterval._meta.db_table, WorkStageFact._meta.db_table, StageDurationRollup._meta.db_table]
+        
+        def touched_tables(**changes):
+            work = Work.objects.get(id=self.works[0].id)
+            for field, value in changes.items():
+                setattr(work, field, value)
+            with CaptureQueriesContext(connection) as queries:
+                work.save()
+            return {table for table in derived_tables for query in queries if table in query['sql']}
+        
+        self.assertEqual(touched_tables(price=10, note='Sadece not'), set())
+        self.assertEqual(touched_tables(design_end_date=self.end + timedelta(days=2)), set(derived_tables))
+        self.assertEqual(StageInterval.objects.get(work_id=self.works[0].id, stage='design').end_date,
+                         self.end + timedelta(days=2))
+        
+        # Aynı nesnede ilk değere geri dönmek de (kaydedilen hale göre) değişikliktir
+        work = Work.objects.get(id=self.works[0].id)
+        work.design_end_date = self.end
+        work.save()
+        work.design_end_date = self.end + timedelta(days=2)
+        work.save()
+        self.assertEqual(WorkStageFact.objects.get(work_id=work.id, stage='design').end_date, self.end + timedelta(days=2))
+        # Yüklenmeden oluşturulan nesnelerde karşılaştırma yapılamaz, yenileme her zaman çalışır
+        self.assertTrue(Work(id=self.works[0].id).fields_changed(['price']))
+    
+    def test_incremental_matches_rebuild(self):
+        seed_works(60, seed=9)
+        rebuild_stage_analytics()
+        for work in Work.objects.filter(design_end_date__isnull=False).order_by('id')[:10]:
+            work.design_end_date += timedelta(days=3)
+            work.shipping_date = work.design_end_date + timedelta(days=20)
+            work.save()
+        Work.objects.filter(design_end_date__isnull=False).order_by('-id').first().delete()
+        
+        incremental = self.rollup_rows()
+        rebuild_stage_analytics()
+        self.assertEqual(incremental, self.rollup_rows())
+    
+    def test_rebuild_keeps_archived_works(self):
+        Work.objects.filter(id__in=[work.id for work in self.works[:2]]).update(
+            stock_entry=True, updated=timezone.now() - timedelta(days=1)
+        )
+        self.assertEqual(archive_works(days=0), 2)
+        before = self.rollup_rows()
+        self.assertEqual(self.design_summary()['count'], len(self.DESIGN_DAYS))
+        
+        rebuild_stage_analytics()
+        self.assertEqual(self.rollup_rows(), before)
+        self.assertEqual(WorkStageFact.objects.filter(work_id=self.works[0].id).count(), 1)
+        
+        # Kısmi yeniden hesaplama da arşivlenmiş işi bulur
+        rebuild_stage_analytics(work_ids=[self.works[0].id])
+        self.assertEqual(self.rollup_rows(), before)
+    
+    def test_endpoint_requires_stage_columns(self):
+        client = self.client_for(self.users['reader'])
+        data = client.get('/api/workflows/analytics/?stage=design&start=2026-03-01&end=2026-03-31').json()['data']
+        self.assertEqual(data['results'][0]['count'], len(self.DESIGN_DAYS))
+        # Okuyucu tasarımcı kolonunu göremez
+        self.assertEqual(client.get('/api/workflows/analytics/?stage=design&group_by=designer').status_code, 403)
+        self.assertEqual(client.get('/api/workflows/analytics/?stage=yok').status_code, 400)
+
+
+class ArchiveTest(QueryBudgetTestCase):
+    """Arşive taşıma ve geri alma: iş aynı id, alanlar, bağlantılar ve geçmişle geri gelir"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.work = Work.objects.create(
+            name='Arşivlenecek iş', note='Not', price=42.5, stock_entry=True,
+            design_start_date=date(2026, 2, 2), design_end_date=date(2026, 2, 6)
+        )
+        Link.objects.create(work=cls.work, url='https://example.com/arsiv/1', title='Bir', added_by='ali')
+        Link.objects.create(work=cls.work, url='https://example.com/arsiv/2')
+        Work.objects.filter(pk=cls.work.pk).update(updated=timezone.now() - timedelta(days=1))
+        cls.work.refresh_from_db()
+    
+    def link_rows(self, work_id):
+        return list(Link.objects.filter(work_id=work_id).values_list('url', 'title', 'added_by'))
+    
+    def test_archive_and_restore_round_trip(self):
+        links = self.link_rows(self.work.id)
+        intervals = list(StageInterval.objects.filter(work_id=self.work.id).values_list('stage', 'start_date', 'end_date'))
+        self.assertEqual(archive_works(days=0), 1)
+        
+        self.assertFalse(Work.objects.filter(pk=self.work.pk).exists())
+        archived = ArchivedWork.objects.get(pk=self.work.pk)
+        self.assertEqual([link['url'] for link in archived.link_data], [url for url, _, _ in links])
+        # Aralıklar ve analitik kayıtları arşivlemede silinmez
+        self.assertEqual(
+            list(StageInterval.objects.filter(work_id=self.work.id).values_list('stage', 'start_date', 'end_date')),
+            intervals
+        )
+        self.assertTrue(WorkStageFact.objects.filter(work_id=self.work.id).exists())
+        
+        client = self.client_for(self.users['editor'])
+        ids = [work['id'] for work in client.get('/api/workflows/').json()['data']]
+        self.assertNotIn(self.work.id, ids)
+        data = client.get(f'/api/workflows/{self.work.id}/?include_archived=true').json()['data']
+        self.assertEqual(data['name'], 'Arşivlenecek iş')
+        
+        response = client.post(f'/api/workflows/{self.work.id}/restore/')
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        self.assertEqual(response.json()['data']['work']['id'], self.work.id)
+        self.assertEqual(response['ETag'], f'"{self.work.version + 1}"')
+        
+        restored = Work.objects.get(pk=self.work.pk)
+        for field in ['name', 'note', 'price', 'stock_entry', 'design_start_date', 'design_end_date', 'created', 'updated']:
+            self.assertEqual(getattr(restored, field), getattr(self.work, field), field)
+        self.assertEqual(self.link_rows(self.work.id), links)
+        self.assertFalse(ArchivedWork.objects.filter(pk=self.work.pk).exists())
+        self.assertTrue(Movement.objects.filter(work_id=self.work.id, action='restore').exists())
+        self.assertTrue(WorkStageFact.objects.filter(work_id=self.work.id).exists())
+    
+    def test_restore_requires_create_permission(self):
+        archive_works(days=0)
+        response = self.client_for(self.users['reader']).post(f'/api/workflows/{self.work.id}/restore/')
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(ArchivedWork.objects.filter(pk=self.work.pk).exists())
+
+
+class WorkImportTest(QueryBudgetTestCase):
+    """CSV / JSON / NDJSON toplu aktarımı: geçerli satırlar eklenir, hatalı satırlar satır numarasıyla raporlanır"""
+    
+    RECORDS = [
+        {'name': 'Aktarılan 1', 'category': 'aktarım kategorisi', 'price': '12,5', 'design_start_date': '2026-01-05',
+         'design_end_date': '2026-01-08', 'links': 'https://example.com/a|https://example.com/b'},
+        {'name': 'Aktarılan 2', 'note': 'İki\nsatırlı not', 'printing_confirm': 'evet'},
+        {'name': 'Hatalı tarih', 'design_start_date': '05.01.2026'},
+        {'name': '', 'category': 'olmayan'},
+        {'name': 'Aktarılan 3', 'designer': 'budget_editor', 'stock_entry': 'x'},
+    ]
+    
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Category.objects.create(name='Aktarım Kategorisi')
+    
+    def upload(self, name, content, user=None, **data):
+        return self.client_for(user or self.users['editor']).post('/api/workflows/import/', {
+            'file': SimpleUploadedFile(name, content.encode()), **data
+        }, format='multipart')
+    
+    def as_csv(self):
+        columns = ['name', 'category', 'price', 'design_start_date', 'design_end_date', 'links', 'note',
+                   'printing_confirm', 'designer', 'stock_entry']
+        stream = StringIO()
+        writer = csv.DictWriter(stream, columns)
+        writer.writeheader()
+        writer.writerows(self.RECORDS)
+        return stream.getvalue()
+    
+    def assert_imported(self, response, error_rows):
+        self.assertEqual(response.status_code, 201, response.content[:500])
+        data = response.json()['data']
+        self.assertEqual((data['created'], data['failed']), (3, 2))
+        self.assertEqual([error['row'] for error in data['row_errors']], error_rows)
+        self.assertIn('design_start_date', data['row_errors'][0]['errors'])
+        self.assertEqual(set(data['row_errors'][1]['errors']), {'name', 'category'})
+        
+        work = Work.objects.get(name='Aktarılan 1')
+        self.assertEqual(work.price, 12.5)
+        self.assertEqual(work.category.name, 'Aktarım Kategorisi')
+        self.assertEqual(list(work.links.values_list('url', flat=True)), ['https://example.com/a', 'https://example.com/b'])
+        self.assertEqual(Work.objects.get(name='Aktarılan 2').note, 'İki\nsatırlı not')
+        self.assertEqual(Work.objects.get(name='Aktarılan 3').designer, self.users['editor'])
+        # Sinyal tetiklenmeyen toplu eklemede analitik ve takvim kayıtları da oluşur
+        self.assertTrue(WorkStageFact.objects.filter(work=work, stage='design', duration_days=3).exists())
+        self.assertTrue(StageInterval.objects.filter(work_id=work.id, stage='design').exists())
+        return data
+    
+    def test_csv_in_batches(self):
+        # CSV'de satır numarası dosyadaki fiziksel satırdır (başlık 1. satır, 2. kaydın notu iki satır)
+        data = self.assert_imported(self.upload('isler.csv', self.as_csv(), batch_size=2), error_rows=[5, 6])
+        self.assertEqual(data['batches'], 2)
+    
+    def test_json_and_ndjson(self):
+        # Küçük okuma parçalarıyla kayıtların parça sınırlarında bölünmesi de denenir
+        original = importers.READ_CHUNK_SIZE
+        importers.READ_CHUNK_SIZE = 7
+        try:
+            self.assert_imported(self.upload('isler.json', json.dumps(self.RECORDS, ensure_ascii=False)), error_rows=[3, 4])
+        finally:
+            importers.READ_CHUNK_SIZE = original
+        
+        Work.objects.filter(name__startswith='Aktarılan').delete()
+        lines = '\n'.join(json.dumps(record, ensure_ascii=False) for record in self.RECORDS) + '\n{bozuk\n'
+        data = self.upload('isler.ndjson', lines).json()['data']
+        self.assertEqual((data['created'], data['failed']), (3, 3))
+        self.assertEqual([error['row'] for error in data['row_errors']], [3, 4, len(self.RECORDS) + 1])
+    
+    @override_settings(MOVEMENT_COALESCE_WINDOW=0)
+    def test_imported_works_have_history_baseline(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.upload('isler.csv', self.as_csv(), batch_size=10)
+        snapshot_queries = [query for query in queries if WorkSnapshot._meta.db_table in query['sql']]
+        # İş başına değil batch başına tek ekleme
+        self.assertEqual(len(snapshot_queries), 1)
+        
+        work = Work.objects.get(name='Aktarılan 1')
+        [snapshot] = WorkSnapshot.objects.filter(work_id=work.id)
+        self.assertEqual(snapshot.movement.description.split(':')[0], 'isler.csv dosyasından toplu aktarım')
+        self.assertEqual(snapshot.data['category'], {'id': work.category_id, 'display': 'Aktarım Kategorisi'})
+        
+        client = self.client_for(self.users['editor'])
+        imported_at = timezone.now()
+        self.assertEqual(client.patch(f'/api/workflows/{work.id}/', {'price': 99, 'category': None}, format='json').status_code, 200)
+        
+        def as_of(at):
+            return client.get(f'/api/workflows/{work.id}/as_of/', {'at': at.isoformat()}).json()['data']
+        
+        # Aktarılan hal güncel kayıttan geriye değil oluşturma snapshot'ından okunur
+        past = as_of(imported_at)
+        self.assertEqual((past['work']['price'], past['work']['category_name']), (12.5, 'Aktarım Kategorisi'))
+        self.assertEqual((past['snapshot_taken_at'], past['replayed_movements']), (work.created.isoformat(), 0))
+        self.assertEqual(as_of(timezone.now())['work']['price'], 99.0)
+    
+    def test_malformed_file(self):
+        response = self.upload('isler.json', '{"name": "dizi değil"}')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['data'], None)
+    
+    def test_permissions(self):
+        self.assertEqual(self.upload('isler.csv', self.as_csv(), user=self.users['reader']).status_code, 403)
+        
+        role = create_role('Fiyatsız aktarım', columns={'price': 'read'}, default='write', system={'work_create': True})
+        user = create_user('fiyatsiz', roles=[role])
+        data = self.upload('isler.csv', self.as_csv(), user=user).json()['data']
+        # Fiyat girilen satır yetki hatası alır, diğerleri eklenir
+        self.assertEqual(data['created'], 2)
+        self.assertIn('permission', data['row_errors'][0]['errors'])
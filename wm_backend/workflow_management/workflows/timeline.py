@@ -0,0 +1,195 @@
+# workflows/timeline.py
+"""
+Üretim aşamaları takvimi ve geciken işler
+Her işin aşama aralıkları StageInterval'da tutulur; iş kaydedildikçe sadece o işin satırları yenilenir.
+Pencere sorgusu başlangıç indeksinde pencere + SHORT_SPAN günlük aralığı, uzun aralıkları pencereden sonra
+bitenlerin, açık aralıkları kendi kısmi indekslerinden okur; gecikme sorgusu sadece tamamlanmamış aralıkların kısmi indeksini okur. İkisi de
+saklanan geçmişin uzunluğundan bağımsızdır.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from .models import Work, ArchivedWork, StageInterval
+
+# Aşama: (başlangıç alanı, bitiş alanı, görünen ad, dolu olduğunda aşamayı tamamlanmış sayan alanlar)
+# Paketleme ve sevkiyat tek tarihlidir; stok girişi yapılmış işin tüm aşamaları tamamlanmıştır
+TIMELINE_STAGES = {
+    'design': ('design_start_date', 'design_end_date', 'Tasarım', ['confirm_date', 'printing_confirm']),
+    'printing': ('printing_start_date', 'printing_end_date', 'Baskı', ['printing_control', 'packaging_date']),
+    'packaging': ('packaging_date', 'packaging_date', 'Paketleme', ['shipping_date']),
+    'shipping': ('shipping_date', 'shipping_date', 'Sevkiyat', []),
+}
+
+INTERVAL_COLUMNS = ['work_id', 'stage', 'start_date', 'end_date', 'is_open', 'is_done']
+
+# Aralıkların okuduğu iş alanları (bunlar değişmeyen kayıtlarda aralıklar yenilenmez)
+INTERVAL_SOURCE_FIELDS = ['stock_entry'] + sorted({
+    field for start_field, end_field, _, done_fields in TIMELINE_STAGES.values()
+    for field in [start_field, end_field, *done_fields]
+})
+
+
+def compute_work_intervals(work):
+    """İşin takvim aralıkları: {stage: (başlangıç, bitiş, açık mı, tamamlandı mı)}"""
+    intervals = {}
+    for stage, (start_field, end_field, _, done_fields) in TIMELINE_STAGES.items():
+        start, end = getattr(work, start_field), getattr(work, end_field)
+        is_done = bool(work.stock_entry or any(getattr(work, field) for field in done_fields))
+        # Sadece bitiş (teslim) tarihi girilmişse aralık o gündür
+        start = start or end
+        if start is None:
+            continue
+        # Bitişi başlangıçtan önce olan hatalı kayıtlar ve bitişi bilinmeyen tamamlanmış aşamalar takvime alınmaz
+        if (end is not None and end < start) or (end is None and is_done):
+            continue
+        intervals[stage] = (start, end, end is None, is_done)
+    return intervals
+
+
+def _build_intervals(work_id, intervals):
+    return [
+        StageInterval(
+            work_id=work_id, stage=stage, start_date=start, end_date=end,
+            span_days=(end - start).days if end else 0, is_open=is_open, is_done=is_done
+        )
+        for stage, (start, end, is_open, is_done) in intervals.items()
+    ]
+
+
+def refresh_work_intervals(work, deleted=False):
+    """
+    İşin takvim aralıklarını günceller (sadece değişen aşamalar yeniden yazılır)
+    Tarihlere dokunmayan kayıtlarda tek okuma sorgusu çalışır, transaction sadece yazılacaksa açılır
+    (işin kaydedildiği transaction içindeyse ayrı savepoint açılmaz)
+    """
+    old_intervals = {
+        row[1]: tuple(row[2:])
+        for row in StageInterval.objects.filter(work_id=work.pk).values_list(*INTERVAL_COLUMNS)
+    }
+    new_intervals = {} if deleted else compute_work_intervals(work)
+    if old_intervals == new_intervals:
+        return
+    
+    changed = [
+        stage for stage in old_intervals.keys() | new_intervals.keys()
+        if old_intervals.get(stage) != new_intervals.get(stage)
+    ]
+    with transaction.atomic(savepoint=False):
+        StageInterval.objects.filter(work_id=work.pk, stage__in=changed).delete()
+        StageInterval.objects.bulk_create(_build_intervals(
+            work.pk, {stage: interval for stage, interval in new_intervals.items() if stage in changed}
+        ))
+
+
+def record_new_works_intervals(works):
+    """Toplu eklenen (henüz aralık kaydı olmayan) işlerin aralıklarını tek seferde ekler"""
+    intervals = [
+        interval for work in works
+        for interval in _build_intervals(work.pk, compute_work_intervals(work))
+    ]
+    StageInterval.objects.bulk_create(intervals, batch_size=1000)
+
+
+def rebuild_stage_intervals(batch_size=2000):
+    """Aktif ve arşivlenmiş işlerin tüm takvim aralıklarını yeniden hesaplar, yazılan satır sayısını döndürür"""
+    fields = ['id', *INTERVAL_SOURCE_FIELDS]
+    written = 0
+    with transaction.atomic():
+        StageInterval.objects.all().delete()
+        for model in [Work, ArchivedWork]:
+            batch = []
+            for work in model.objects.only(*fields).order_by().iterator(chunk_size=batch_size):
+                batch.extend(_build_intervals(work.pk, compute_work_intervals(work)))
+                if len(batch) >= batch_size:
+                    written += len(StageInterval.objects.bulk_create(batch))
+                    batch = []
+            written += len(StageInterval.objects.bulk_create(batch))
+    return written
+
+
+def intervals_in_window(since, until, stages):
+    """
+    [since, until] penceresiyle kesişen aralıklar (başlangıca göre sıralı INTERVAL_COLUMNS tuple'ları)
+    Kısa aralıklar since - SHORT_SPAN'dan sonra başlamış olmak zorundadır; bu sayede başlangıç indeksinde
+    sadece pencere kadar bir aralık okunur. Uzun aralıklar bitişe göre kısmi indeksten (since'tan sonra
+    bitenler), açık aralıklar kendi indeksinden eklenir.
+    """
+    short_span = settings.WORKFLOW_TIMELINE_SHORT_SPAN_DAYS
+    intervals = StageInterval.objects.filter(stage__in=stages).order_by()
+    
+    short = intervals.filter(
+        start_date__gte=since - timedelta(days=short_span), start_date__lte=until,
+        end_date__gte=since, span_days__lte=short_span, is_open=False
+    )
+    # span_days koşulu stage_interval_long_idx'in koşuluyla aynı olmalı ki kısmi indeks kullanılabilsin
+    long = intervals.filter(span_days__gt=short_span, end_date__gte=since, start_date__lte=until)
+    ongoing = intervals.filter(is_open=True, start_date__lte=until)
+    
+    rows = short.values_list(*INTERVAL_COLUMNS).union(
+        long.values_list(*INTERVAL_COLUMNS), ongoing.values_list(*INTERVAL_COLUMNS), all=True
+    )
+    return sorted(rows, key=lambda row: (row[2], row[0], row[1]))
+
+
+def overdue_intervals(today, stages):
+    """Bitiş tarihi geçtiği halde tamamlanmamış aralıklar (bitişe göre sıralı INTERVAL_COLUMNS tuple'ları)"""
+    return list(
+        StageInterval.objects.filter(is_done=False, end_date__lt=today, stage__in=stages)
+        .order_by('end_date', 'work_id', 'stage').values_list(*INTERVAL_COLUMNS)
+    )
+
+
+def group_by_day(intervals, since, until, stages):
+    """Pencerenin her günü için o gün aşamada olan işlerin id'leri: [{'date', stage: [id, ...]}]"""
+    days = {since + timedelta(days=offset): {stage: [] for stage in stages} for offset in range((until - since).days + 1)}
+    for work_id, stage, start, end, is_open, _ in intervals:
+        # Açık aralık (bitişi girilmemiş) pencere sonuna kadar sürüyor kabul edilir
+        day, last = max(start, since), until if is_open else min(end, until)
+        while day <= last:
+            days[day][stage].append(work_id)
+            day += timedelta(days=1)
+    return [{'date': day.isoformat(), **stage_works} for day, stage_works in days.items()]
+
+
+def group_by_due_day(intervals, stages):
+    """Geciken aralıkları bitiş gününe göre gruplar (sadece kaydı olan günler)"""
+    days = {}
+    for work_id, stage, _, end, _, _ in intervals:
+        days.setdefault(end, {name: [] for name in stages})[stage].append(work_id)
+    return [{'date': day.isoformat(), **stage_works} for day, stage_works in days.items()]
+
+
+def describe_works(intervals, include_name, today):
+    """Aralıklardaki işlerin özeti ve aşama aralıkları (arşivlenmiş işler dahil), id sırasıyla"""
+    work_ids = {row[0] for row in intervals}
+    columns = ['id', 'stock_entry', 'printing_confirm'] + (['name'] if include_name else [])
+    rows = {work['id']: work for work in Work.objects.filter(id__in=work_ids).values(*columns)}
+    missing = work_ids - rows.keys()
+    if missing:
+        rows.update((work['id'], work) for work in ArchivedWork.objects.filter(id__in=missing).values(*columns))
+    
+    works = {}
+    for work_id, stage, start, end, is_open, is_done in intervals:
+        row = rows.get(work_id)
+        if row is None:
+            continue
+        if work_id not in works:
+            status = Work.status_for(row['stock_entry'], row['printing_confirm'])
+            works[work_id] = {
+                'id': work_id,
+                **({'name': row['name']} if include_name else {}),
+                'status_code': status['code'],
+                'status_text': status['text'],
+                'status_color': status['color'],
+                'stages': {}
+            }
+        overdue = not is_done and end is not None and end < today
+        works[work_id]['stages'][stage] = {
+            'start': start.isoformat(),
+            'end': end.isoformat() if end else None,
+            'open': is_open,
+            'done': is_done,
+            'overdue_days': (today - end).days if overdue else 0,
+        }
+    return [works[work_id] for work_id in sorted(works)]
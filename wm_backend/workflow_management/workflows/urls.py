@@ -1,7 +1,9 @@
 # urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from workflows.views import WorkflowViewSet, MovementViewSet, CategoryViewSet, WorkTypeViewSet, SalesChannelViewSet
+from workflows.views import (
+    WorkflowViewSet, MovementViewSet, CategoryViewSet, WorkTypeViewSet, SalesChannelViewSet, bootstrap
+)
 
 router = DefaultRouter()
 router.register('workflows', WorkflowViewSet)
@@ -11,5 +13,7 @@ router.register('work-types', WorkTypeViewSet)
 router.register('sales-channels', SalesChannelViewSet)
 
 urlpatterns = [
+    # Dashboard açılışındaki liste, dropdown ve yetki isteklerinin tek istekte karşılığı
+    path('bootstrap/', bootstrap, name='bootstrap'),
     path('', include(router.urls))
 ]
\ No newline at end of file
@@ -1,17 +1,46 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.parsers import MultiPartParser
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+import csv
 from django.core.validators import URLValidator
-from django.core.exceptions import ValidationError as DjangoValidationError
-from workflows.models import Work, Movement, Category, WorkType, SalesChannel
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from workflows.models import (
+    Work, ArchivedWork, Link, Movement, FieldChange, WorkSnapshot, Category, WorkType, SalesChannel
+)
 from workflows.serializer import (
-    WorkflowSerializer, MovementSerializer, 
+    WorkflowSerializer, WorkflowListSerializer, MovementSerializer, 
     CategorySerializer, WorkTypeSerializer, SalesChannelSerializer
 )
-from .audit_utils import log_work_action
+from .audit_utils import display_serialized, log_work_action
+from .cache import build_cache_key, cached_data, cached_response, render_content
+from .dropdowns import get_dropdowns
+from .fast_serializer import FastWorkflowSerializer
+from .snapshots import reconstruct, decode_state
+from .analytics import STAGES, DIMENSIONS, PERIODS, stage_summary
+from .timeline import (
+    TIMELINE_STAGES, intervals_in_window, overdue_intervals, group_by_day, group_by_due_day, describe_works
+)
+from .importers import SUPPORTED_FORMATS, WorkImporter, detect_format, iter_records
+from .archive import restore_work
+from authentication.serializers import UserSerializer
 from permissions.utils import PermissionChecker
+from permissions.views import build_system_permissions_payload, build_work_permissions_payload
+from core.coalescing import get_flight
+from core.exceptions import PreconditionFailed
+from core.renderers import ColumnarJSONRenderer
 
 
 class BaseDropdownViewSet(viewsets.ModelViewSet):
@@ -45,9 +74,12 @@ class SalesChannelViewSet(BaseDropdownViewSet):
 
 class WorkflowViewSet(viewsets.ModelViewSet):
     """İş akışı yönetimi"""
-    queryset = Work.objects.all()
+    queryset = Work.objects.select_related(
+        'category', 'type', 'sales_channel', 'designer', 'printing_controller'
+    ).prefetch_related('links')
     serializer_class = WorkflowSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
     
     def _filter_by_permissions(self, data, user):
         """Yetki bazlı filtreleme"""
@@ -60,10 +92,49 @@ class WorkflowViewSet(viewsets.ModelViewSet):
         data = {}
         for field in instance._meta.fields:
             field_name = field.name
-            if field_name not in ['id', 'created', 'updated']:
+            if field_name not in ['id', 'created', 'updated', 'version', 'legacy_links']:
                 data[field_name] = getattr(instance, field_name)
         return data
 
+    def _get_expected_version(self, request, instance):
+        """
+        Güncellemenin hangi versiyon üzerine yapıldığını belirler
+        If-Match: "3" başlığı, yoksa gövdedeki version alanı, o da yoksa okunan kaydın versiyonu
+        """
+        if_match = request.headers.get('If-Match')
+        if if_match:
+            if if_match.strip() == '*':
+                return instance.version
+            
+            versions = set()
+            for tag in if_match.split(','):
+                tag = tag.strip()
+                if tag.startswith('W/'):
+                    tag = tag[2:]
+                tag = tag.strip('"')
+                if tag.isdigit():
+                    versions.add(int(tag))
+            
+            # Hiçbir etiket eşleşmiyorsa güncelleme çakışma ile sonuçlanır
+            return instance.version if instance.version in versions else 0
+        
+        version = request.data.get('version')
+        if version is not None:
+            try:
+                return int(version)
+            except (TypeError, ValueError):
+                return 0
+        
+        return instance.version
+    
+    def _precondition_failed(self, request, message):
+        """412 yanıtı: güncel kaydı döndürür, istemci kendi değişikliğini yeniden uygulayabilsin"""
+        current = self.get_object()
+        current_data = self._filter_by_permissions(self.get_serializer(current).data, request.user)
+        return Response({'message': message, 'current': current_data},
+                      status=status.HTTP_412_PRECONDITION_FAILED,
+                      headers={'ETag': current.etag})
+    
     @action(detail=True, methods=['post'])
     def add_link(self, request, pk=None):
         """Tek bir link ekleme"""
@@ -87,14 +158,22 @@ class WorkflowViewSet(viewsets.ModelViewSet):
             return Response({'message': 'Geçerli bir URL giriniz'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        # Link ekle
-        current_links = work.links or []
-        link_data['added_by'] = f"{request.user.get_full_name() or request.user.username} ({request.user.id})"
-        link_data['added_at'] = timezone.now().isoformat()
+        # Link ekle - tek satır insert; bağlantı değişikliği de işin versiyonunu artırır
+        expected_version = self._get_expected_version(request, work)
+        try:
+            with transaction.atomic():
+                if not work.claim_version(expected_version):
+                    raise PreconditionFailed()
+                new_link = Link.objects.create(
+                    work=work,
+                    added_by=f"{request.user.get_full_name() or request.user.username} ({request.user.id})",
+                    **link_data
+                )
+        except PreconditionFailed as exc:
+            return self._precondition_failed(request, str(exc.detail))
         
-        current_links.append(link_data)
-        work.links = current_links
-        work.save()
+        # Versiyon alındıysa okunan bağlantılar günceldir, liste tekrar sorgulanmaz
+        current_links = [link.to_dict() for link in work.links.all()] + [new_link.to_dict()]
         
         # Log
         log_work_action(
@@ -105,7 +184,7 @@ class WorkflowViewSet(viewsets.ModelViewSet):
             new_data={'links_count': len(current_links)}
         )
         
-        return Response({'message': 'Bağlantı eklendi', 'links': work.links})
+        return Response({'message': 'Bağlantı eklendi', 'links': current_links}, headers={'ETag': work.etag})
     
     @action(detail=True, methods=['post'])
     def remove_link(self, request, pk=None):
@@ -121,47 +200,547 @@ class WorkflowViewSet(viewsets.ModelViewSet):
             return Response({'message': 'Silinecek bağlantı URL\'si gerekli'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        current_links = work.links or []
-        new_links = [link for link in current_links if link.get('url') != url_to_remove]
-        
-        if len(new_links) == len(current_links):
+        # Link sil - tek sorgu ile delete; silinecek bağlantı yoksa versiyon artmaz
+        expected_version = self._get_expected_version(request, work)
+        try:
+            with transaction.atomic():
+                if not work.claim_version(expected_version):
+                    raise PreconditionFailed()
+                deleted_count, _ = Link.objects.filter(work=work, url=url_to_remove).delete()
+                if not deleted_count:
+                    raise Link.DoesNotExist()
+        except PreconditionFailed as exc:
+            return self._precondition_failed(request, str(exc.detail))
+        except Link.DoesNotExist:
             return Response({'message': 'Bağlantı bulunamadı'}, 
                           status=status.HTTP_404_NOT_FOUND)
         
-        work.links = new_links
-        work.save()
+        new_links = [link.to_dict() for link in work.links.all() if link.url != url_to_remove]
         
         # Log
         log_work_action(
             user=request.user,
             work=work,
             action='update',
-            old_data={'links_count': len(current_links)},
+            old_data={'links_count': len(new_links) + deleted_count},
             new_data={'links_count': len(new_links)}
         )
         
-        return Response({'message': 'Bağlantı silindi', 'links': work.links})
+        return Response({'message': 'Bağlantı silindi', 'links': new_links}, headers={'ETag': work.etag})
+    
+    @action(detail=False, methods=['get'])
+    def links_lookup(self, request):
+        """
+        URL'lere göre bağlantının eklendiği işleri bulur
+        Query param: url (birden fazla verilebilir)
+        """
+        if not PermissionChecker.can_read_column(request.user, 'links'):
+            return Response({'message': 'Bağlantıları görüntüleme yetkiniz yok'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        urls = request.query_params.getlist('url')
+        if not urls:
+            return Response({'message': 'En az bir url parametresi gerekli'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        # İş adı sadece isim kolonunu okuyabilen kullanıcılara döner
+        include_name = PermissionChecker.can_read_column(request.user, 'name')
+        results = {url: [] for url in urls}
+        rows = Link.objects.filter(url__in=urls).values('url', 'work_id', *(['work__name'] if include_name else []))
+        for row in rows:
+            result = {'work_id': row['work_id']}
+            if include_name:
+                result['work_name'] = row['work__name']
+            results[row['url']].append(result)
+        
+        return Response({'message': 'Bağlantı sonuçları', 'results': results})
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_works(self, request):
+        """
+        CSV / JSON / NDJSON dosyasından toplu iş aktarımı
+        Form alanları: file, format (opsiyonel, dosya uzantısından tahmin edilir), batch_size (opsiyonel)
+        Hatalı satırlar atlanır ve yanıtta satır numarasıyla raporlanır
+        """
+        if not PermissionChecker.can_create_work(request.user):
+            return Response({'message': 'İş oluşturma yetkiniz yok'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        uploaded_file = request.FILES.get('file')
+        if not uploaded_file:
+            return Response({'message': 'file alanı gerekli'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_format = request.data.get('format') or detect_format(uploaded_file.name)
+        if file_format not in SUPPORTED_FORMATS:
+            return Response({'message': f"Desteklenen formatlar: {', '.join(SUPPORTED_FORMATS)}"},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            batch_size = min(max(int(request.data.get('batch_size') or 500), 1), 5000)
+        except (TypeError, ValueError):
+            return Response({'message': 'batch_size sayı olmalı'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        importer = WorkImporter(request.user, batch_size=batch_size, source_name=uploaded_file.name)
+        try:
+            summary = importer.run(iter_records(uploaded_file, file_format))
+        except (ValueError, csv.Error) as e:
+            # Dosya yapısı bozuksa o ana kadar eklenen batch'ler korunur
+            return Response({
+                'message': f'Dosya okunamadı: {e}',
+                **importer.summary()
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': f"{summary['created']} iş aktarıldı, {summary['failed']} satır hatalı",
+            **summary
+        }, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """
+        Aşama süreleri ve throughput analitiği
+        Query params: stage (design, confirm, printing, packaging, shipping, lead_time),
+        group_by (all, designer, category, sales_channel), period (week, month), start, end (ISO tarih)
+        """
+        stage = request.query_params.get('stage', 'lead_time')
+        group_by = request.query_params.get('group_by', 'all')
+        period = request.query_params.get('period', 'month')
+        
+        if stage not in STAGES or group_by not in DIMENSIONS or period not in PERIODS:
+            return Response({
+                'message': 'Geçersiz parametre',
+                'stages': list(STAGES),
+                'group_by': list(DIMENSIONS),
+                'periods': list(PERIODS)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        start_param = request.query_params.get('start')
+        end_param = request.query_params.get('end')
+        start = parse_date(start_param) if start_param else None
+        end = parse_date(end_param) if end_param else None
+        if (start_param and start is None) or (end_param and end is None):
+            return Response({'message': 'start ve end ISO tarih formatında olmalı'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        # Aşamanın tarih kolonlarını ve gruplama kolonunu okuyabilmeli
+        start_field, end_field, stage_display = STAGES[stage]
+        required_columns = [start_field, end_field] + ([group_by] if group_by != 'all' else [])
+        if not all(PermissionChecker.can_read_column(request.user, column) for column in required_columns):
+            return Response({'message': 'Bu analitik için gerekli kolonlara okuma yetkiniz yok'},
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        return Response({
+            'message': f'{stage_display} aşaması süre analitiği',
+            'stage': stage,
+            'group_by': group_by,
+            'period': period,
+            'results': stage_summary(stage, group_by, period, start, end)
+        })
+    
+    def _timeline_stages(self, request):
+        """
+        ?stage=design,printing ile istenen (yoksa okunabilen tüm) takvim aşamaları
+        Aşamanın başlangıç ve bitiş kolonlarını okuma yetkisi gerekir; (aşamalar, hata yanıtı) döndürür
+        """
+        requested = [stage for stage in request.query_params.get('stage', '').split(',') if stage]
+        unknown = [stage for stage in requested if stage not in TIMELINE_STAGES]
+        if unknown:
+            return None, Response({
+                'message': f"Geçersiz aşama(lar): {', '.join(unknown)}",
+                'stages': list(TIMELINE_STAGES)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        readable = [
+            stage for stage, (start_field, end_field, _, _) in TIMELINE_STAGES.items()
+            if PermissionChecker.can_read_column(request.user, start_field)
+            and PermissionChecker.can_read_column(request.user, end_field)
+        ]
+        forbidden = [stage for stage in requested if stage not in readable]
+        if forbidden or not readable:
+            return None, Response({'message': 'Bu aşamaların tarih kolonlarına okuma yetkiniz yok'},
+                                  status=status.HTTP_403_FORBIDDEN)
+        return requested or readable, None
+    
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Üretim takvimi: pencereyle kesişen aşama aralıkları, gün gün gruplanmış
+        Query params: since, until (ISO tarih; varsayılan bugünden itibaren 7 gün), stage (design, printing,
+        packaging, shipping). Bitişi girilmemiş aşamalar pencere sonuna kadar sürüyor kabul edilir.
+        """
+        stages, error = self._timeline_stages(request)
+        if error:
+            return error
+        
+        today = timezone.localdate()
+        since_param = request.query_params.get('since')
+        until_param = request.query_params.get('until')
+        since = parse_date(since_param) if since_param else today
+        until = parse_date(until_param) if until_param else (since + timedelta(days=6) if since else None)
+        if since is None or until is None:
+            return Response({'message': 'since ve until ISO tarih formatında olmalı'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if until < since or (until - since).days >= settings.WORKFLOW_TIMELINE_MAX_DAYS:
+            return Response({
+                'message': f'until, since ile aynı ya da sonraki bir gün olmalı; pencere en fazla '
+                           f'{settings.WORKFLOW_TIMELINE_MAX_DAYS} gün olabilir'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        intervals = intervals_in_window(since, until, stages)
+        return Response({
+            'message': 'Üretim takvimi',
+            'since': since.isoformat(),
+            'until': until.isoformat(),
+            'stages': stages,
+            'days': group_by_day(intervals, since, until, stages),
+            'works': describe_works(intervals, PermissionChecker.can_read_column(request.user, 'name'), today)
+        })
+    
+    @action(detail=False, methods=['get'])
+    def overdue(self, request):
+        """
+        Bitiş tarihi geçtiği halde tamamlanmamış aşamalar, bitiş gününe göre gruplanmış (en eski önce)
+        Query params: stage (design, printing, packaging, shipping)
+        """
+        stages, error = self._timeline_stages(request)
+        if error:
+            return error
+        
+        today = timezone.localdate()
+        intervals = overdue_intervals(today, stages)
+        return Response({
+            'message': 'Geciken işler',
+            'today': today.isoformat(),
+            'stages': stages,
+            'count': len(intervals),
+            'days': group_by_due_day(intervals, stages),
+            'works': describe_works(intervals, PermissionChecker.can_read_column(request.user, 'name'), today)
+        })
+    
+    # field_changes yanıtındaki varsayılan ve en fazla kayıt sayısı
+    FIELD_CHANGES_LIMIT = 100
+    FIELD_CHANGES_MAX_LIMIT = 1000
+    
+    def _parse_datetime_param(self, value, end_of_day=False):
+        """ISO tarih-saat ya da tarih (end_of_day ise günün sonu) parametresi; geçersizse ValueError"""
+        parsed = parse_datetime(value)
+        if parsed is None:
+            parsed_date = parse_date(value)
+            if parsed_date is None:
+                raise ValueError(value)
+            parsed = datetime.combine(parsed_date, time.max if end_of_day else time.min)
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def field_changes(self, request):
+        """
+        Alan bazında değişiklik geçmişi ("şu işlerin fiyatını kim değiştirdi") - hareket kayıtları gibi sadece admin
+        Query params: field, work, user (virgülle ayrılmış; en az biri gerekli), since, until (ISO tarih
+        veya tarih-saat), limit. Sorgu FieldChange indeksleri üzerinden okunur, en yeni değişiklik önce gelir.
+        Sadece okuma yetkisi olan alanların değişiklikleri, iş adı da isim kolonu okunabiliyorsa döner.
+        """
+        params = request.query_params
+        fields = [field for field in params.get('field', '').split(',') if field]
+        try:
+            work_ids = [int(work_id) for work_id in params.get('work', '').split(',') if work_id]
+            user_ids = [int(user_id) for user_id in params.get('user', '').split(',') if user_id]
+            limit = min(max(int(params.get('limit') or self.FIELD_CHANGES_LIMIT), 1), self.FIELD_CHANGES_MAX_LIMIT)
+        except ValueError:
+            return Response({'message': 'work, user ve limit sayı olmalı'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not (fields or work_ids or user_ids):
+            return Response({'message': 'field, work veya user parametrelerinden en az biri gerekli'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            since = self._parse_datetime_param(params['since']) if params.get('since') else None
+            until = self._parse_datetime_param(params['until'], end_of_day=True) if params.get('until') else None
+        except ValueError:
+            return Response({'message': 'since ve until ISO formatında tarih veya tarih-saat olmalı'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        # Hareketlerde model alanları dışında bağlantı sayısı da tutulur (links kolon yetkisine bağlı)
+        audit_fields = {field.name: field.name for field in Work._meta.fields}
+        audit_fields['links_count'] = 'links'
+        readable = [
+            field_name for field_name, column in audit_fields.items()
+            if PermissionChecker.can_read_column(request.user, column)
+        ]
+        if fields:
+            forbidden = [field for field in fields if field not in readable]
+            if forbidden:
+                return Response({'message': f"Bu alanları görüntüleme yetkiniz yok: {', '.join(forbidden)}"},
+                              status=status.HTTP_403_FORBIDDEN)
+        
+        changes = FieldChange.objects.filter(field__in=fields or readable)
+        if work_ids:
+            changes = changes.filter(work_id__in=work_ids)
+        if user_ids:
+            changes = changes.filter(user_id__in=user_ids)
+        if since:
+            changes = changes.filter(changed_at__gte=since)
+        if until:
+            changes = changes.filter(changed_at__lte=until)
+        
+        changes = changes.select_related('movement').only(
+            'id', 'work_id', 'field', 'user_id', 'changed_at', 'old_value', 'new_value',
+            'movement__id', 'movement__work_name', 'movement__user_fullname'
+        )[:limit]
+        
+        include_name = PermissionChecker.can_read_column(request.user, 'name')
+        results = []
+        for change in changes:
+            try:
+                model_field = Work._meta.get_field(change.field)
+            except FieldDoesNotExist:
+                model_field = None
+            results.append({
+                'id': change.id,
+                'movement_id': change.movement_id,
+                'work_id': change.work_id,
+                **({'work_name': change.movement.work_name} if include_name else {}),
+                'field': change.field,
+                'field_display': str(model_field.verbose_name) if model_field else change.field,
+                'user_id': change.user_id,
+                'user_display': change.movement.user_fullname or 'Bilinmiyor',
+                'changed_at': change.changed_at.isoformat(),
+                'old_value': change.old_value,
+                'new_value': change.new_value,
+                'old_display': display_serialized(model_field, change.old_value),
+                'new_display': display_serialized(model_field, change.new_value),
+            })
+        
+        return Response({
+            'message': 'Alan değişiklikleri',
+            'count': len(results),
+            'limit': limit,
+            'results': results
+        })
+    
+    @action(detail=True, methods=['get'])
+    def as_of(self, request, pk=None):
+        """
+        İşin geçmişteki bir andaki hali (hareket kayıtlarından yeniden oluşturulur)
+        Query param: at (ISO tarih veya tarih-saat; sadece tarih verilirse gün sonu)
+        """
+        work = self.get_object()
+        
+        try:
+            at = self._parse_datetime_param(request.query_params.get('at', ''), end_of_day=True)
+        except ValueError:
+            return Response({'message': 'at parametresi ISO formatında tarih veya tarih-saat olmalı'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        result = reconstruct(work, at)
+        if result is None:
+            return Response({'message': 'İş bu tarihte henüz oluşturulmamıştı'},
+                          status=status.HTTP_404_NOT_FOUND)
+        
+        state, snapshot, replayed = result
+        data = {'id': work.id, 'created': work.created.isoformat(), **decode_state(state)}
+        
+        return Response({
+            'message': 'İşin geçmişteki hali',
+            'as_of': at.isoformat(),
+            'snapshot_taken_at': snapshot.taken_at.isoformat() if snapshot else None,
+            'replayed_movements': replayed,
+            'work': self._filter_by_permissions(data, request.user)
+        })
     
     def list(self, request, *args, **kwargs):
-        """Liste görünümü - yetki filtreli"""
+        """
+        Liste görünümü - yetki filtreli, aynı yetki imzasına sahip kullanıcılar arasında cache'li
+        Varsayılan kompakt gösterimdir (links_count, first_link, kısaltılmış not); ?view=full detay formatını döndürür
+        """
+        cache_key = build_cache_key('workflows:list', request)
+        return cached_response(request, cache_key, lambda: self._render_list(request), flight='workflows:list')
+    
+    # Sparse fieldset'te ilişkili kullanıcıdan okunan alanlar (get_user_detail)
+    USER_DETAIL_FIELDS = ['id', 'username', 'first_name', 'last_name', 'email']
+    
+    def _get_sparse_fields(self):
+        """
+        ?fields=name,category_name ya da ?exclude=note,links ile istenen çıktı alanları
+        Okuma yetkisi olmayan kolonlar baştan çıkarılır; parametre yoksa None
+        """
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+        
+        params = self.request.query_params
+        fields_param, exclude_param = params.get('fields'), params.get('exclude')
+        if not fields_param and not exclude_param:
+            self._sparse_fields = None
+            return None
+        
+        serializer_class = self.get_serializer_class()
+        available = serializer_class.available_fields()
+        requested = [field.strip() for field in (fields_param or '').split(',') if field.strip()]
+        excluded = [field.strip() for field in (exclude_param or '').split(',') if field.strip()]
+        
+        unknown = [field for field in requested + excluded if field not in available]
+        if unknown:
+            raise ValidationError({
+                'fields': [f"Geçersiz alan(lar): {', '.join(unknown)}. Geçerli alanlar: {', '.join(available)}"]
+            })
+        
+        def expand(names):
+            return {name for field in names for name in serializer_class.FIELD_ALIASES.get(field, [field])}
+        
+        fields = expand(requested or available) - expand(excluded)
+        
+        user = self.request.user
+        if not user.is_superuser:
+            permissions = PermissionChecker.get_user_column_permissions(user)
+            readable = {column for column, permission in permissions.items() if permission in ['read', 'write']}
+            fields = {
+                field for field in fields
+                if PermissionChecker.DERIVED_FIELDS.get(field, field) in readable
+                or field in PermissionChecker.SYSTEM_FIELDS
+            }
+        
+        self._sparse_fields = fields
+        return fields
+    
+    def _apply_sparse_fields(self, queryset, fields, archived=False):
+        """Sadece istenen alanların kolonlarını ve ilişkilerini yükler"""
+        model_fields = {field.name: field for field in queryset.model._meta.concrete_fields}
+        needed = set(fields)
+        for field in fields:
+            needed.update(self.get_serializer_class().FIELD_DEPENDENCIES.get(field, []))
+        
+        only_fields = ['id', 'version', 'created']
+        related = []
+        for name in sorted(needed):
+            field = model_fields.get(name)
+            if field is None:
+                continue
+            only_fields.append(name)
+            if field.is_relation:
+                related.append(name)
+                if field.related_model is User:
+                    only_fields.extend(f'{name}__{column}' for column in self.USER_DETAIL_FIELDS)
+                else:
+                    only_fields.extend([f'{name}__id', f'{name}__name'])
+        
+        queryset = queryset.select_related(None).prefetch_related(None).select_related(*related)
+        if archived:
+            only_fields.append('archived_at')
+        if 'links' in needed:
+            if archived:
+                only_fields.append('link_data')
+            else:
+                queryset = queryset.prefetch_related('links')
+        
+        return queryset.only(*only_fields)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self._get_sparse_fields() if self.action in ['list', 'retrieve'] else None
+        if fields is not None:
+            queryset = self._apply_sparse_fields(queryset, fields)
+        if self._is_compact_list():
+            queryset = WorkflowListSerializer.annotate_queryset(queryset.prefetch_related(None), fields)
+        return queryset
+    
+    def _is_compact_list(self):
+        """Liste varsayılan olarak kompakt döner; ?view=full bağlantıların ve notun tamamını döndürür"""
+        return self.action == 'list' and self.request.query_params.get('view') != 'full'
+    
+    def get_serializer_class(self):
+        if self._is_compact_list():
+            return WorkflowListSerializer
+        return super().get_serializer_class()
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ['list', 'retrieve']:
+            kwargs.setdefault('fields', self._get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
+    
+    def _include_archived(self, request):
+        """?include_archived=true: aktif + arşiv, ?include_archived=only: sadece arşiv"""
+        value = request.query_params.get('include_archived', '').lower()
+        if value == 'only':
+            return 'only'
+        return 'also' if value in ['1', 'true', 'yes', 'evet'] else None
+    
+    def _get_archived_queryset(self):
+        queryset = ArchivedWork.objects.select_related(
+            'category', 'type', 'sales_channel', 'designer', 'printing_controller'
+        )
+        fields = self._get_sparse_fields()
+        if fields is not None:
+            queryset = self._apply_sparse_fields(queryset, fields, archived=True)
+        return queryset
+    
+    def _serialize_works(self, works, include_archived):
+        """Aktif ve arşivlenmiş işleri aynı formatta serialize eder"""
+        # Sayfalanmamış aktif iş listesi values() tabanlı hızlı yoldan serialize edilir
+        if not include_archived and isinstance(works, QuerySet) and settings.WORKFLOW_FAST_SERIALIZER:
+            return FastWorkflowSerializer(
+                fields=self._get_sparse_fields(), compact=self._is_compact_list()
+            ).serialize(works)
+        
+        data = self.get_serializer(works, many=True).data
+        if include_archived:
+            for work, item in zip(works, data):
+                is_archived = isinstance(work, ArchivedWork)
+                item['is_archived'] = is_archived
+                item['archived_at'] = work.archived_at.isoformat() if is_archived else None
+        return data
+    
+    def _render_list(self, request):
+        """Listeyi serialize edip render eder, (içerik, content type) döndürür"""
+        include_archived = self._include_archived(request)
         queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
+        
+        if include_archived:
+            works = [] if include_archived == 'only' else list(queryset)
+            works += list(self._get_archived_queryset())
+            works.sort(key=lambda work: work.created, reverse=True)
+        else:
+            works = queryset
+        
+        page = self.paginate_queryset(works)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            filtered_data = self._filter_by_permissions(serializer.data, request.user)
-            return self.get_paginated_response(filtered_data)
+            filtered_data = self._filter_by_permissions(self._serialize_works(page, include_archived), request.user)
+            response = self.get_paginated_response(filtered_data)
+        else:
+            filtered_data = self._filter_by_permissions(self._serialize_works(works, include_archived), request.user)
+            response = Response(filtered_data)
         
-        serializer = self.get_serializer(queryset, many=True)
-        filtered_data = self._filter_by_permissions(serializer.data, request.user)
-        return Response(filtered_data)
+        return render_content(self, request, response)
     
     def retrieve(self, request, *args, **kwargs):
         """Detay görünümü - yetki filtreli"""
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        filtered_data = self._filter_by_permissions(serializer.data, request.user)
-        return Response(filtered_data)
+        include_archived = self._include_archived(request)
+        try:
+            instance = self.get_object()
+        except Http404:
+            if not include_archived:
+                raise
+            instance = get_object_or_404(self._get_archived_queryset(), pk=kwargs.get('pk'))
+        
+        data = self._serialize_works([instance], include_archived)[0]
+        filtered_data = self._filter_by_permissions(data, request.user)
+        return Response(filtered_data, headers={'ETag': instance.etag})
+    
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        """Arşivlenmiş işi aktif listeye geri alır"""
+        if not PermissionChecker.can_create_work(request.user):
+            return Response({'message': 'Arşivden geri alma yetkiniz yok'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        archived_work = get_object_or_404(ArchivedWork, pk=pk)
+        work = restore_work(archived_work, user=request.user)
+        
+        work = self.get_queryset().get(pk=work.pk)
+        filtered_data = self._filter_by_permissions(self.get_serializer(work).data, request.user)
+        return Response({
+            'message': f'{work.name} isimli iş arşivden geri alındı',
+            'work': filtered_data
+        }, headers={'ETag': work.etag})
     
     def create(self, request, *args, **kwargs):
         """Yeni kayıt oluştur"""
@@ -184,6 +763,7 @@ class WorkflowViewSet(viewsets.ModelViewSet):
         log_work_action(user=request.user, work=work, action='create')
         
         headers = self.get_success_headers(serializer.data)
+        headers['ETag'] = work.etag
         filtered_data = self._filter_by_permissions(serializer.data, request.user)
         
         return Response(filtered_data, status=status.HTTP_201_CREATED, headers=headers)
@@ -199,15 +779,22 @@ class WorkflowViewSet(viewsets.ModelViewSet):
             return Response({'message': error_message}, 
                           status=status.HTTP_403_FORBIDDEN)
         
+        # İstemcinin bildiği versiyon (If-Match veya gövdedeki version)
+        expected_version = self._get_expected_version(request, instance)
+        
         # Eski verileri al
         old_data = self._get_instance_data(instance)
         
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        try:
+            serializer.save(expected_version=expected_version)
+        except PreconditionFailed as exc:
+            return self._precondition_failed(request, str(exc.detail))
         
-        # Güncellenmiş verileri al
-        instance.refresh_from_db()
+        # Güncellenmiş verileri al; refresh_from_db ilişki cache'ini temizlediği için
+        # her ilişki ayrı sorgu olurdu, kayıt ilişkileriyle tek sorguda yeniden okunur
+        instance = self.get_queryset().prefetch_related(None).get(pk=instance.pk)
         new_data = self._get_instance_data(instance)
         
         # Değişiklik varsa logla
@@ -221,7 +808,7 @@ class WorkflowViewSet(viewsets.ModelViewSet):
             )
         
         filtered_data = self._filter_by_permissions(serializer.data, request.user)
-        return Response(filtered_data)
+        return Response(filtered_data, headers={'ETag': instance.etag})
     
     def destroy(self, request, *args, **kwargs):
         """Silme işlemi"""
@@ -232,12 +819,63 @@ class WorkflowViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         log_work_action(user=request.user, work=instance, action='delete')
         
+        # Hareketler ve snapshot'lar arşivleme için iş id'sine constraint'siz bağlı; gerçek silmede temizlenir
+        Movement.objects.filter(work_id=instance.pk).update(work=None)
+        FieldChange.objects.filter(work_id=instance.pk).update(work=None)
+        WorkSnapshot.objects.filter(work_id=instance.pk).delete()
+        
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(['GET'])
+def bootstrap(request):
+    """
+    Dashboard açılışı için tek yanıt: kullanıcı, sistem ve kolon yetkileri, dropdown seçenekleri ve iş listesi
+    Yetkiler bir kez çözülür, dropdown'lar process belleğinden okunur, iş listesi /api/workflows/ ile aynı
+    formatta ve aynı yetki imzası bazlı cache ile üretilir. Query params: fields, exclude, view (iş listesi için)
+    """
+    user = request.user
+    column_permissions = PermissionChecker.get_user_column_permissions(user)
+    system_permissions = PermissionChecker.get_user_system_permissions(user)
+    
+    view = WorkflowViewSet(request=request, format_kwarg=None, action='list', args=(), kwargs={})
+    works = cached_data(
+        request,
+        build_cache_key('workflows:bootstrap', request),
+        lambda: view._filter_by_permissions(view._serialize_works(view.get_queryset(), False), user),
+        flight='workflows:bootstrap'
+    )
+    
+    work_permissions = build_work_permissions_payload(user, column_permissions)
+    work_permissions.pop('message')
+    
+    return Response({
+        'message': 'Başlangıç verileri',
+        'user': {
+            **UserSerializer(user).data,
+            'full_name': user.get_full_name() or user.username,
+            'is_superuser': user.is_superuser
+        },
+        'system_permissions': build_system_permissions_payload(user, system_permissions),
+        'work_permissions': work_permissions,
+        'dropdowns': get_dropdowns(),
+        'works': works
+    })
+
+
 class MovementViewSet(viewsets.ReadOnlyModelViewSet):
     """Movement kayıtları - sadece okunabilir"""
     queryset = Movement.objects.all()
     serializer_class = MovementSerializer
-    permission_classes = [IsAdminUser]
\ No newline at end of file
+    permission_classes = [IsAdminUser]
+    
+    def list(self, request, *args, **kwargs):
+        """Liste görünümü - aynı anda gelen aynı sorgular tek sorgu/serialize işlemini paylaşır"""
+        key = build_cache_key('movements:list', request)
+        (content, content_type), shared = get_flight('movements:list').do(
+            key, lambda: render_content(self, request, super(MovementViewSet, self).list(request, *args, **kwargs))
+        )
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Coalesced'] = 'true' if shared else 'false'
+        return response
\ No newline at end of file